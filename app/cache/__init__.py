@@ -5,134 +5,273 @@ Provides hybrid caching with Redis primary and in-memory fallback.
 
 import time
 import threading
-import hashlib
 import logging
 import asyncio
 import os
-from typing import Any, Optional
-from collections import OrderedDict
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from collections import ChainMap
 
 from config import config
+from .keys import make_cache_key
+from .metrics import CacheMetrics
+from .policies import LRUShard, WTinyLFUShard
 from .redis_cache import RedisCache
+from .single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait before reconnecting after Redis fails
+REDIS_RETRY_INTERVAL_SECONDS = 30
+
+# L1 lifetime for promoted Redis entries that have no expiry
+L1_PROMOTION_TTL_SECONDS = 300
+
 
 class CacheEntry:
-    def __init__(self, value: Any, ttl_seconds: int):
+    __slots__ = ("value", "expiry", "size")
+
+    def __init__(self, value: Any, ttl_seconds: int, size: int = 0):
         self.value = value
         self.expiry = time.time() + ttl_seconds
+        self.size = size
 
     def is_expired(self) -> bool:
         return time.time() > self.expiry
 
 
+def estimate_size(value: Any) -> int:
+    """
+    Approximate the memory held by a JSON-like value, in bytes.
+
+    Walks dicts, lists and tuples and sums sys.getsizeof of every object,
+    which is close enough to budget cache memory without serializing.
+    """
+    size = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+    return size
+
+
 class TTLCache:
     """
-    Thread-safe LRU cache with TTL support.
+    Thread-safe TTL cache with a memory budget and pluggable eviction.
 
     Features:
-    - Thread-safe operations (Lock-based)
-    - TTL (Time-To-Live) per entry
-    - Automatic cleanup of expired entries
-    - LRU eviction when full
-    - O(1) operations
+    - Lock striping: keys are spread over independent shards
+    - TTL (Time-To-Live) per entry, expired via a min-heap in O(expired)
+    - Eviction by entry count (max_size) and approximate bytes (max_bytes)
+    - Policy "lru" (least recently used) or "tinylfu" (W-TinyLFU admission,
+      which keeps popular entries when one-off keys stream through)
+    - Optional regions: a prefix can get its own share of the capacity,
+      so e.g. per-text score hashes cannot evict topic results
+    - Statistics kept as counters, no full scans
     """
 
-    def __init__(self, max_size: int = 1000):
-        self.max_size = max_size
-        self.cache: OrderedDict[str, CacheEntry] = OrderedDict()
-        self.lock = threading.RLock()
-        self.last_cleanup = time.time()
-        self.CLEANUP_INTERVAL = 300
+    # Shards are only used once each one holds at least this many entries,
+    # so small caches keep exact global LRU order
+    MIN_ENTRIES_PER_SHARD = 64
 
-    def _generate_key(self, prefix: str, topic: str, max_results: int) -> str:
-        normalized_topic = topic.lower().strip()
-        topic_hash = hashlib.md5(normalized_topic.encode()).hexdigest()
-        return f"{prefix}:{topic_hash}:{max_results}"
+    POLICIES = {"lru": LRUShard, "tinylfu": WTinyLFUShard}
 
-    def _cleanup_expired(self):
-        now = time.time()
+    DEFAULT_REGION = "default"
 
-        if now - self.last_cleanup < self.CLEANUP_INTERVAL:
-            return
+    def __init__(
+        self,
+        max_size: int = 1000,
+        max_bytes: Optional[int] = None,
+        shards: Optional[int] = None,
+        policy: Optional[str] = None,
+        regions: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize the cache.
 
-        with self.lock:
-            expired_keys = []
+        Args:
+            max_size: Maximum number of entries
+            max_bytes: Memory budget in bytes, 0 for none (default: CACHE_MAX_BYTES)
+            shards: Number of lock stripes per region (default: CACHE_SHARDS)
+            policy: "lru" or "tinylfu" (default: CACHE_POLICY)
+            regions: Share of max_size/max_bytes reserved per key prefix, e.g.
+                {"cpidr": 0.1}; other prefixes share the rest (default: CACHE_REGIONS)
+        """
+        if max_bytes is None:
+            max_bytes = config.CACHE_MAX_BYTES
+        if shards is None:
+            shards = config.CACHE_SHARDS
+        if policy is None:
+            policy = config.CACHE_POLICY
+        if regions is None:
+            regions = config.CACHE_REGIONS_MAP
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown cache policy: {policy}")
+
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.policy = policy
+
+        # Region name -> (entry limit, byte limit); the default region gets the rest
+        limits = {}
+        for name, share in regions.items():
+            limits[name] = (max(1, int(max_size * share)), int(max_bytes * share))
+        limits[self.DEFAULT_REGION] = (
+            max(1, max_size - sum(n for n, _ in limits.values())),
+            max(0, max_bytes - sum(b for _, b in limits.values())),
+        )
+        self._regions = {
+            name: self._make_shards(region_size, region_bytes, shards)
+            for name, (region_size, region_bytes) in limits.items()
+        }
+        self._shards = [shard for region in self._regions.values() for shard in region]
+        self._stats_lock = threading.Lock()
+        self.metrics = CacheMetrics()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+    def _make_shards(self, max_size: int, max_bytes: int, shards: int) -> list:
+        shard_class = self.POLICIES[self.policy]
+        shards = max(1, min(shards, max_size // self.MIN_ENTRIES_PER_SHARD))
+        return [
+            shard_class(
+                max_entries=max_size // shards + (1 if i < max_size % shards else 0),
+                max_bytes=max_bytes // shards,
+            )
+            for i in range(shards)
+        ]
+
+    @property
+    def cache(self):
+        """Read-only view of all entries (for inspection and tests)."""
+        if len(self._shards) == 1:
+            return self._shards[0].entries
+        return ChainMap(*(shard.entries for shard in self._shards))
 
-            for key, entry in self.cache.items():
-                if entry.is_expired():
-                    expired_keys.append(key)
+    def _generate_key(self, prefix: str, topic: str, max_results: int) -> str:
+        return make_cache_key(prefix, topic, max_results)
 
-            for key in expired_keys:
-                del self.cache[key]
+    def _shard_for(self, prefix: str, key: str):
+        region = self._regions.get(prefix.split(":", 1)[0]) or self._regions[self.DEFAULT_REGION]
+        return region[hash(key) % len(region)]
 
-            if expired_keys:
-                self.last_cleanup = now
-                logger.info(f"[CACHE] Cleaned up {len(expired_keys)} expired entries")
+    def _count(self, name: str, n: int = 1):
+        if n:
+            with self._stats_lock:
+                setattr(self, name, getattr(self, name) + n)
 
     def set(self, prefix: str, topic: str, max_results: int, value: Any, ttl_seconds: int):
         key = self._generate_key(prefix, topic, max_results)
-        entry = CacheEntry(value, ttl_seconds)
-
-        with self.lock:
-            self._cleanup_expired()
+        entry = CacheEntry(value, ttl_seconds, estimate_size(value) if self.max_bytes else 0)
+        shard = self._shard_for(prefix, key)
+
+        if shard.max_bytes and entry.size > shard.max_bytes:
+            logger.debug(f"[CACHE] Value of ~{entry.size} bytes exceeds shard budget, not cached")
+            self._count("rejected")
+            # The previous value is out of date; never serve it in place of this one
+            with shard.lock:
+                if key in shard.entries:
+                    shard.remove(key)
+            return
 
-            if len(self.cache) >= self.max_size and key not in self.cache:
-                oldest_key = next(iter(self.cache))
-                del self.cache[oldest_key]
+        with shard.lock:
+            expired = shard.expire(time.time())
+            evicted = shard.insert(key, entry)
 
-            self.cache[key] = entry
-            self.cache.move_to_end(key)
+        self._count("expirations", expired)
+        self._count("evictions", len(evicted))
+        for evicted_key in evicted:
+            self.metrics.incr(evicted_key, "evictions")
 
     def get(self, prefix: str, topic: str, max_results: int) -> Optional[Any]:
         """Get value from cache or None if expired/not found."""
         key = self._generate_key(prefix, topic, max_results)
+        shard = self._shard_for(prefix, key)
 
-        with self.lock:
-            self._cleanup_expired()
-
-            entry = self.cache.get(key)
-
-            if entry is None:
-                return None
-
-            if entry.is_expired():
-                del self.cache[key]
-                return None
-
-            self.cache.move_to_end(key)
-            return entry.value
+        with shard.lock:
+            now = time.time()
+            expired = shard.expire(now)
+            shard.record(key)
+            entry = shard.lookup(key, now)
+
+        self._count("expirations", expired)
+        if entry is None:
+            self._count("misses")
+            self.metrics.incr(prefix, "misses")
+            return None
+        self._count("hits")
+        self.metrics.incr(prefix, "hits")
+        return entry.value
 
     def clear(self):
         """Clear all cache entries."""
-        with self.lock:
-            self.cache.clear()
-            logger.info("[CACHE] Cache cleared")
+        for shard in self._shards:
+            with shard.lock:
+                shard.clear()
+        logger.info("[CACHE] Cache cleared")
 
     def get_stats(self) -> dict:
         """Get cache statistics."""
-        with self.lock:
-            now = time.time()
-            active_count = sum(1 for entry in self.cache.values() if not entry.is_expired())
-            expired_count = sum(1 for entry in self.cache.values() if entry.is_expired())
+        now = time.time()
+        entries = 0
+        used_bytes = 0
+        expired = 0
+        admission_rejected = 0
+        region_entries = {}
+        for name, region in self._regions.items():
+            region_entries[name] = 0
+            for shard in region:
+                with shard.lock:
+                    expired += shard.expire(now)
+                    region_entries[name] += len(shard)
+                    used_bytes += shard.bytes
+                    admission_rejected += shard.admission_rejected
+            entries += region_entries[name]
+        self._count("expirations", expired)
 
-            return {
-                "total_entries": len(self.cache),
-                "active_entries": active_count,
-                "expired_entries": expired_count,
-                "max_size": self.max_size,
-                "usage_percent": round((len(self.cache) / self.max_size) * 100, 2),
-            }
+        return {
+            "total_entries": entries,
+            "active_entries": entries,
+            "expired_entries": 0,
+            "max_size": self.max_size,
+            "usage_percent": round((entries / self.max_size) * 100, 2),
+            "bytes": used_bytes,
+            "max_bytes": self.max_bytes,
+            "policy": self.policy,
+            "shards": len(self._shards),
+            "regions": region_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "admission_rejected": admission_rejected,
+            "expirations": self.expirations,
+            "rejected": self.rejected,
+            "prefixes": self.metrics.snapshot(),
+        }
 
 
 class HybridCache:
     """
-    Hybrid cache that uses Redis as primary and TTLCache as fallback.
+    Two-tier read-through cache: in-memory TTLCache (L1) in front of Redis (L2).
+
+    Async callers should use aget/aset: reads check L1, then Redis, and
+    promote Redis hits into L1 for the key's remaining TTL, so every
+    worker and container shares one warm cache that survives restarts.
 
-    Maintains the same synchronous interface as TTLCache while using
-    async Redis operations internally. Falls back to in-memory cache
-    if Redis is unavailable.
+    The synchronous get/set/clear/get_stats only touch L1 (set also
+    writes to Redis in the background) and never block the event loop.
+    If Redis is unavailable the cache keeps working from memory and
+    retries the connection every REDIS_RETRY_INTERVAL_SECONDS.
     """
 
     def __init__(self, max_size: int = 1000, redis_url: Optional[str] = None):
@@ -149,6 +288,17 @@ class HybridCache:
         self._redis_cache = None
         self._lock = threading.Lock()
         self._loop = None
+        self._redis_retry_at = 0.0
+        self._flight = SingleFlight()
+        self.metrics = CacheMetrics()
+
+        # Statistics
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.refreshes = 0
+        self.lease_waits = 0
 
         # Try to initialize Redis
         self._init_redis()
@@ -165,11 +315,13 @@ class HybridCache:
             logger.warning(f"[CACHE] Redis initialization failed: {e}")
 
     async def _ensure_connected(self) -> bool:
-        """Ensure Redis is connected (lazy connection on first use)."""
+        """Ensure Redis is connected (lazy connection on first use, then retry with backoff)."""
         if self._redis_cache is None:
             return False
         if self._redis_available:
             return True
+        if time.time() < self._redis_retry_at:
+            return False
         try:
             if await self._redis_cache.ping():
                 self._redis_available = True
@@ -177,17 +329,306 @@ class HybridCache:
                 return True
         except Exception as e:
             logger.warning(f"[CACHE] Redis ping failed: {e}")
-        self._redis_available = False
+        self._mark_redis_down()
         return False
 
+    def _mark_redis_down(self):
+        """Serve from memory only until the next reconnect attempt."""
+        self._redis_available = False
+        self._redis_retry_at = time.time() + REDIS_RETRY_INTERVAL_SECONDS
+
     def _generate_key(self, prefix: str, topic: str, max_results: int) -> str:
         """Generate cache key matching TTLCache format."""
-        normalized_topic = topic.lower().strip()
-        topic_hash = hashlib.md5(normalized_topic.encode()).hexdigest()
-        return f"{prefix}:{topic_hash}:{max_results}"
+        return make_cache_key(prefix, topic, max_results)
+
+    async def aget(self, prefix: str, topic: str, max_results: int) -> Optional[Any]:
+        """
+        Get a value from memory, falling back to Redis.
+
+        Redis hits are copied into memory for the key's remaining TTL.
+
+        Returns:
+            Cached value or None if not found in either tier
+        """
+        start = time.perf_counter()
+        try:
+            return await self._aget(prefix, topic, max_results)
+        finally:
+            self.metrics.observe_latency(prefix, "get_ms", time.perf_counter() - start)
+
+    async def _aget(self, prefix: str, topic: str, max_results: int) -> Optional[Any]:
+        value = self._memory_cache.get(prefix, topic, max_results)
+        if value is not None:
+            self.l1_hits += 1
+            self.metrics.incr(prefix, "l1_hits")
+            return value
+
+        if not await self._ensure_connected():
+            self.misses += 1
+            self.metrics.incr(prefix, "misses")
+            return None
+
+        key = self._generate_key(prefix, topic, max_results)
+        try:
+            value, ttl = await self._redis_cache.get_with_ttl(key)
+        except Exception as e:
+            logger.warning(f"[CACHE] Redis get failed, using memory only: {e}")
+            self._mark_redis_down()
+            self.misses += 1
+            self.metrics.incr(prefix, "misses")
+            return None
+
+        if value is None:
+            self.misses += 1
+            self.metrics.incr(prefix, "misses")
+            return None
+
+        self.l2_hits += 1
+        self.metrics.incr(prefix, "l2_hits")
+        promote_ttl = ttl if ttl > 0 else L1_PROMOTION_TTL_SECONDS
+        self._memory_cache.set(prefix, topic, max_results, value, promote_ttl)
+        logger.debug(f"[CACHE] Redis hit promoted to memory: {key} (ttl={promote_ttl}s)")
+        return value
+
+    async def aset(self, prefix: str, topic: str, max_results: int, value: Any, ttl_seconds: int):
+        """Set a value in memory and in Redis."""
+        start = time.perf_counter()
+        self.metrics.incr(prefix, "sets")
+        self._memory_cache.set(prefix, topic, max_results, value, ttl_seconds)
+
+        try:
+            if not await self._ensure_connected():
+                return
+
+            key = self._generate_key(prefix, topic, max_results)
+            try:
+                await self._redis_cache.set(key, value, ttl=ttl_seconds)
+                logger.debug(f"[CACHE] Redis set: {key}")
+            except Exception as e:
+                logger.warning(f"[CACHE] Redis set failed, using memory only: {e}")
+                self._mark_redis_down()
+        finally:
+            self.metrics.observe_latency(prefix, "set_ms", time.perf_counter() - start)
+
+    async def aget_many(self, prefix: str, topics: List[str], max_results: int) -> Dict[str, Any]:
+        """
+        Get several values, reading Redis in a single round trip for L1 misses.
+
+        Returns:
+            Mapping of topic to value for the topics found in either tier
+        """
+        start = time.perf_counter()
+        found = {}
+        missing = []
+        for topic in topics:
+            value = self._memory_cache.get(prefix, topic, max_results)
+            if value is not None:
+                found[topic] = value
+            else:
+                missing.append(topic)
+        self.l1_hits += len(found)
+        self.metrics.incr(prefix, "l1_hits", len(found))
+
+        if missing and await self._ensure_connected():
+            keys = [self._generate_key(prefix, topic, max_results) for topic in missing]
+            try:
+                replies = await self._redis_cache.get_many_with_ttl(keys)
+            except Exception as e:
+                logger.warning(f"[CACHE] Redis bulk get failed, using memory only: {e}")
+                self._mark_redis_down()
+                replies = []
+            for topic, (value, ttl) in zip(missing, replies):
+                if value is None:
+                    continue
+                found[topic] = value
+                self.l2_hits += 1
+                self.metrics.incr(prefix, "l2_hits")
+                promote_ttl = ttl if ttl > 0 else L1_PROMOTION_TTL_SECONDS
+                self._memory_cache.set(prefix, topic, max_results, value, promote_ttl)
+
+        misses = len(topics) - len(found)
+        self.misses += misses
+        self.metrics.incr(prefix, "misses", misses)
+        self.metrics.observe_latency(prefix, "get_many_ms", time.perf_counter() - start)
+        return found
+
+    async def aset_many(self, prefix: str, values: Dict[str, Any], max_results: int, ttl_seconds: int):
+        """Set several values in memory and in Redis (one round trip)."""
+        if not values:
+            return
+        self.metrics.incr(prefix, "sets", len(values))
+        for topic, value in values.items():
+            self._memory_cache.set(prefix, topic, max_results, value, ttl_seconds)
+
+        if not await self._ensure_connected():
+            return
+        items = {self._generate_key(prefix, topic, max_results): value for topic, value in values.items()}
+        try:
+            await self._redis_cache.set_many(items, ttl_seconds)
+        except Exception as e:
+            logger.warning(f"[CACHE] Redis bulk set failed, using memory only: {e}")
+            self._mark_redis_down()
+
+    async def aget_or_refresh(
+        self,
+        prefix: str,
+        topic: str,
+        max_results: int,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_seconds: int,
+        stale_seconds: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        slice_results: Optional[Callable[[Any, int], Any]] = None
+    ) -> Any:
+        """
+        Get a value, computing it with loader() on a miss (stale-while-revalidate).
+
+        Entries are fresh for ttl_seconds and then kept for another
+        stale_seconds. A stale entry is returned immediately while a single
+        background refresh runs. On a miss, concurrent callers share one
+        loader() call instead of each running it.
+
+        With lease_seconds, a fenced Redis lease extends this to all
+        workers and containers: results written by a holder whose lease
+        was taken over are discarded.
+
+        With slice_results, one entry per topic holds the largest result
+        set fetched so far and answers requests for fewer results by
+        slicing it. A stale entry larger than the request is served but
+        only refreshed by a request of at least its size, so a small
+        request never replaces it with fewer results.
+
+        Args:
+            prefix: Cache namespace (e.g. "scan-topic")
+            topic: Topic string
+            max_results: Result count, part of the key
+            loader: Coroutine function producing a fresh value
+            ttl_seconds: How long a value is served without refreshing
+            stale_seconds: Grace period to serve a stale value while refreshing
+                (default: CACHE_STALE_GRACE_SECONDS)
+            lease_seconds: If set and Redis is available, also de-duplicate
+                across workers: one worker takes a Redis lease for this long
+                and runs loader(), the others wait for its result
+            slice_results: slice_results(value, n) trims a cached value to
+                n results
+
+        Returns:
+            The cached or freshly loaded value
+
+        Raises:
+            Exception: Whatever loader() raises when no cached value exists
+        """
+        if stale_seconds is None:
+            stale_seconds = config.CACHE_STALE_GRACE_SECONDS
+
+        # Envelopes live under their own prefix so plain get() never sees them
+        swr_prefix = f"{prefix}:swr"
+        # Sliceable entries share one slot per topic, whatever their size
+        slot = 0 if slice_results else max_results
+        key = self._generate_key(swr_prefix, topic, slot)
+        flight_key = f"{key}:{max_results}"
+
+        def covers(envelope: Optional[dict]) -> bool:
+            return envelope is not None and envelope.get("max_results", max_results) >= max_results
+
+        def unwrap(envelope: dict) -> Any:
+            if slice_results and envelope.get("max_results", max_results) > max_results:
+                return slice_results(envelope["value"], max_results)
+            return envelope["value"]
+
+        async def refresh(stale: Optional[dict]):
+            fence = None
+            if lease_seconds and await self._ensure_connected():
+                try:
+                    fence = await self._redis_cache.acquire_lease(flight_key, lease_seconds)
+                    if fence is None:
+                        # Another worker is already computing this value
+                        if stale is not None:
+                            return unwrap(stale)
+                        leader_value = await self._await_leader(swr_prefix, topic, slot, flight_key, lease_seconds)
+                        if covers(leader_value):
+                            return unwrap(leader_value)
+                        logger.warning(f"[CACHE] Lease holder for {prefix} produced no value, loading locally")
+                except Exception as e:
+                    logger.warning(f"[CACHE] Redis lease unavailable for {prefix}: {e}")
+                    fence = None
+
+            try:
+                try:
+                    value = await loader()
+                except Exception as e:
+                    logger.warning(f"[CACHE] Refresh failed for {prefix}: {e}")
+                    raise
+                envelope = {"value": value, "fresh_until": time.time() + ttl_seconds,
+                            "max_results": max_results}
+
+                if slice_results:
+                    # Keep a larger fresh entry written by a concurrent request
+                    current = await self.aget(swr_prefix, topic, slot)
+                    if (current is not None and current["fresh_until"] > time.time()
+                            and current.get("max_results", 0) > max_results):
+                        return value
+
+                if fence is None:
+                    await self.aset(swr_prefix, topic, slot, envelope, ttl_seconds + stale_seconds)
+                else:
+                    await self._aset_fenced(swr_prefix, topic, slot, envelope,
+                                            ttl_seconds + stale_seconds, flight_key, fence)
+                self.refreshes += 1
+                self.metrics.incr(prefix, "refreshes")
+                return value
+            finally:
+                if fence is not None:
+                    try:
+                        await self._redis_cache.release_lease(flight_key, fence)
+                    except Exception as e:
+                        logger.warning(f"[CACHE] Lease release failed for {prefix}: {e}")
+
+        envelope = await self.aget(swr_prefix, topic, slot)
+        if not covers(envelope):
+            return await self._flight.do(flight_key, lambda: refresh(None))
+
+        if time.time() >= envelope["fresh_until"]:
+            if envelope.get("max_results", max_results) == max_results and not self._flight.is_running(flight_key):
+                logger.info(f"[CACHE] Serving stale {prefix} entry, refreshing in background")
+                self._flight.start(flight_key, lambda: refresh(envelope))
+            self.stale_served += 1
+            self.metrics.incr(prefix, "stale_hits")
+
+        return unwrap(envelope)
+
+    async def _await_leader(
+        self, prefix: str, topic: str, max_results: int, lease_name: str, timeout: float
+    ) -> Optional[dict]:
+        """Wait for the worker holding the lease, then read its result from Redis."""
+        self.lease_waits += 1
+        self.metrics.incr(prefix, "lease_waits")
+        logger.info(f"[CACHE] Waiting for another worker to compute {prefix}")
+        await self._redis_cache.wait_for_lease(lease_name, timeout)
+
+        key = self._generate_key(prefix, topic, max_results)
+        envelope, ttl = await self._redis_cache.get_with_ttl(key)
+        if envelope is None or time.time() >= envelope["fresh_until"]:
+            return None
+        self._memory_cache.set(prefix, topic, max_results, envelope, ttl if ttl > 0 else L1_PROMOTION_TTL_SECONDS)
+        return envelope
+
+    async def _aset_fenced(
+        self, prefix: str, topic: str, max_results: int, value: Any, ttl_seconds: int,
+        lease_name: str, fence: int
+    ):
+        """Set in memory and in Redis, unless a newer lease holder already wrote Redis."""
+        self._memory_cache.set(prefix, topic, max_results, value, ttl_seconds)
+        key = self._generate_key(prefix, topic, max_results)
+        try:
+            if not await self._redis_cache.set_fenced(key, value, ttl_seconds, lease_name, fence):
+                logger.info(f"[CACHE] Discarded stale write for {key} (fence {fence})")
+        except Exception as e:
+            logger.warning(f"[CACHE] Redis set failed, using memory only: {e}")
+            self._mark_redis_down()
 
     def get(self, prefix: str, topic: str, max_results: int) -> Optional[Any]:
-        """Get from memory cache (Redis async bridge limited in event loop thread)."""
+        """Get from memory cache only (use aget to also read Redis)."""
         return self._memory_cache.get(prefix, topic, max_results)
 
     def set(self, prefix: str, topic: str, max_results: int, value: Any, ttl_seconds: int):
@@ -211,61 +652,47 @@ class HybridCache:
 
         self._memory_cache.set(prefix, topic, max_results, value, ttl_seconds)
 
-    def clear(self):
+    async def aclear(self):
         """Clear all cache entries (Redis and memory)."""
-        if self._redis_cache:
+        if await self._ensure_connected():
             try:
-                loop = asyncio.get_running_loop()
-                if loop.is_running():
-                    future = asyncio.run_coroutine_threadsafe(self._ensure_connected(), loop)
-                    try:
-                        connected = future.result(timeout=2.0)
-                    except Exception:
-                        connected = False
-                    if connected:
-                        clear_future = asyncio.run_coroutine_threadsafe(
-                            self._redis_cache.clear(), loop
-                        )
-                        clear_future.result(timeout=2.0)
-                        logger.info("[CACHE] Redis cache cleared")
-            except RuntimeError:
-                # No running loop - not in async context, skip Redis
-                pass
+                await self._redis_cache.clear()
+                logger.info("[CACHE] Redis cache cleared")
             except Exception as e:
                 logger.warning(f"[CACHE] Redis clear failed: {e}")
 
         self._memory_cache.clear()
 
-    def get_stats(self) -> dict:
-        """Get combined cache statistics."""
-        memory_stats = self._memory_cache.get_stats()
+    def clear(self):
+        """Clear the memory cache (use aclear to also clear Redis)."""
+        self._memory_cache.clear()
 
-        redis_stats = {}
-        if self._redis_cache:
+    async def aget_stats(self) -> dict:
+        """Get combined cache statistics, including Redis."""
+        stats = self.get_stats()
+        if await self._ensure_connected():
             try:
-                loop = asyncio.get_running_loop()
-                if loop.is_running():
-                    future = asyncio.run_coroutine_threadsafe(self._ensure_connected(), loop)
-                    try:
-                        connected = future.result(timeout=2.0)
-                    except Exception:
-                        connected = False
-                    if connected:
-                        stats_future = asyncio.run_coroutine_threadsafe(
-                            self._redis_cache.get_stats(), loop
-                        )
-                        redis_stats = stats_future.result(timeout=2.0)
-            except RuntimeError:
-                # No running loop - not in async context, skip Redis
-                pass
+                stats["redis"] = await self._redis_cache.get_stats()
             except Exception as e:
                 logger.warning(f"[CACHE] Redis stats failed: {e}")
+        stats["redis_available"] = self._redis_available
+        return stats
 
+    def get_stats(self) -> dict:
+        """Get memory cache statistics (use aget_stats to include Redis)."""
         return {
             "type": "hybrid",
             "redis_available": self._redis_available,
-            "memory": memory_stats,
-            "redis": redis_stats,
+            "memory": self._memory_cache.get_stats(),
+            "redis": {},
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+            "refreshes": self.refreshes,
+            "lease_waits": self.lease_waits,
+            "refreshing": self._flight.in_flight(),
+            "prefixes": self.metrics.snapshot(),
         }
 
     def is_redis_available(self) -> bool:
@@ -0,0 +1,193 @@
+"""
+Binary value codec for the Redis cache.
+
+Values are serialized to JSON bytes (orjson when installed, else the
+standard library) and compressed with zstd or zlib once they pass a size
+threshold. Every encoded value starts with a two-byte header:
+
+    byte 0: 0x80 | format version   (currently 0x81)
+    byte 1: serializer << 4 | compression
+
+Legacy entries written as plain JSON text start with an ASCII character,
+so they are told apart by the high bit of the first byte and decoded
+transparently.
+"""
+
+import json
+import logging
+import zlib
+from typing import Any, Optional
+
+from config import config
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+_VERSION_BYTE = 0x80 | FORMAT_VERSION
+
+# Serializer ids (high nibble of the flags byte)
+SERIALIZER_JSON = 0
+SERIALIZER_ORJSON = 1
+
+# Compression ids (low nibble of the flags byte)
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+_SERIALIZERS = {"json": SERIALIZER_JSON, "orjson": SERIALIZER_ORJSON}
+_COMPRESSIONS = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "zstd": COMPRESSION_ZSTD}
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+class CodecError(ValueError):
+    """Raised when a cached value cannot be decoded."""
+
+
+class Codec:
+    """
+    Serialize and compress cache values.
+
+    Usage:
+        codec = Codec(serializer="orjson", compression="zstd", min_compress_bytes=1024)
+        data = codec.encode({"results": [...]})
+        value = codec.decode(data)
+    """
+
+    def __init__(self, serializer: str = "auto", compression: str = "auto", min_compress_bytes: int = 1024):
+        """
+        Initialize the codec.
+
+        Args:
+            serializer: "orjson", "json", or "auto" (orjson if installed)
+            compression: "zstd", "zlib", "none", or "auto" (zstd if installed, else zlib)
+            min_compress_bytes: Only compress serialized values at least this large
+        """
+        if serializer == "auto":
+            serializer = "orjson" if ORJSON_AVAILABLE else "json"
+        if compression == "auto":
+            compression = "zstd" if ZSTD_AVAILABLE else "zlib"
+
+        if serializer not in _SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer: {serializer}")
+        if compression not in _COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+        if serializer == "orjson" and not ORJSON_AVAILABLE:
+            raise ValueError("orjson serializer requested but orjson is not installed")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ValueError("zstd compression requested but zstandard is not installed")
+
+        self.serializer = serializer
+        self.compression = compression
+        self.min_compress_bytes = min_compress_bytes
+
+        if compression == "zstd":
+            self._zstd_compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+
+    def _dumps(self, value: Any) -> bytes:
+        if self.serializer == "orjson":
+            try:
+                return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # e.g. integers beyond 64 bits; the stdlib handles them
+                pass
+        return json.dumps(value, default=str, separators=(",", ":")).encode("utf-8")
+
+    def encode(self, value: Any) -> bytes:
+        """
+        Encode a JSON-compatible value.
+
+        Raises:
+            TypeError, ValueError: If the value cannot be serialized
+        """
+        payload = self._dumps(value)
+        serializer_id = _SERIALIZERS[self.serializer]
+        compression_id = COMPRESSION_NONE
+
+        if self.compression != "none" and len(payload) >= self.min_compress_bytes:
+            if self.compression == "zstd":
+                compressed = self._zstd_compressor.compress(payload)
+            else:
+                compressed = zlib.compress(payload, ZLIB_LEVEL)
+            if len(compressed) < len(payload):
+                payload = compressed
+                compression_id = _COMPRESSIONS[self.compression]
+
+        return bytes((_VERSION_BYTE, serializer_id << 4 | compression_id)) + payload
+
+    def decode(self, data: Optional[bytes]) -> Any:
+        """
+        Decode a value written by encode() or a legacy plain-JSON entry.
+
+        Raises:
+            CodecError: If the data is corrupt or uses an unavailable codec
+        """
+        if data is None:
+            return None
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        try:
+            if not data or data[0] < 0x80:
+                # Legacy entry: JSON text
+                return json.loads(data)
+
+            if data[0] != _VERSION_BYTE or len(data) < 2:
+                raise CodecError(f"Unsupported cache format byte 0x{data[0]:02x}")
+
+            serializer_id, compression_id = data[1] >> 4, data[1] & 0x0F
+            payload = data[2:]
+
+            if compression_id == COMPRESSION_ZLIB:
+                payload = zlib.decompress(payload)
+            elif compression_id == COMPRESSION_ZSTD:
+                if not ZSTD_AVAILABLE:
+                    raise CodecError("Value is zstd-compressed but zstandard is not installed")
+                payload = zstandard.ZstdDecompressor().decompress(payload)
+            elif compression_id != COMPRESSION_NONE:
+                raise CodecError(f"Unknown compression id {compression_id}")
+
+            if serializer_id == SERIALIZER_ORJSON and ORJSON_AVAILABLE:
+                return orjson.loads(payload)
+            if serializer_id in (SERIALIZER_JSON, SERIALIZER_ORJSON):
+                # Both serializers emit standard JSON
+                return json.loads(payload)
+            raise CodecError(f"Unknown serializer id {serializer_id}")
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(f"Corrupt cache value: {e}") from e
+
+
+_codec: Optional[Codec] = None
+
+
+def get_codec() -> Codec:
+    """Get the codec configured by CACHE_SERIALIZER / CACHE_COMPRESSION."""
+    global _codec
+    if _codec is None:
+        _codec = Codec(
+            serializer=config.CACHE_SERIALIZER,
+            compression=config.CACHE_COMPRESSION,
+            min_compress_bytes=config.CACHE_COMPRESS_MIN_BYTES,
+        )
+        logger.info(
+            f"[CACHE] Codec: {_codec.serializer}, compression={_codec.compression} "
+            f"(>= {_codec.min_compress_bytes} bytes)"
+        )
+    return _codec
@@ -0,0 +1,72 @@
+"""
+Cache key construction for SGNL backend.
+
+Topics are canonicalized before hashing so that near-identical searches
+("Rust async runtime" vs "rust  async runtime?") share one cache entry.
+"""
+
+import hashlib
+import unicodedata
+from typing import Optional
+
+from config import config
+
+# Punctuation stripped from the edges of each term. Symbols inside or at the
+# end of technical terms ("c++", "c#", "node.js", ".net") are kept.
+_EDGE_PUNCTUATION = "?!,;:\"'`()[]{}<>“”‘’«»¿¡"
+
+# Dropped when CACHE_TOPIC_DROP_STOPWORDS is enabled
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how",
+    "in", "is", "it", "of", "on", "or", "the", "to", "vs", "what", "when",
+    "which", "who", "why", "with",
+})
+
+
+def normalize_topic(
+    topic: str,
+    drop_stopwords: Optional[bool] = None,
+    sort_terms: Optional[bool] = None
+) -> str:
+    """
+    Canonicalize a search topic for use in a cache key.
+
+    Applies Unicode NFKC and case folding, strips punctuation around terms,
+    and collapses whitespace. Stopword removal and term ordering are
+    optional because they can merge topics with different meanings.
+
+    Args:
+        topic: Topic as entered by the user
+        drop_stopwords: Remove common English stopwords
+            (default: CACHE_TOPIC_DROP_STOPWORDS)
+        sort_terms: Ignore term order (default: CACHE_TOPIC_SORT_TERMS)
+
+    Returns:
+        Canonical topic string
+    """
+    if drop_stopwords is None:
+        drop_stopwords = config.CACHE_TOPIC_DROP_STOPWORDS
+    if sort_terms is None:
+        sort_terms = config.CACHE_TOPIC_SORT_TERMS
+
+    text = unicodedata.normalize("NFKC", topic).casefold()
+
+    terms = []
+    for raw in text.split():
+        term = raw.strip(_EDGE_PUNCTUATION).rstrip(".")
+        if not term:
+            continue
+        if drop_stopwords and term in STOPWORDS:
+            continue
+        terms.append(term)
+
+    if sort_terms:
+        terms.sort()
+
+    return " ".join(terms)
+
+
+def make_cache_key(prefix: str, topic: str, max_results: int) -> str:
+    """Build the cache key shared by the in-memory and Redis tiers."""
+    topic_hash = hashlib.md5(normalize_topic(topic).encode()).hexdigest()
+    return f"{prefix}:{topic_hash}:{max_results}"
@@ -0,0 +1,111 @@
+"""
+Per-prefix cache metrics for SGNL backend.
+
+Counters and fixed-bucket histograms keyed by cache prefix ("scan-topic",
+"fast-search", "extract", "cpidr", "depid", ...), so /cache/stats shows
+which caches pay off and how TTLs and sizes should be tuned. Everything
+is in-process: each worker reports its own numbers.
+"""
+
+import bisect
+import threading
+from collections import defaultdict
+from typing import Dict, Sequence
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+SIZE_BUCKETS_BYTES = tuple(256 * 4 ** i for i in range(9))  # 256 B .. 16 MB
+
+
+def metric_prefix(key_or_prefix: str) -> str:
+    """Group a cache key or prefix by its first segment ("scan-topic:swr:..." -> "scan-topic")."""
+    return key_or_prefix.split(":", 1)[0]
+
+
+class Histogram:
+    """Fixed-bucket histogram with approximate percentiles."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (max for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": round(self.max, 3),
+        }
+
+
+class CacheMetrics:
+    """
+    Thread-safe per-prefix counters and histograms.
+
+    Usage:
+        metrics = CacheMetrics()
+        metrics.incr("scan-topic", "hits")
+        metrics.observe_latency("scan-topic", "get_ms", elapsed_seconds)
+        metrics.snapshot()  # {"scan-topic": {"hits": 1, "get_ms": {...}}}
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._histograms: Dict[str, Dict[str, Histogram]] = defaultdict(dict)
+
+    def incr(self, prefix: str, name: str, n: int = 1):
+        """Add n to a counter of the prefix group."""
+        with self._lock:
+            self._counters[metric_prefix(prefix)][name] += n
+
+    def _observe(self, prefix: str, name: str, value: float, bounds: Sequence[float]):
+        with self._lock:
+            histograms = self._histograms[metric_prefix(prefix)]
+            histogram = histograms.get(name)
+            if histogram is None:
+                histogram = histograms[name] = Histogram(bounds)
+            histogram.observe(value)
+
+    def observe_latency(self, prefix: str, name: str, seconds: float):
+        """Record a duration (reported in milliseconds)."""
+        self._observe(prefix, name, seconds * 1000, LATENCY_BUCKETS_MS)
+
+    def observe_size(self, prefix: str, name: str, size_bytes: int):
+        """Record a value size in bytes."""
+        self._observe(prefix, name, size_bytes, SIZE_BUCKETS_BYTES)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Counters and histogram summaries per prefix group."""
+        with self._lock:
+            result = {}
+            for prefix in sorted(set(self._counters) | set(self._histograms)):
+                entry = dict(self._counters.get(prefix, {}))
+                for name, histogram in self._histograms.get(prefix, {}).items():
+                    entry[name] = histogram.snapshot()
+                result[prefix] = entry
+            return result
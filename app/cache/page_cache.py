@@ -0,0 +1,274 @@
+"""
+On-disk HTTP page cache for SGNL backend.
+
+Stores fetched page bodies in SQLite together with their ETag and
+Last-Modified validators so repeat fetches can be revalidated with a
+conditional GET. Scores computed from a page are stored next to it and
+reused for as long as the body is unchanged (304, or an identical body).
+
+The cache is bounded by total body size and evicts least recently used
+pages first. It is shared by /extract and /analyze-results.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config import config
+from services.url_canonical import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of score entries kept per page (e.g. one per query)
+MAX_SCORE_ENTRIES = 32
+
+
+class PageCache:
+    """
+    SQLite-backed cache of page bodies, validators and derived scores.
+
+    Thread-safe; callers on the event loop should use asyncio.to_thread.
+
+    Usage:
+        cache = PageCache("./page_cache.db", max_bytes=500_000_000)
+        cache.put(url, body, "utf-8", etag='"abc"', last_modified=None, complete=True)
+        entry = cache.get(url)
+        cache.set_scores(url, "extract", {...})
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Upper bound on the total size of stored bodies
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                body_hash TEXT NOT NULL,
+                encoding TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                complete INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                scores TEXT NOT NULL DEFAULT '{}'
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached page.
+
+        Returns:
+            Dict with body, encoding, etag, last_modified, complete and
+            fetched_at, or None if the page is not cached
+        """
+        key = canonicalize_url(url)
+        with self.lock:
+            row = self._conn.execute(
+                "SELECT body, encoding, etag, last_modified, complete, fetched_at "
+                "FROM pages WHERE url = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), key))
+            self.hits += 1
+
+        body, encoding, etag, last_modified, complete, fetched_at = row
+        return {
+            "body": bytes(body),
+            "encoding": encoding,
+            "etag": etag,
+            "last_modified": last_modified,
+            "complete": bool(complete),
+            "fetched_at": fetched_at,
+        }
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        encoding: Optional[str],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        complete: bool
+    ) -> bool:
+        """
+        Store a freshly downloaded page.
+
+        Scores are kept if the body is byte-identical to the cached one,
+        and dropped otherwise. A truncated body that is a prefix of a
+        cached complete body only refreshes the validators: the complete
+        copy and its scores stay, so /extract does not download it again.
+
+        Returns:
+            True if the body is unchanged from the cached copy
+        """
+        key = canonicalize_url(url)
+        body_hash = hashlib.sha256(body).hexdigest()
+        now = time.time()
+
+        with self.lock:
+            row = self._conn.execute(
+                "SELECT body_hash, scores, size, "
+                "(NOT ? AND complete AND substr(body, 1, ?) = ?) FROM pages WHERE url = ?",
+                (int(complete), len(body), body, key),
+            ).fetchone()
+            if row is not None and row[3]:
+                # Truncated refetch of an unchanged page: keep the complete copy
+                self._conn.execute(
+                    "UPDATE pages SET etag = ?, last_modified = ?, fetched_at = ?, last_access = ? "
+                    "WHERE url = ?",
+                    (etag, last_modified, now, now, key),
+                )
+                return True
+
+            unchanged = row is not None and row[0] == body_hash
+            scores = row[1] if unchanged else "{}"
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(url, body, body_hash, encoding, etag, last_modified, complete, size, "
+                "fetched_at, last_access, scores) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, body, body_hash, encoding, etag, last_modified, int(complete),
+                 len(body), now, now, scores),
+            )
+            self._total_bytes += len(body) - (row[2] if row else 0)
+            self._evict()
+
+        return unchanged
+
+    def touch(self, url: str) -> None:
+        """Mark a cached page as revalidated (after a 304 Not Modified)."""
+        key = canonicalize_url(url)
+        now = time.time()
+        with self.lock:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, key)
+            )
+            self.revalidated += 1
+
+    def get_scores(self, url: str, name: str) -> Optional[Any]:
+        """Get a score stored for the cached page under name."""
+        key = canonicalize_url(url)
+        with self.lock:
+            row = self._conn.execute("SELECT scores FROM pages WHERE url = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]).get(name)
+
+    def set_scores(self, url: str, name: str, value: Any) -> None:
+        """Store a JSON-serializable score for the cached page under name."""
+        key = canonicalize_url(url)
+        with self.lock:
+            row = self._conn.execute("SELECT scores FROM pages WHERE url = ?", (key,)).fetchone()
+            if row is None:
+                return
+            scores = json.loads(row[0])
+            scores.pop(name, None)
+            scores[name] = value
+            while len(scores) > MAX_SCORE_ENTRIES:
+                scores.pop(next(iter(scores)))
+            self._conn.execute(
+                "UPDATE pages SET scores = ? WHERE url = ?", (json.dumps(scores), key)
+            )
+
+    def _evict(self):
+        """Delete least recently used pages until the size bound holds (lock held)."""
+        total = self._total_bytes
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT url, size FROM pages ORDER BY last_access").fetchall()
+        evicted = []
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((url,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM pages WHERE url = ?", evicted)
+        self._total_bytes = total
+        self.evictions += len(evicted)
+        logger.debug(f"[PAGE_CACHE] Evicted {len(evicted)} pages")
+
+    def clear(self):
+        """Remove all cached pages."""
+        with self.lock:
+            self._conn.execute("DELETE FROM pages")
+            self._total_bytes = 0
+        logger.info("[PAGE_CACHE] Cache cleared")
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        with self.lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            total = self._total_bytes
+        return {
+            "entries": entries,
+            "total_bytes": total,
+            "max_bytes": self.max_bytes,
+            "usage_percent": round((total / self.max_bytes) * 100, 2) if self.max_bytes else 0.0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        """Close the database connection."""
+        with self.lock:
+            self._conn.close()
+
+
+_page_cache: Optional[PageCache] = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """Get or create the global page cache, or None if PAGE_CACHE_MAX_BYTES is 0."""
+    global _page_cache
+
+    if _page_cache is None and config.PAGE_CACHE_MAX_BYTES > 0:
+        with _page_cache_lock:
+            if _page_cache is None:
+                _page_cache = PageCache(config.PAGE_CACHE_PATH, config.PAGE_CACHE_MAX_BYTES)
+                logger.info(
+                    f"[PAGE_CACHE] Initialized at {config.PAGE_CACHE_PATH} "
+                    f"(max_bytes={config.PAGE_CACHE_MAX_BYTES})"
+                )
+
+    return _page_cache
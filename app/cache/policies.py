@@ -0,0 +1,296 @@
+"""
+Eviction and admission policies for the in-memory cache.
+
+A TTLCache is split into shards; each shard is one of:
+
+- LRUShard: plain least-recently-used eviction.
+- WTinyLFUShard: W-TinyLFU. New entries land in a small LRU window;
+  entries leaving the window compete with the main area's eviction victim
+  and are only admitted if they have been requested more often, as
+  estimated by a Count-Min sketch with a doorkeeper. The main area is a
+  segmented LRU (probation + protected), so one-off keys cannot flush
+  frequently used ones.
+
+Shards are not thread-safe; TTLCache holds shard.lock around every call.
+"""
+
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Share of a W-TinyLFU shard reserved for the admission window
+WINDOW_SHARE = 0.01
+
+# Share of the main area reserved for the protected segment
+PROTECTED_SHARE = 0.8
+
+
+class FrequencySketch:
+    """
+    Approximate access counts for admission decisions.
+
+    A Count-Min sketch of 4-bit counters (capped at 15) behind a Bloom
+    filter doorkeeper: the first access to a key only sets its doorkeeper
+    bits, so one-hit keys never reach the sketch. After sample_size
+    accesses every counter is halved and the doorkeeper is cleared, so
+    the estimate follows recent popularity.
+    """
+
+    DEPTH = 4
+    MAX_COUNT = 15
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5)
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Expected number of cached entries
+        """
+        width = 16
+        while width < capacity:
+            width <<= 1
+        self._width_mask = width - 1
+        self._table = bytearray(width * self.DEPTH)
+        self._doorkeeper = bytearray(width)  # one byte per bit keeps it simple
+        self.sample_size = 10 * max(capacity, 1)
+        self.additions = 0
+
+    def _indexes(self, key: str):
+        h = hash(key)
+        width = self._width_mask + 1
+        for row, seed in enumerate(self._SEEDS):
+            mixed = ((h ^ seed) * 0xFF51AFD7ED558CCD) & self._MASK64
+            yield row * width + ((mixed >> 32) & self._width_mask)
+
+    def _doorkeeper_slots(self, key: str):
+        h = hash(key) & self._MASK64
+        return h & self._width_mask, (h >> 32) & self._width_mask
+
+    def increment(self, key: str):
+        """Record one access to key."""
+        slots = self._doorkeeper_slots(key)
+        if not all(self._doorkeeper[slot] for slot in slots):
+            for slot in slots:
+                self._doorkeeper[slot] = 1
+        else:
+            table = self._table
+            indexes = list(self._indexes(key))
+            lowest = min(table[i] for i in indexes)
+            if lowest < self.MAX_COUNT:
+                # Conservative update: only raise the counters at the minimum
+                for i in indexes:
+                    if table[i] == lowest:
+                        table[i] = lowest + 1
+
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._reset()
+
+    def frequency(self, key: str) -> int:
+        """Estimated number of recent accesses to key."""
+        in_doorkeeper = all(self._doorkeeper[slot] for slot in self._doorkeeper_slots(key))
+        if not in_doorkeeper:
+            return 0
+        return 1 + min(self._table[i] for i in self._indexes(key))
+
+    def _reset(self):
+        self._table = bytearray(count >> 1 for count in self._table)
+        self._doorkeeper = bytearray(len(self._doorkeeper))
+        self.additions //= 2
+
+
+class LRUShard:
+    """One lock-striped LRU partition of a TTLCache."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.entries: "OrderedDict[str, Any]" = OrderedDict()
+        # (expiry, key) pairs; superseded pairs are skipped when popped
+        self.expiry_heap: list = []
+        self.lock = threading.Lock()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.admission_rejected = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def record(self, key: str):
+        """Note a lookup of key (used by admission policies)."""
+
+    def lookup(self, key: str, now: float) -> Optional[Any]:
+        """Return the live entry for key, marking it recently used."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.expiry < now:
+            # Expires this instant but not yet popped from the heap
+            self.remove(key)
+            return None
+        self._touch(key)
+        return entry
+
+    def _touch(self, key: str):
+        self.entries.move_to_end(key)
+
+    def insert(self, key: str, entry: Any) -> List[str]:
+        """
+        Store entry under key.
+
+        Returns:
+            Keys evicted to make room
+        """
+        if key in self.entries:
+            self.remove(key)
+        self.entries[key] = entry
+        self.bytes += entry.size
+        heapq.heappush(self.expiry_heap, (entry.expiry, key))
+
+        evicted = []
+        while len(self.entries) > self.max_entries or (self.max_bytes and self.bytes > self.max_bytes):
+            oldest_key = next(iter(self.entries))
+            self.remove(oldest_key)
+            evicted.append(oldest_key)
+        return evicted
+
+    def remove(self, key: str) -> Any:
+        entry = self.entries.pop(key)
+        self.bytes -= entry.size
+        return entry
+
+    def expire(self, now: float) -> int:
+        """Drop entries whose expiry has passed, in O(expired)."""
+        heap = self.expiry_heap
+        expired = 0
+        while heap and heap[0][0] < now:
+            expiry, key = heapq.heappop(heap)
+            entry = self.entries.get(key)
+            if entry is not None and entry.expiry == expiry:
+                self.remove(key)
+                expired += 1
+
+        # Overwritten keys leave stale heap items behind; compact occasionally
+        if len(heap) > 2 * len(self.entries) + 64:
+            self.expiry_heap = [(entry.expiry, key) for key, entry in self.entries.items()]
+            heapq.heapify(self.expiry_heap)
+        return expired
+
+    def clear(self):
+        self.entries.clear()
+        self.expiry_heap.clear()
+        self.bytes = 0
+
+
+class WTinyLFUShard(LRUShard):
+    """
+    One W-TinyLFU partition of a TTLCache.
+
+    entries maps every key to its entry; the window, probation and
+    protected OrderedDicts only track LRU order within each segment.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        super().__init__(max_entries, max_bytes)
+        self.entries: Dict[str, Any] = {}
+        self.window: "OrderedDict[str, None]" = OrderedDict()
+        self.probation: "OrderedDict[str, None]" = OrderedDict()
+        self.protected: "OrderedDict[str, None]" = OrderedDict()
+        self.sketch = FrequencySketch(max_entries)
+
+        self.window_max_entries = max(1, int(max_entries * WINDOW_SHARE))
+        self.main_max_entries = max(1, max_entries - self.window_max_entries)
+        self.protected_max_entries = int(self.main_max_entries * PROTECTED_SHARE)
+        self.window_max_bytes = int(max_bytes * WINDOW_SHARE)
+        self.main_max_bytes = max_bytes - self.window_max_bytes
+        self.window_bytes = 0
+
+    def record(self, key: str):
+        self.sketch.increment(key)
+
+    def _touch(self, key: str):
+        if key in self.window:
+            self.window.move_to_end(key)
+        elif key in self.probation:
+            # Second hit in the main area: promote, demoting protected LRU if full
+            del self.probation[key]
+            self.protected[key] = None
+            while len(self.protected) > self.protected_max_entries:
+                demoted, _ = self.protected.popitem(last=False)
+                self.probation[demoted] = None
+        else:
+            self.protected.move_to_end(key)
+
+    def insert(self, key: str, entry: Any) -> List[str]:
+        existing = self.entries.get(key)
+        if existing is not None:
+            # Replace in place, keeping the key's segment
+            self.entries[key] = entry
+            self.bytes += entry.size - existing.size
+            if key in self.window:
+                self.window_bytes += entry.size - existing.size
+            heapq.heappush(self.expiry_heap, (entry.expiry, key))
+            self._touch(key)
+            return self._evict_main(None, [])
+
+        self.entries[key] = entry
+        self.bytes += entry.size
+        self.window[key] = None
+        self.window_bytes += entry.size
+        heapq.heappush(self.expiry_heap, (entry.expiry, key))
+
+        evicted = []
+        while len(self.window) > self.window_max_entries or (
+            self.max_bytes and self.window_bytes > self.window_max_bytes and len(self.window) > 1
+        ):
+            candidate, _ = self.window.popitem(last=False)
+            self.window_bytes -= self.entries[candidate].size
+            self.probation[candidate] = None
+            self._evict_main(candidate, evicted)
+        return evicted
+
+    def _main_over(self) -> bool:
+        main_entries = len(self.probation) + len(self.protected)
+        if main_entries > self.main_max_entries:
+            return True
+        return bool(self.max_bytes) and self.bytes - self.window_bytes > self.main_max_bytes
+
+    def _evict_main(self, candidate: Optional[str], evicted: List[str]) -> List[str]:
+        """Evict from the main area until it fits, letting candidate compete for admission."""
+        while self._main_over():
+            victim = next((k for k in self.probation if k != candidate), None)
+            if victim is None:
+                victim = next(iter(self.protected), None)
+
+            if victim is None:
+                if candidate is None:
+                    break
+                victim = candidate
+            elif candidate is not None and self.sketch.frequency(candidate) <= self.sketch.frequency(victim):
+                # Candidate is not more popular than what it would replace
+                victim = candidate
+                self.admission_rejected += 1
+
+            if victim == candidate:
+                candidate = None
+            self.remove(victim)
+            evicted.append(victim)
+        return evicted
+
+    def remove(self, key: str) -> Any:
+        entry = self.entries.pop(key)
+        self.bytes -= entry.size
+        if key in self.window:
+            del self.window[key]
+            self.window_bytes -= entry.size
+        else:
+            self.probation.pop(key, None)
+            self.protected.pop(key, None)
+        return entry
+
+    def clear(self):
+        super().clear()
+        self.window.clear()
+        self.probation.clear()
+        self.protected.clear()
+        self.window_bytes = 0
@@ -5,18 +5,60 @@ Provides distributed caching with connection pooling and retry logic.
 Maintains same interface as TTLCache for drop-in replacement.
 """
 import os
-import json
 import logging
 import asyncio
-from typing import Any, Optional, Union
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
 from functools import wraps
 
 import redis.asyncio as redis
 from redis.asyncio import Redis
 from redis.connection import ConnectionPool
 
+from .codec import Codec, CodecError, get_codec
+from .metrics import CacheMetrics
+
 logger = logging.getLogger(__name__)
 
+# Take the lease with a fencing token above every token issued or written.
+# Starting from the :written high-water mark keeps tokens increasing even if
+# the counter was evicted; the counter expires, but never before :written.
+_ACQUIRE_LEASE_SCRIPT = """
+local issued = tonumber(redis.call('GET', KEYS[2]) or '0')
+local written = tonumber(redis.call('GET', KEYS[3]) or '0')
+local fence = math.max(issued, written) + 1
+local keep = math.max(tonumber(ARGV[2]), redis.call('TTL', KEYS[3]))
+redis.call('SET', KEYS[2], fence, 'EX', keep)
+if redis.call('SET', KEYS[1], fence, 'NX', 'EX', ARGV[1]) then
+    return fence
+end
+return 0
+"""
+
+# Lifetime of an idle lease's fencing counter
+_FENCE_TTL_SECONDS = 86400
+
+# Delete the lease only if we still hold it, then wake up waiting workers
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    redis.call('PUBLISH', ARGV[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+# Write only if no higher fencing token has written this key
+_FENCED_SET_SCRIPT = """
+local written = tonumber(redis.call('GET', KEYS[2]) or '0')
+if written > tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[3])
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
 
 def retry_on_error(max_retries: int = 3, delay: float = 0.1):
     """Decorator to retry Redis operations on connection errors."""
@@ -47,7 +89,7 @@ class RedisCache:
     Features:
     - Connection pooling for efficient resource usage
     - Automatic retry with exponential backoff
-    - JSON serialization for complex objects
+    - Compact binary serialization with optional compression (see cache.codec)
     - Same interface as TTLCache for compatibility
     - Distributed caching across multiple workers
 
@@ -64,16 +106,19 @@ class RedisCache:
         await cache.delete("search:topic:10")
     """
 
-    def __init__(self, redis_url: Optional[str] = None, max_connections: int = 10):
+    def __init__(self, redis_url: Optional[str] = None, max_connections: int = 10, codec: Optional[Codec] = None):
         """
         Initialize Redis cache with connection pooling.
 
         Args:
             redis_url: Redis connection URL (default: from REDIS_URL env var)
             max_connections: Maximum connections in pool (default: 10)
+            codec: Value codec (default: configured by CACHE_SERIALIZER/CACHE_COMPRESSION)
         """
         self.redis_url = redis_url or os.getenv('REDIS_URL', 'redis://localhost:6379/0')
         self.max_connections = max_connections
+        self.codec = codec or get_codec()
+        self.metrics = CacheMetrics()
         self._pool: Optional[ConnectionPool] = None
         self._redis: Optional[Redis] = None
 
@@ -83,12 +128,26 @@ class RedisCache:
             self._pool = redis.ConnectionPool.from_url(
                 self.redis_url,
                 max_connections=self.max_connections,
-                decode_responses=True
+                # Values are binary (see cache.codec)
+                decode_responses=False
             )
             self._redis = Redis(connection_pool=self._pool)
             logger.info(f"[REDIS] Connected to {self.redis_url}")
         return self._redis
 
+    def _record_get(self, key: str, data: Optional[bytes], seconds: float):
+        """Count a read of this worker by key prefix."""
+        self.metrics.incr(key, "hits" if data is not None else "misses")
+        self.metrics.observe_latency(key, "get_ms", seconds)
+        if data is not None:
+            self.metrics.observe_size(key, "value_bytes", len(data))
+
+    def _record_set(self, key: str, serialized: bytes, seconds: float):
+        """Count a write of this worker by key prefix."""
+        self.metrics.incr(key, "sets")
+        self.metrics.observe_latency(key, "set_ms", seconds)
+        self.metrics.observe_size(key, "value_bytes", len(serialized))
+
     async def close(self):
         """Close Redis connection pool."""
         if self._redis:
@@ -112,20 +171,123 @@ class RedisCache:
         """
         try:
             r = await self._get_redis()
+            start = time.perf_counter()
             data = await r.get(key)
+            self._record_get(key, data, time.perf_counter() - start)
 
             if data is None:
                 return None
 
-            # Deserialize JSON
-            return json.loads(data)
-        except json.JSONDecodeError as e:
+            return self.codec.decode(data)
+        except CodecError as e:
             logger.error(f"[REDIS] Failed to decode value for key {key}: {e}")
             return None
         except Exception as e:
             logger.error(f"[REDIS] Get error for key {key}: {e}")
             raise
 
+    @retry_on_error(max_retries=3)
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[Any], int]:
+        """
+        Get a value and its remaining time-to-live in one round trip.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (deserialized value or None, remaining TTL in seconds;
+            -1 if the key has no expiry, -2 if it does not exist)
+        """
+        try:
+            r = await self._get_redis()
+            start = time.perf_counter()
+            async with r.pipeline(transaction=False) as pipe:
+                data, ttl = await pipe.get(key).ttl(key).execute()
+            self._record_get(key, data, time.perf_counter() - start)
+
+            if data is None:
+                return None, -2
+
+            return self.codec.decode(data), ttl
+        except CodecError as e:
+            logger.error(f"[REDIS] Failed to decode value for key {key}: {e}")
+            return None, -2
+        except Exception as e:
+            logger.error(f"[REDIS] Get error for key {key}: {e}")
+            raise
+
+    @retry_on_error(max_retries=3)
+    async def get_many_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[Any], int]]:
+        """
+        Get several values and their remaining TTLs in one round trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            One (value or None, remaining TTL) tuple per key, as get_with_ttl
+        """
+        if not keys:
+            return []
+        try:
+            r = await self._get_redis()
+            start = time.perf_counter()
+            async with r.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.get(key).ttl(key)
+                replies = await pipe.execute()
+            elapsed = time.perf_counter() - start
+
+            results = []
+            for i, key in enumerate(keys):
+                data, ttl = replies[2 * i], replies[2 * i + 1]
+                self._record_get(key, data, elapsed / len(keys))
+                if data is None:
+                    results.append((None, -2))
+                    continue
+                try:
+                    results.append((self.codec.decode(data), ttl))
+                except CodecError as e:
+                    logger.error(f"[REDIS] Failed to decode value for key {key}: {e}")
+                    results.append((None, -2))
+            return results
+        except Exception as e:
+            logger.error(f"[REDIS] Bulk get error for {len(keys)} keys: {e}")
+            raise
+
+    @retry_on_error(max_retries=3)
+    async def set_many(self, items: Dict[str, Any], ttl: int) -> bool:
+        """
+        Set several values with the same TTL in one round trip.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time-to-live in seconds
+
+        Returns:
+            True if successful, False if a value could not be serialized
+        """
+        if not items:
+            return True
+        try:
+            r = await self._get_redis()
+            encoded = {key: self.codec.encode(value) for key, value in items.items()}
+            start = time.perf_counter()
+            async with r.pipeline(transaction=False) as pipe:
+                for key, serialized in encoded.items():
+                    pipe.setex(key, ttl, serialized)
+                await pipe.execute()
+            elapsed = time.perf_counter() - start
+            for key, serialized in encoded.items():
+                self._record_set(key, serialized, elapsed / len(encoded))
+            return True
+        except (TypeError, ValueError) as e:
+            logger.error(f"[REDIS] Failed to serialize bulk values: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"[REDIS] Bulk set error for {len(items)} keys: {e}")
+            raise
+
     @retry_on_error(max_retries=3)
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """
@@ -133,7 +295,7 @@ class RedisCache:
 
         Args:
             key: Cache key
-            value: Value to cache (must be JSON serializable)
+            value: Value to cache (must be JSON serializable; stored via the codec)
             ttl: Time-to-live in seconds (optional)
 
         Returns:
@@ -141,12 +303,14 @@ class RedisCache:
         """
         try:
             r = await self._get_redis()
-            serialized = json.dumps(value, default=str)
+            serialized = self.codec.encode(value)
 
+            start = time.perf_counter()
             if ttl:
                 await r.setex(key, ttl, serialized)
             else:
                 await r.set(key, serialized)
+            self._record_set(key, serialized, time.perf_counter() - start)
 
             return True
         except (TypeError, ValueError) as e:
@@ -227,16 +391,121 @@ class RedisCache:
                 "used_memory": info.get('used_memory_human', 'N/A'),
                 "max_memory": info.get('maxmemory_human', 'N/A'),
                 "connected_clients": info.get('connected_clients', 0),
+                # Whole database, including rate limiter and lease keys; see "prefixes"
                 "hit_rate": info.get('keyspace_hits', 0) / (info.get('keyspace_hits', 0) + info.get('keyspace_misses', 1)) if info.get('keyspace_hits', 0) > 0 else 0,
-                "uptime_seconds": info.get('uptime_in_seconds', 0)
+                "uptime_seconds": info.get('uptime_in_seconds', 0),
+                "prefixes": self.metrics.snapshot(),
             }
         except Exception as e:
             logger.error(f"[REDIS] Stats error: {e}")
             return {
                 "total_entries": 0,
-                "error": str(e)
+                "error": str(e),
+                "prefixes": self.metrics.snapshot(),
             }
 
+    @retry_on_error(max_retries=3)
+    async def acquire_lease(self, name: str, ttl_seconds: int) -> Optional[int]:
+        """
+        Try to take an exclusive, expiring lease shared by all workers.
+
+        Args:
+            name: Lease name (e.g. the cache key being computed)
+            ttl_seconds: Lease lifetime; it expires if the holder dies
+
+        Returns:
+            A fencing token (increases with every acquisition attempt) if the
+            lease was acquired, None if another worker holds it
+        """
+        try:
+            r = await self._get_redis()
+            fence = await r.eval(
+                _ACQUIRE_LEASE_SCRIPT, 3, f"lease:{name}", f"lease:{name}:fence", f"lease:{name}:written",
+                str(ttl_seconds), str(max(ttl_seconds, _FENCE_TTL_SECONDS))
+            )
+            return int(fence) or None
+        except Exception as e:
+            logger.error(f"[REDIS] Lease acquire error for {name}: {e}")
+            raise
+
+    @retry_on_error(max_retries=3)
+    async def release_lease(self, name: str, fence: int) -> bool:
+        """
+        Release a lease if it is still held with this fencing token and
+        notify waiting workers.
+
+        Returns:
+            True if the lease was released, False if it had expired or
+            been taken over
+        """
+        try:
+            r = await self._get_redis()
+            released = await r.eval(
+                _RELEASE_LEASE_SCRIPT, 1, f"lease:{name}", str(fence), f"lease:{name}:done"
+            )
+            return bool(released)
+        except Exception as e:
+            logger.error(f"[REDIS] Lease release error for {name}: {e}")
+            raise
+
+    @retry_on_error(max_retries=3)
+    async def wait_for_lease(self, name: str, timeout: float, poll_interval: float = 1.0) -> bool:
+        """
+        Wait until another worker's lease is released or expires.
+
+        Listens for the release notification and polls the lease as a
+        backstop for missed messages.
+
+        Returns:
+            True if the lease is gone, False if timeout elapsed first
+        """
+        r = await self._get_redis()
+        pubsub = r.pubsub()
+        # Subscribe before checking so a release in between is not missed
+        await pubsub.subscribe(f"lease:{name}:done")
+        try:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while await r.exists(f"lease:{name}"):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=min(poll_interval, remaining)
+                )
+            return True
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    @retry_on_error(max_retries=3)
+    async def set_fenced(self, key: str, value: Any, ttl: int, lease_name: str, fence: int) -> bool:
+        """
+        Set a value unless a newer lease holder has already written it.
+
+        Protects against a holder whose lease expired mid-computation
+        overwriting the result of the worker that took over.
+
+        Returns:
+            True if written, False if rejected as stale
+        """
+        try:
+            r = await self._get_redis()
+            serialized = self.codec.encode(value)
+            start = time.perf_counter()
+            written = await r.eval(
+                _FENCED_SET_SCRIPT, 2, key, f"lease:{lease_name}:written",
+                str(fence), serialized, str(ttl)
+            )
+            self._record_set(key, serialized, time.perf_counter() - start)
+            return bool(written)
+        except (TypeError, ValueError) as e:
+            logger.error(f"[REDIS] Failed to serialize value for key {key}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"[REDIS] Fenced set error for key {key}: {e}")
+            raise
+
     @retry_on_error(max_retries=3)
     async def ping(self) -> bool:
         """
@@ -0,0 +1,270 @@
+"""
+Persistent density score store for SGNL backend.
+
+CPIDR, DEPID and readability scores are deterministic functions of the
+text, so they are kept on disk keyed by the SHA-256 of the text and the
+scorer version. Scores survive restarts and cache expiry, and are only
+recomputed when the text or the scorer changes.
+
+The store is a SQLite database read through mmap, bounded by total row
+size, and evicts least recently used scores first.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Largest mmap window used for reads
+MAX_MMAP_BYTES = 256 * 1024 * 1024
+
+# Fraction of max_bytes freed per eviction pass, so eviction runs rarely
+EVICTION_HEADROOM = 0.1
+
+# Hashes per query in bulk lookups (below SQLite's variable limit)
+BULK_CHUNK_SIZE = 500
+
+# Only rewrite last_access when it is older than this (saves a write per hit)
+ACCESS_UPDATE_INTERVAL_SECONDS = 60
+
+
+class ScoreStore:
+    """
+    SQLite-backed store of scores keyed by (metric, scorer version, content hash).
+
+    Thread-safe; callers on the event loop should use asyncio.to_thread.
+
+    Usage:
+        store = ScoreStore("./score_store.db", max_bytes=100_000_000)
+        store.put("cpidr", "ideadensity-0.1/1", content_hash, 0.61)
+        store.get("cpidr", "ideadensity-0.1/1", content_hash)  # 0.61
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Upper bound on the total size of stored rows
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={min(max_bytes * 2, MAX_MMAP_BYTES)}")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scores (
+                metric TEXT NOT NULL,
+                version TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (metric, version, content_hash)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS scores_last_access ON scores (last_access)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM scores").fetchone()[0]
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, metric: str, version: str, content_hash: str) -> Optional[Any]:
+        """
+        Get a stored score.
+
+        Returns:
+            The stored JSON value, or None if the text was not scored by
+            this scorer version
+        """
+        now = time.time()
+        with self.lock:
+            row = self._conn.execute(
+                "SELECT value, last_access FROM scores WHERE metric = ? AND version = ? AND content_hash = ?",
+                (metric, version, content_hash),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if now - row[1] > ACCESS_UPDATE_INTERVAL_SECONDS:
+                self._conn.execute(
+                    "UPDATE scores SET last_access = ? WHERE metric = ? AND version = ? AND content_hash = ?",
+                    (now, metric, version, content_hash),
+                )
+            self.hits += 1
+        return json.loads(row[0])
+
+    def get_many(self, metric: str, version: str, content_hashes: List[str]) -> Dict[str, Any]:
+        """
+        Get the stored scores for several texts in one query per 500 hashes.
+
+        Returns:
+            Mapping of content hash to value for the hashes found
+        """
+        found = {}
+        now = time.time()
+        with self.lock:
+            for i in range(0, len(content_hashes), BULK_CHUNK_SIZE):
+                chunk = content_hashes[i:i + BULK_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT content_hash, value, last_access FROM scores "
+                    f"WHERE metric = ? AND version = ? AND content_hash IN ({placeholders})",
+                    (metric, version, *chunk),
+                ).fetchall()
+                stale = [(now, metric, version, h) for h, _, last_access in rows
+                         if now - last_access > ACCESS_UPDATE_INTERVAL_SECONDS]
+                if stale:
+                    self._conn.executemany(
+                        "UPDATE scores SET last_access = ? WHERE metric = ? AND version = ? AND content_hash = ?",
+                        stale,
+                    )
+                for content_hash, value, _ in rows:
+                    found[content_hash] = json.loads(value)
+            self.hits += len(found)
+            self.misses += len(set(content_hashes)) - len(found)
+        return found
+
+    def put_many(self, metric: str, version: str, values: Dict[str, Any]) -> None:
+        """Store scores for several texts in one transaction."""
+        if not values:
+            return
+        now = time.time()
+        rows = []
+        for content_hash, value in values.items():
+            encoded = json.dumps(value, separators=(",", ":"))
+            size = len(metric) + len(version) + len(content_hash) + len(encoded)
+            rows.append((metric, version, content_hash, encoded, size, now))
+
+        with self.lock:
+            delta = 0
+            self._conn.execute("BEGIN")
+            try:
+                for row in rows:
+                    old = self._conn.execute(
+                        "SELECT size FROM scores WHERE metric = ? AND version = ? AND content_hash = ?",
+                        row[:3],
+                    ).fetchone()
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO scores (metric, version, content_hash, value, size, last_access) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        row,
+                    )
+                    delta += row[4] - (old[0] if old else 0)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._total_bytes += delta
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def put(self, metric: str, version: str, content_hash: str, value: Any) -> None:
+        """Store a JSON-serializable score."""
+        encoded = json.dumps(value, separators=(",", ":"))
+        size = len(metric) + len(version) + len(content_hash) + len(encoded)
+
+        with self.lock:
+            row = self._conn.execute(
+                "SELECT size FROM scores WHERE metric = ? AND version = ? AND content_hash = ?",
+                (metric, version, content_hash),
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scores (metric, version, content_hash, value, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (metric, version, content_hash, encoded, size, time.time()),
+            )
+            self._total_bytes += size - (row[0] if row else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used scores down to below the size bound (lock held)."""
+        target = self.max_bytes * (1 - EVICTION_HEADROOM)
+        total = self._total_bytes
+        evicted_count = 0
+        while total > target:
+            rows = self._conn.execute(
+                "SELECT metric, version, content_hash, size FROM scores ORDER BY last_access LIMIT 500"
+            ).fetchall()
+            if not rows:
+                break
+            evicted = []
+            for metric, version, content_hash, size in rows:
+                if total <= target:
+                    break
+                evicted.append((metric, version, content_hash))
+                total -= size
+            self._conn.executemany(
+                "DELETE FROM scores WHERE metric = ? AND version = ? AND content_hash = ?", evicted
+            )
+            evicted_count += len(evicted)
+
+        self._total_bytes = total
+        self.evictions += evicted_count
+        logger.debug(f"[SCORE_STORE] Evicted {evicted_count} scores")
+
+    def clear(self):
+        """Remove all stored scores."""
+        with self.lock:
+            self._conn.execute("DELETE FROM scores")
+            self._total_bytes = 0
+        logger.info("[SCORE_STORE] Store cleared")
+
+    def get_stats(self) -> dict:
+        """Get store statistics."""
+        with self.lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            total = self._total_bytes
+        return {
+            "entries": entries,
+            "total_bytes": total,
+            "max_bytes": self.max_bytes,
+            "usage_percent": round((total / self.max_bytes) * 100, 2) if self.max_bytes else 0.0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        """Close the database connection."""
+        with self.lock:
+            self._conn.close()
+
+
+_score_store: Optional[ScoreStore] = None
+_score_store_lock = threading.Lock()
+
+
+def get_score_store() -> Optional[ScoreStore]:
+    """Get or create the global score store, or None if SCORE_STORE_MAX_BYTES is 0."""
+    global _score_store
+
+    if _score_store is None and config.SCORE_STORE_MAX_BYTES > 0:
+        with _score_store_lock:
+            if _score_store is None:
+                _score_store = ScoreStore(config.SCORE_STORE_PATH, config.SCORE_STORE_MAX_BYTES)
+                logger.info(
+                    f"[SCORE_STORE] Initialized at {config.SCORE_STORE_PATH} "
+                    f"(max_bytes={config.SCORE_STORE_MAX_BYTES})"
+                )
+
+    return _score_store
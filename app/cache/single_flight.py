@@ -0,0 +1,114 @@
+"""
+In-flight request coalescing for SGNL backend.
+
+When several callers ask for the same key at once, only the first one
+runs the computation; the others await its result. Once the computation
+finishes the key is released, so later callers start a fresh one (they
+are expected to hit a result cache instead).
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one computation.
+
+    The computation runs in its own task, so a caller that is cancelled
+    (e.g. a client disconnect or timeout) does not cancel the work other
+    callers are waiting on. When the last waiting caller is cancelled the
+    computation is cancelled too, unless it was started in the background
+    with start().
+
+    Usage:
+        flight = SingleFlight()
+        result = await flight.do(url, lambda: expensive(url))
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self._background: set = set()
+
+        # Statistics
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() for key, or join the run already in progress.
+
+        Args:
+            key: Identifies identical requests
+            fn: Zero-argument coroutine function producing the result
+
+        Returns:
+            The result of fn() (exceptions are raised to every caller)
+        """
+        task = self._join(key, fn)
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and key not in self._background and not task.done():
+                logger.debug(f"[SINGLE_FLIGHT] All callers gone, cancelling: {key}")
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def start(self, key: str, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        Start fn() for key in the background unless it is already running.
+
+        A background computation runs to completion even if no caller
+        waits for it.
+
+        Returns:
+            The task computing the result for key
+        """
+        task = self._join(key, fn)
+        self._background.add(key)
+        return task
+
+    def _join(self, key: str, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._tasks.get(key)
+        if task is None:
+            self.started += 1
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._release(key, t))
+        else:
+            self.coalesced += 1
+            logger.debug(f"[SINGLE_FLIGHT] Joined in-flight request: {key}")
+        return task
+
+    def is_running(self, key: str) -> bool:
+        """True if a computation for key is in progress."""
+        return key in self._tasks
+
+    def _release(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+            self._background.discard(key)
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller went away
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Number of computations currently running."""
+        return len(self._tasks)
+
+    def get_stats(self) -> dict:
+        """Get coalescing statistics."""
+        return {
+            "in_flight": self.in_flight(),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
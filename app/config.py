@@ -4,8 +4,9 @@ All environment variables are centralized here for maintainability.
 Import the `config` singleton instead of using os.getenv() directly.
 """
 
+import json
 import os
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
@@ -44,19 +45,58 @@ class Config(BaseModel):
 
     # ============ Content Extraction ============
     DENSITY_THRESHOLD: float = Field(default=0.45, ge=0.0, le=1.0)
+    DENSITY_MODE: str = Field(default="sampled")
+    DENSITY_SAMPLE_MIN_WORDS: int = Field(default=12000, ge=0)
+    DENSITY_SAMPLE_MAX_WORDS: int = Field(default=3000, ge=100)
+    DENSITY_SAMPLE_MAX_ERROR: float = Field(default=0.02, gt=0.0, le=1.0)
     LLM_MAX_CHARS: int = Field(default=12000, ge=1000)
     FAST_SEARCH_TIMEOUT_SECONDS: float = Field(default=30.0, ge=1.0)
     SCAN_TOPIC_TIMEOUT_SECONDS: float = Field(default=180.0, ge=1.0)
+    ANALYZE_CONCURRENCY: int = Field(default=5, ge=1)
+    ANALYZE_ITEM_TIMEOUT_SECONDS: float = Field(default=20.0, ge=1.0)
+    FETCH_MAX_BYTES: int = Field(default=5_000_000, ge=1024)
+    FETCH_SCORING_BYTES: int = Field(default=1_000_000, ge=0)
+
+    # ============ Scoring Cascade ============
+    SCORING_CASCADE_ENABLED: bool = Field(default=False)
+    CASCADE_SIGNAL_LOW: float = Field(default=0.2, ge=0.0, le=1.0)
+    CASCADE_SIGNAL_HIGH: float = Field(default=0.85, ge=0.0, le=1.0)
+    CASCADE_HEURISTIC_LOW: int = Field(default=20, ge=0, le=100)
+    CASCADE_HEURISTIC_HIGH: int = Field(default=80, ge=0, le=100)
+
+    # ============ CPU Pool ============
+    CPU_POOL_WORKERS: int = Field(default=0, ge=0)
+    CPU_TASK_TIMEOUT_SECONDS: float = Field(default=15.0, ge=1.0)
+    CPU_POOL_MAX_TASKS_PER_WORKER: int = Field(default=200, ge=1)
 
     # ============ Density Weights (sum should be 1.0) ============
     CPIDR_WEIGHT: float = Field(default=0.5, ge=0.0, le=1.0)
     DEPID_WEIGHT: float = Field(default=0.3, ge=0.0, le=1.0)
     READABILITY_WEIGHT: float = Field(default=0.2, ge=0.0, le=1.0)
 
+    # ============ URL Canonicalization ============
+    URL_CANONICAL_RULES: str = Field(default="")
+
     # ============ Cache Configuration ============
     CACHE_MAX_SIZE: int = Field(default=1000, ge=1)
+    CACHE_MAX_BYTES: int = Field(default=268435456, ge=0)
+    CACHE_SHARDS: int = Field(default=8, ge=1)
+    CACHE_POLICY: str = Field(default="lru")
+    CACHE_REGIONS: str = Field(default="")
     CACHE_TTL_FAST_SEARCH: int = Field(default=3600, ge=1)
     CACHE_TTL_SCAN_TOPIC: int = Field(default=3600, ge=1)
+    CACHE_TTL_EXTRACT: int = Field(default=3600, ge=1)
+    CACHE_STALE_GRACE_SECONDS: int = Field(default=600, ge=0)
+    CACHE_TOPIC_DROP_STOPWORDS: bool = Field(default=False)
+    CACHE_TOPIC_SORT_TERMS: bool = Field(default=False)
+    CACHE_SERIALIZER: str = Field(default="auto")
+    CACHE_COMPRESSION: str = Field(default="auto")
+    CACHE_COMPRESS_MIN_BYTES: int = Field(default=1024, ge=0)
+    PAGE_CACHE_PATH: str = Field(default="./page_cache.db")
+    PAGE_CACHE_MAX_BYTES: int = Field(default=500_000_000, ge=0)
+    PAGE_CACHE_FRESH_SECONDS: int = Field(default=300, ge=0)
+    SCORE_STORE_PATH: str = Field(default="./score_store.db")
+    SCORE_STORE_MAX_BYTES: int = Field(default=100_000_000, ge=0)
 
     @field_validator("LOG_LEVEL")
     @classmethod
@@ -68,6 +108,72 @@ class Config(BaseModel):
             raise ValueError(f"LOG_LEVEL must be one of {allowed}, got {v}")
         return v_upper
 
+    @field_validator("URL_CANONICAL_RULES")
+    @classmethod
+    def validate_url_canonical_rules(cls, v: str) -> str:
+        """Validate per-domain URL rules are a JSON object of objects."""
+        if not v.strip():
+            return ""
+        try:
+            rules = json.loads(v)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"URL_CANONICAL_RULES must be valid JSON: {e}")
+        if not isinstance(rules, dict) or not all(isinstance(r, dict) for r in rules.values()):
+            raise ValueError("URL_CANONICAL_RULES must map domains to rule objects")
+        return v
+
+    @field_validator("DENSITY_MODE")
+    @classmethod
+    def validate_density_mode(cls, v: str) -> str:
+        """Validate the density scoring mode."""
+        allowed = {"sampled", "exact"}
+        if v not in allowed:
+            raise ValueError(f"DENSITY_MODE must be one of {allowed}, got {v}")
+        return v
+
+    @field_validator("CACHE_POLICY")
+    @classmethod
+    def validate_cache_policy(cls, v: str) -> str:
+        """Validate the in-memory cache eviction policy."""
+        allowed = {"lru", "tinylfu"}
+        if v not in allowed:
+            raise ValueError(f"CACHE_POLICY must be one of {allowed}, got {v}")
+        return v
+
+    @field_validator("CACHE_REGIONS")
+    @classmethod
+    def validate_cache_regions(cls, v: str) -> str:
+        """Validate CACHE_REGIONS is a list of prefix=share pairs summing below 1."""
+        total = 0.0
+        for item in filter(None, (part.strip() for part in v.split(","))):
+            prefix, sep, share = item.partition("=")
+            try:
+                value = float(share)
+            except ValueError:
+                value = -1.0
+            if not sep or not prefix.strip() or not 0 < value < 1:
+                raise ValueError(f"CACHE_REGIONS entries must look like prefix=0.1, got {item!r}")
+            total += value
+        if total >= 1:
+            raise ValueError("CACHE_REGIONS shares must sum to less than 1")
+        return v
+
+    @property
+    def CACHE_REGIONS_MAP(self) -> Dict[str, float]:
+        """Get CACHE_REGIONS as a dict of key prefix -> capacity share."""
+        regions = {}
+        for item in filter(None, (part.strip() for part in self.CACHE_REGIONS.split(","))):
+            prefix, _, share = item.partition("=")
+            regions[prefix.strip()] = float(share)
+        return regions
+
+    @property
+    def URL_CANONICAL_RULES_MAP(self) -> Dict[str, Dict[str, Any]]:
+        """Get URL_CANONICAL_RULES as a dict keyed by lowercase domain."""
+        if not self.URL_CANONICAL_RULES:
+            return {}
+        return {domain.lower(): rules for domain, rules in json.loads(self.URL_CANONICAL_RULES).items()}
+
     @property
     def ALLOWED_ORIGINS_LIST(self) -> List[str]:
         """Get ALLOWED_ORIGINS as a list of strings."""
@@ -110,17 +216,53 @@ def _load_from_env() -> dict:
         "LOG_LEVEL": os.getenv("LOG_LEVEL", "INFO"),
         # Content Extraction
         "DENSITY_THRESHOLD": float(os.getenv("DENSITY_THRESHOLD", "0.45")),
+        "DENSITY_MODE": os.getenv("DENSITY_MODE", "sampled").lower(),
+        "DENSITY_SAMPLE_MIN_WORDS": int(os.getenv("DENSITY_SAMPLE_MIN_WORDS", "12000")),
+        "DENSITY_SAMPLE_MAX_WORDS": int(os.getenv("DENSITY_SAMPLE_MAX_WORDS", "3000")),
+        "DENSITY_SAMPLE_MAX_ERROR": float(os.getenv("DENSITY_SAMPLE_MAX_ERROR", "0.02")),
         "LLM_MAX_CHARS": int(os.getenv("LLM_MAX_CHARS", "12000")),
         "FAST_SEARCH_TIMEOUT_SECONDS": float(os.getenv("FAST_SEARCH_TIMEOUT_SECONDS", "30")),
         "SCAN_TOPIC_TIMEOUT_SECONDS": float(os.getenv("SCAN_TOPIC_TIMEOUT_SECONDS", "180")),
+        "ANALYZE_CONCURRENCY": int(os.getenv("ANALYZE_CONCURRENCY", "5")),
+        "ANALYZE_ITEM_TIMEOUT_SECONDS": float(os.getenv("ANALYZE_ITEM_TIMEOUT_SECONDS", "20")),
+        "FETCH_MAX_BYTES": int(os.getenv("FETCH_MAX_BYTES", "5000000")),
+        "FETCH_SCORING_BYTES": int(os.getenv("FETCH_SCORING_BYTES", "1000000")),
+        # Scoring Cascade
+        "SCORING_CASCADE_ENABLED": os.getenv("SCORING_CASCADE_ENABLED", "false").lower() == "true",
+        "CASCADE_SIGNAL_LOW": float(os.getenv("CASCADE_SIGNAL_LOW", "0.2")),
+        "CASCADE_SIGNAL_HIGH": float(os.getenv("CASCADE_SIGNAL_HIGH", "0.85")),
+        "CASCADE_HEURISTIC_LOW": int(os.getenv("CASCADE_HEURISTIC_LOW", "20")),
+        "CASCADE_HEURISTIC_HIGH": int(os.getenv("CASCADE_HEURISTIC_HIGH", "80")),
+        # CPU Pool
+        "CPU_POOL_WORKERS": int(os.getenv("CPU_POOL_WORKERS", "0")),
+        "CPU_TASK_TIMEOUT_SECONDS": float(os.getenv("CPU_TASK_TIMEOUT_SECONDS", "15")),
+        "CPU_POOL_MAX_TASKS_PER_WORKER": int(os.getenv("CPU_POOL_MAX_TASKS_PER_WORKER", "200")),
         # Density Weights
         "CPIDR_WEIGHT": float(os.getenv("CPIDR_WEIGHT", "0.5")),
         "DEPID_WEIGHT": float(os.getenv("DEPID_WEIGHT", "0.3")),
         "READABILITY_WEIGHT": float(os.getenv("READABILITY_WEIGHT", "0.2")),
+        # URL Canonicalization
+        "URL_CANONICAL_RULES": os.getenv("URL_CANONICAL_RULES", ""),
         # Cache
         "CACHE_MAX_SIZE": int(os.getenv("CACHE_MAX_SIZE", "1000")),
+        "CACHE_MAX_BYTES": int(os.getenv("CACHE_MAX_BYTES", "268435456")),
+        "CACHE_SHARDS": int(os.getenv("CACHE_SHARDS", "8")),
+        "CACHE_POLICY": os.getenv("CACHE_POLICY", "lru").lower(),
+        "CACHE_REGIONS": os.getenv("CACHE_REGIONS", ""),
         "CACHE_TTL_FAST_SEARCH": int(os.getenv("CACHE_TTL_FAST_SEARCH", "3600")),
         "CACHE_TTL_SCAN_TOPIC": int(os.getenv("CACHE_TTL_SCAN_TOPIC", "3600")),
+        "CACHE_TTL_EXTRACT": int(os.getenv("CACHE_TTL_EXTRACT", "3600")),
+        "CACHE_STALE_GRACE_SECONDS": int(os.getenv("CACHE_STALE_GRACE_SECONDS", "600")),
+        "CACHE_TOPIC_DROP_STOPWORDS": os.getenv("CACHE_TOPIC_DROP_STOPWORDS", "false").lower() == "true",
+        "CACHE_TOPIC_SORT_TERMS": os.getenv("CACHE_TOPIC_SORT_TERMS", "false").lower() == "true",
+        "CACHE_SERIALIZER": os.getenv("CACHE_SERIALIZER", "auto").lower(),
+        "CACHE_COMPRESSION": os.getenv("CACHE_COMPRESSION", "auto").lower(),
+        "CACHE_COMPRESS_MIN_BYTES": int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "1024")),
+        "PAGE_CACHE_PATH": os.getenv("PAGE_CACHE_PATH", "./page_cache.db"),
+        "PAGE_CACHE_MAX_BYTES": int(os.getenv("PAGE_CACHE_MAX_BYTES", "500000000")),
+        "PAGE_CACHE_FRESH_SECONDS": int(os.getenv("PAGE_CACHE_FRESH_SECONDS", "300")),
+        "SCORE_STORE_PATH": os.getenv("SCORE_STORE_PATH", "./score_store.db"),
+        "SCORE_STORE_MAX_BYTES": int(os.getenv("SCORE_STORE_MAX_BYTES", "100000000")),
     }
 
 
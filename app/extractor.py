@@ -7,17 +7,30 @@ Includes CPIDR-based density scoring via ideadensity.
 import trafilatura
 from trafilatura.settings import use_config
 import httpx
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Union
 import logging
 import re
 from urllib.parse import urlparse
 import time
 import asyncio
 import hashlib
+import math
+from importlib import metadata
 
 from config import config
-from security.url_validator import validate_url
+from security.url_validator import validate_url_async
+from security.pinned_transport import PinnedIPTransport
 from cache import get_cache
+from cache.page_cache import get_page_cache
+from cache.score_store import get_score_store
+from cache.single_flight import SingleFlight
+from services.cpu_pool import run_cpu_bound
+from services.cascade import STAGE_CPIDR, STAGE_DEPID, cascade_verdict
+from services.density_sampling import SAMPLER_VERSION, estimate_ratios, split_units
+from services.document import ParsedDocument
+from services.readability import ENGINE_VERSION as READABILITY_ENGINE_VERSION
+from services.readability import SYLLABLE_SOURCE, readability_scores
+from services.url_canonical import canonicalize_url
 
 # ideadensity for content density scoring (CPIDR and DEPID metrics)
 try:
@@ -28,13 +41,21 @@ except ImportError:
     cpidr = None
     depid = None
 
-# textstat for readability metrics
+# Internals used to score spaCy Docs directly (shared parse, batches)
 try:
-    import textstat
-    TEXTSTAT_AVAILABLE = True
+    from ideadensity.depid import (
+        PROPOSITION_DEPENDENCIES,
+        filter_excluded_determiners,
+        filter_excluded_nsubjs,
+        get_nlp as get_depid_nlp,
+    )
+    from ideadensity.idea_density_rater import count_words_and_propositions
+    from ideadensity.idea_density_rater_rules import apply_idea_counting_rules
+    from ideadensity.tagger import get_nlp as get_tagger_nlp
+    from ideadensity.word_item import WordList
+    SHARED_PARSE_AVAILABLE = IDEADENSITY_AVAILABLE
 except ImportError:
-    TEXTSTAT_AVAILABLE = False
-    textstat = None
+    SHARED_PARSE_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -46,8 +67,23 @@ TRAFILATURA_CONFIG.set("DEFAULT", "EXTRACTION_TIMEOUT", "15")
 _http_client = None
 
 
+def _trusted_upstream_hosts() -> set:
+    """Hostnames of our own upstreams (n8n), exempt from SSRF pinning."""
+    hosts = set()
+    for url in (config.N8N_WEBHOOK_URL, config.N8N_FAST_SEARCH_URL):
+        if url:
+            hostname = urlparse(url).hostname
+            if hostname:
+                hosts.add(hostname)
+    return hosts
+
+
 def get_http_client() -> httpx.AsyncClient:
-    """Get or create a shared HTTP client with connection pooling."""
+    """Get or create a shared HTTP client with connection pooling.
+
+    Connections are pinned to the IP the SSRF validator approved, and every
+    redirect hop is validated before it is followed.
+    """
     global _http_client
     if _http_client is None:
         limits = httpx.Limits(
@@ -56,10 +92,12 @@ def get_http_client() -> httpx.AsyncClient:
             keepalive_expiry=30.0
         )
         timeout = httpx.Timeout(15.0, connect=10.0)
+        transport = PinnedIPTransport(limits=limits, trusted_hosts=_trusted_upstream_hosts())
         _http_client = httpx.AsyncClient(
-            limits=limits,
+            transport=transport,
             timeout=timeout,
             follow_redirects=True,
+            event_hooks={"response": [transport.validate_redirect]},
             headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -81,10 +119,665 @@ async def close_http_client():
         logger.info("[HTTP] Shared client closed")
 
 
+# Content types accepted by fetch_html (a missing header is also accepted)
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# End of an HTML document; anything streamed after it is not needed
+_HTML_END = re.compile(rb"</html\s*>", re.IGNORECASE)
+
+
+class FetchError(Exception):
+    """Raised when a page is rejected before or while it is downloaded."""
+
+
+def _is_html_content_type(content_type: str) -> bool:
+    """Check whether a Content-Type header denotes an HTML document."""
+    if not content_type:
+        return True
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in HTML_CONTENT_TYPES
+
+
+class FetchedPage:
+    """
+    A fetched page body and how it was obtained.
+
+    not_modified is True when the body is known to be identical to the
+    copy in the page cache (fresh cache hit, 304 Not Modified, or a
+    byte-identical download), so scores stored for it can be reused.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        body: Union[bytes, str],
+        encoding: Optional[str] = None,
+        complete: bool = True,
+        not_modified: bool = False
+    ):
+        self.url = url
+        self.body = body
+        self.encoding = encoding
+        self.complete = complete
+        self.not_modified = not_modified
+
+
+async def _stream_body(response: httpx.Response, url: str, stop_after_bytes: Optional[int]) -> Tuple[bytes, bool]:
+    """
+    Read a response body within FETCH_MAX_BYTES.
+
+    Returns:
+        Tuple of (body, complete) where complete is False if reading
+        stopped at stop_after_bytes
+    """
+    max_bytes = config.FETCH_MAX_BYTES
+
+    content_type = response.headers.get("content-type", "")
+    if not _is_html_content_type(content_type):
+        raise FetchError(f"Unsupported content type: {content_type}")
+
+    declared = response.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise FetchError(f"Content-Length {declared} exceeds limit of {max_bytes} bytes")
+
+    chunks = []
+    received = 0
+    tail = b""
+    async for chunk in response.aiter_bytes():
+        received += len(chunk)
+        if received > max_bytes:
+            raise FetchError(f"Response exceeds limit of {max_bytes} bytes")
+        chunks.append(chunk)
+
+        # Look for </html> across the chunk boundary
+        if _HTML_END.search(tail + chunk):
+            break
+        tail = chunk[-16:]
+
+        if stop_after_bytes and received >= stop_after_bytes:
+            logger.debug(f"[FETCH] Stopped reading {url} after {received} bytes")
+            return b"".join(chunks), False
+
+    return b"".join(chunks), True
+
+
+# Concurrent fetches of the same page (by canonical URL) share one download
+_fetch_flight = SingleFlight()
+
+
+async def fetch_html(url: str, stop_after_bytes: Optional[int] = None) -> FetchedPage:
+    """
+    Stream an HTML page with the shared client, bounding memory and bandwidth.
+
+    The download is rejected up front if the Content-Type is not HTML or the
+    declared Content-Length exceeds FETCH_MAX_BYTES, and aborted if the body
+    grows past FETCH_MAX_BYTES. Reading stops early at the closing </html>
+    tag, or once stop_after_bytes have arrived (the truncated document is
+    returned; lxml parses it fine).
+
+    Pages go through the on-disk page cache: a copy fetched within
+    PAGE_CACHE_FRESH_SECONDS is served without a request, older copies are
+    revalidated with If-None-Match / If-Modified-Since.
+
+    The body is returned undecoded: the parser reads the bytes directly and
+    honours the header or <meta> charset, so the page is never turned into a
+    Python str.
+
+    Concurrent calls for URLs with the same canonical form (see
+    services.url_canonical) share a single download.
+
+    Args:
+        url: The URL to fetch (must already be SSRF-validated)
+        stop_after_bytes: Return after this many bytes (None or 0 reads the whole page)
+
+    Returns:
+        FetchedPage with the raw HTML bytes and the Content-Type charset
+
+    Raises:
+        FetchError: If the content type or size is not acceptable
+        httpx.HTTPError: On network errors or non-2xx status codes
+    """
+    key = f"{canonicalize_url(url)}:{stop_after_bytes or 0}"
+    return await _fetch_flight.do(key, lambda: _fetch_html(url, stop_after_bytes))
+
+
+async def _fetch_html(url: str, stop_after_bytes: Optional[int]) -> FetchedPage:
+    """Fetch a page through the page cache (see fetch_html)."""
+    page_cache = get_page_cache()
+    cached = await asyncio.to_thread(page_cache.get, url) if page_cache else None
+
+    # A truncated copy is only good enough for callers that would truncate too
+    if cached and not (cached["complete"] or stop_after_bytes):
+        cached = None
+
+    if cached and time.time() - cached["fetched_at"] < config.PAGE_CACHE_FRESH_SECONDS:
+        logger.debug(f"[FETCH] Page cache hit (fresh): {url}")
+        return FetchedPage(url, cached["body"], cached["encoding"], cached["complete"], not_modified=True)
+
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    client = get_http_client()
+    async with client.stream("GET", url, headers=headers) as response:
+        if response.status_code == 304 and cached:
+            await asyncio.to_thread(page_cache.touch, url)
+            logger.debug(f"[FETCH] Page cache revalidated (304): {url}")
+            return FetchedPage(url, cached["body"], cached["encoding"], cached["complete"], not_modified=True)
+
+        response.raise_for_status()
+        body, complete = await _stream_body(response, url, stop_after_bytes)
+        encoding = response.charset_encoding
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+
+    unchanged = False
+    if page_cache:
+        unchanged = await asyncio.to_thread(
+            page_cache.put, url, body, encoding, etag, last_modified, complete
+        )
+
+    return FetchedPage(url, body, encoding, complete, not_modified=unchanged)
+
+
+def _title_from_tag(html: str) -> Optional[str]:
+    """Extract the <title> text with a regex (tolerates malformed HTML)."""
+    # First try to match a properly closed title tag
+    match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.I)
+    if match:
+        return match.group(1).strip()
+    # Fallback: match unclosed title tag (malformed HTML)
+    match = re.search(r'<title[^>]*>([^<]+)$', html, re.I)
+    if match:
+        return match.group(1).strip()
+    return None
+
+
+# CPU-bound stages below run through run_cpu_bound (process pool or thread),
+# so they are top-level functions with picklable arguments and results.
+
+def _extract_document(
+    html: Union[bytes, str],
+    encoding: Optional[str] = None
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Parse a page once and extract its main text and title.
+
+    Args:
+        html: Raw HTML (fetched bytes or str)
+        encoding: Charset from the HTTP Content-Type header, if any
+
+    Returns:
+        Tuple of (extracted text, title); both None if no text was extracted
+    """
+    doc = ParsedDocument(html, encoding)
+    extracted = doc.extract_text(
+        include_comments=False,
+        include_tables=True,
+        include_links=False,
+        output_format="txt",
+        config=TRAFILATURA_CONFIG,
+    )
+    if not extracted:
+        return None, None
+    return extracted, doc.metadata_title()
+
+
+def _cpidr_density(text: str) -> float:
+    """Run CPIDR and return the raw density."""
+    # CPIDR returns either a float (density) or a tuple
+    # (word_count, proposition_count, density, word_list)
+    density_result = cpidr(text)
+    if isinstance(density_result, (tuple, list)):
+        return density_result[2]
+    return density_result
+
+
+def _depid_density(text: str) -> float:
+    """Run DEPID-R and return the raw density."""
+    # DEPID returns: (density, word_count, dependencies)
+    density, word_count, dependencies = depid(text, is_depid_r=True)
+    return density
+
+
+# Bump when the way a score is derived from the scorer output changes
+SCORE_FORMAT_REVISION = 1
+
+
+def _package_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+# Part of every persistent score key: new scorer versions rescore text
+SCORER_VERSIONS = {
+    "cpidr": f"ideadensity-{_package_version('ideadensity')}/{SCORE_FORMAT_REVISION}",
+    "depid": f"ideadensity-{_package_version('ideadensity')}/{SCORE_FORMAT_REVISION}",
+    "readability": (
+        f"readability-{READABILITY_ENGINE_VERSION}+{SYLLABLE_SOURCE}/{SCORE_FORMAT_REVISION}"
+    ),
+    "density-sample": (
+        f"ideadensity-{_package_version('ideadensity')}+sampler-{SAMPLER_VERSION}/{SCORE_FORMAT_REVISION}"
+    ),
+}
+
+
+async def _load_stored_score(metric: str, content_hash: str) -> Optional[Any]:
+    """Read a score from the persistent store (None if absent or disabled)."""
+    store = get_score_store()
+    if store is None:
+        return None
+    try:
+        return await asyncio.to_thread(store.get, metric, SCORER_VERSIONS[metric], content_hash)
+    except Exception as e:
+        logger.warning(f"[SCORE_STORE] Lookup failed: {e}")
+        return None
+
+
+async def _save_stored_score(metric: str, content_hash: str, value: Any) -> None:
+    """Write a score to the persistent store (no-op if disabled)."""
+    store = get_score_store()
+    if store is None:
+        return
+    try:
+        await asyncio.to_thread(store.put, metric, SCORER_VERSIONS[metric], content_hash, value)
+    except Exception as e:
+        logger.warning(f"[SCORE_STORE] Store failed: {e}")
+
+
+# Log tag per density metric
+_METRIC_TAGS = {"cpidr": "[DENSITY]", "depid": "[DEPID]", "density-sample": "[DENSITY]"}
+
+
+async def _lookup_value(metric: str, content_hash: str) -> Optional[Any]:
+    """Find a score in the cache, then in the persistent store."""
+    tag = _METRIC_TAGS[metric]
+    try:
+        cached_result = await get_cache().aget(metric, content_hash, 0)
+        if cached_result is not None:
+            logger.debug(f"{tag} Cache hit for {metric}: {content_hash[:16]}...")
+            return cached_result
+        logger.debug(f"{tag} Cache miss for {metric}: {content_hash[:16]}...")
+    except Exception as e:
+        logger.warning(f"{tag} Cache lookup failed: {e}")
+
+    stored = await _load_stored_score(metric, content_hash)
+    if stored is not None:
+        logger.debug(f"{tag} Score store hit for {metric}: {content_hash[:16]}...")
+        try:
+            await get_cache().aset(metric, content_hash, 0, stored, 3600)
+        except Exception as e:
+            logger.warning(f"{tag} Cache store failed: {e}")
+        return stored
+    return None
+
+
+async def _lookup_score(metric: str, content_hash: str) -> Optional[float]:
+    """Find a density score in the cache, then in the persistent store."""
+    value = await _lookup_value(metric, content_hash)
+    return float(value) if value is not None else None
+
+
+async def _remember_score(metric: str, content_hash: str, value: Any) -> None:
+    """Save a density score to the persistent store and the cache (1 hour TTL)."""
+    tag = _METRIC_TAGS[metric]
+    await _save_stored_score(metric, content_hash, value)
+    try:
+        await get_cache().aset(metric, content_hash, 0, value, 3600)
+        logger.debug(f"{tag} Cached {metric} result: {content_hash[:16]}... = {value}")
+    except Exception as e:
+        logger.warning(f"{tag} Cache store failed: {e}")
+
+
+def _parse_counts(nlp: Any, text: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Run the spaCy pipeline once and count CPIDR and DEPID-R propositions.
+
+    CPIDR reads part-of-speech tags as they are right after the tagger
+    (ideadensity tags with the later components disabled); DEPID-R uses
+    the finished parse with ideadensity's default filters.
+
+    Returns:
+        {"cpidr": (propositions, words), "depid": (propositions, words)}
+    """
+    doc = nlp.make_doc(text)
+    tagged = None
+    for name, component in nlp.pipeline:
+        doc = component(doc)
+        if name == "tagger":
+            tagged = [(token.text, token.tag_) for token in doc]
+    if tagged is None:
+        raise RuntimeError("spaCy pipeline has no tagger")
+
+    # DEPID-R: unique (token, dependency, head) propositions
+    depid_word_count = sum(1 for token in doc if not token.is_punct and not token.is_space)
+    dependencies = {
+        (token.text, token.dep_, token.head.text)
+        for token in doc
+        if token.dep_ in PROPOSITION_DEPENDENCIES
+        and filter_excluded_determiners(token)
+        and filter_excluded_nsubjs(token)
+    }
+
+    return {"cpidr": _cpidr_counts(tagged), "depid": (len(dependencies), depid_word_count)}
+
+
+def _density_metrics(text: str) -> Tuple[float, float]:
+    """
+    Raw CPIDR and DEPID-R from one spaCy parse.
+
+    Equivalent to _cpidr_density(text) and _depid_density(text), which
+    parse the text separately.
+    """
+    counts = _parse_counts(get_depid_nlp(), text)
+    cpidr_propositions, cpidr_words = counts["cpidr"]
+    depid_propositions, depid_words = counts["depid"]
+    return (
+        cpidr_propositions / cpidr_words if cpidr_words > 0 else 0.0,
+        depid_propositions / depid_words if depid_words > 0 else 0.0,
+    )
+
+
+def _sampled_density(text: str, max_error: float, max_words: int, seed: int) -> Dict[str, Any]:
+    """
+    Estimate raw CPIDR and DEPID-R from a stratified sample of paragraphs.
+
+    Each sampled paragraph is parsed on its own, so DEPID-R propositions
+    are deduplicated per paragraph rather than across the whole text.
+
+    Returns:
+        estimate_ratios() result for the "cpidr" and "depid" ratios
+    """
+    nlp = get_depid_nlp()
+
+    def score_units(units: List[str]) -> List[Dict[str, Tuple[int, int]]]:
+        return [_parse_counts(nlp, unit) for unit in units]
+
+    return estimate_ratios(split_units(text), score_units, max_error, max_words, seed)
+
+
+def _should_sample(text: str) -> bool:
+    """Whether a text is long enough to score from a sample (DENSITY_MODE=sampled)."""
+    if config.DENSITY_MODE != "sampled" or not SHARED_PARSE_AVAILABLE:
+        return False
+    return len(text.split()) >= max(config.DENSITY_SAMPLE_MIN_WORDS, 1)
+
+
+async def _sampled_scores(text: str, content_hash: str) -> Optional[Dict[str, Any]]:
+    """
+    Sampled CPIDR and DEPID estimates of a long text, with 95% error bars.
+
+    Estimates are cached and stored per text and sampling settings.
+
+    Returns:
+        Dict with "cpidr", "cpidr_error", "depid", "depid_error",
+        "sampled_words" and "total_words", or None if sampling failed
+    """
+    max_error = config.DENSITY_SAMPLE_MAX_ERROR
+    max_words = config.DENSITY_SAMPLE_MAX_WORDS
+    # The cache is not versioned like the store, so the sampler version is part of the key
+    sample_key = f"{content_hash}/{max_error}/{max_words}/{SAMPLER_VERSION}"
+    sample_hash = hashlib.sha256(sample_key.encode('utf-8')).hexdigest()
+
+    cached = await _lookup_value("density-sample", sample_hash)
+    if cached is not None:
+        return cached
+
+    try:
+        sample = await run_cpu_bound(_sampled_density, text, max_error, max_words, int(content_hash[:16], 16))
+    except Exception as e:
+        logger.warning(f"[DENSITY] Sampled scoring failed: {e}, scoring the full text")
+        return None
+
+    scores = {"sampled_words": sample["sampled_words"], "total_words": sample["total_words"]}
+    for metric in ("cpidr", "depid"):
+        ratio, half_width = sample["ratios"].get(metric, (0.0, 1.0))
+        scores[metric] = max(0.0, min(1.0, float(ratio)))
+        scores[f"{metric}_error"] = min(1.0, float(half_width))
+    await _remember_score("density-sample", sample_hash, scores)
+
+    logger.info(
+        f"[DENSITY] Sampled {scores['sampled_words']}/{scores['total_words']} words: "
+        f"CPIDR={scores['cpidr']:.3f}±{scores['cpidr_error']:.3f}, "
+        f"DEPID={scores['depid']:.3f}±{scores['depid_error']:.3f}"
+    )
+    return scores
+
+
+async def estimate_density_metrics(text: str) -> Dict[str, Any]:
+    """
+    Calculate CPIDR and DEPID with 95% error bars.
+
+    Texts of at least DENSITY_SAMPLE_MIN_WORDS words are estimated from a
+    sample of their paragraphs when DENSITY_MODE is "sampled", which
+    bounds the parsing work per document; all other texts are scored
+    exactly (error 0.0).
+
+    Args:
+        text: The text content to analyze
+
+    Returns:
+        Dict with "cpidr", "cpidr_error", "depid" and "depid_error"
+        (DEPID values None if unavailable)
+    """
+    if text and _should_sample(text):
+        content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        # Exact scores computed earlier are better than an estimate
+        cpidr_score = await _lookup_score("cpidr", content_hash)
+        depid_score = await _lookup_score("depid", content_hash)
+        if cpidr_score is not None and depid_score is not None:
+            return {"cpidr": cpidr_score, "cpidr_error": 0.0, "depid": depid_score, "depid_error": 0.0}
+
+        sample = await _sampled_scores(text, content_hash)
+        if sample is not None:
+            return {key: sample[key] for key in ("cpidr", "cpidr_error", "depid", "depid_error")}
+
+    cpidr_score, depid_score = await _exact_density_metrics(text)
+    return {
+        "cpidr": cpidr_score,
+        "cpidr_error": 0.0,
+        "depid": depid_score,
+        "depid_error": 0.0 if depid_score is not None else None,
+    }
+
+
+async def calculate_density_metrics(text: str) -> Tuple[float, Optional[float]]:
+    """
+    Calculate CPIDR and DEPID together (see estimate_density_metrics).
+
+    Args:
+        text: The text content to analyze
+
+    Returns:
+        Tuple of (CPIDR density, DEPID density or None)
+    """
+    metrics = await estimate_density_metrics(text)
+    return metrics["cpidr"], metrics["depid"]
+
+
+async def _exact_density_metrics(text: str) -> Tuple[float, Optional[float]]:
+    """
+    Calculate CPIDR and DEPID exactly, parsing the text only once.
+
+    Scores already cached or stored are reused; when both are missing a
+    single spaCy parse produces both. Falls back to calculate_density and
+    calculate_depid_density when the shared path is unavailable.
+
+    Args:
+        text: The text content to analyze
+
+    Returns:
+        Tuple of (CPIDR density, DEPID density or None), with the same
+        ranges and defaults as calculate_density / calculate_depid_density
+    """
+    if not text or len(text.strip()) < 50:
+        return 0.0, None
+
+    if not SHARED_PARSE_AVAILABLE:
+        return await calculate_density(text), await calculate_depid_density(text)
+
+    content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    cpidr_score = await _lookup_score("cpidr", content_hash)
+    depid_score = await _lookup_score("depid", content_hash)
+    if cpidr_score is not None and depid_score is not None:
+        return cpidr_score, depid_score
+    if cpidr_score is not None:
+        return cpidr_score, await calculate_depid_density(text)
+    if depid_score is not None:
+        return await calculate_density(text), depid_score
+
+    try:
+        # One parse in the CPU pool instead of two
+        cpidr_raw, depid_raw = await run_cpu_bound(_density_metrics, text)
+    except Exception as e:
+        logger.warning(f"[DENSITY] Shared parse failed: {e}, scoring separately")
+        return await calculate_density(text), await calculate_depid_density(text)
+
+    cpidr_score = max(0.0, min(1.0, float(cpidr_raw)))
+    depid_score = max(0.0, min(1.0, float(depid_raw)))
+    await _remember_score("cpidr", content_hash, cpidr_score)
+    await _remember_score("depid", content_hash, depid_score)
+    logger.debug(f"[DENSITY] Shared parse: CPIDR={cpidr_score}, DEPID={depid_score}")
+    return cpidr_score, depid_score
+
+
+# Documents per spaCy nlp.pipe batch in batch scoring
+NLP_BATCH_SIZE = 16
+
+
+def _cpidr_counts(tagged: List[Tuple[str, str]]) -> Tuple[int, int]:
+    """CPIDR (propositions, words) from (token, tag) pairs, as ideadensity.cpidr counts them."""
+    word_list = WordList(tagged)
+    apply_idea_counting_rules(word_list.items, False)
+    word_count, proposition_count = count_words_and_propositions(word_list)
+    return proposition_count, word_count
+
+
+def _cpidr_from_tags(tagged: List[Tuple[str, str]]) -> float:
+    """Raw CPIDR from (token, tag) pairs, as ideadensity.cpidr computes it."""
+    proposition_count, word_count = _cpidr_counts(tagged)
+    return proposition_count / word_count if word_count > 0 else 0.0
+
+
+def _cpidr_density_batch(texts: List[str]) -> List[float]:
+    """Raw CPIDR for several texts, tagged in one nlp.pipe stream."""
+    nlp = get_tagger_nlp()
+    densities = []
+    for doc in nlp.pipe(texts, batch_size=NLP_BATCH_SIZE):
+        try:
+            densities.append(_cpidr_from_tags([(token.text, token.tag_) for token in doc]))
+        except Exception as e:
+            # ideadensity.cpidr also reports 0.0 for texts its rules fail on
+            logger.warning(f"[DENSITY] CPIDR rules failed in batch: {e}")
+            densities.append(0.0)
+    return densities
+
+
+async def _compute_cpidr_batch(texts: List[str]) -> List[float]:
+    """Score texts with batched tagging, one chunk per CPU pool worker."""
+    chunk_size = math.ceil(len(texts) / max(1, config.CPU_POOL_WORKERS))
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    parts = await asyncio.gather(*(
+        run_cpu_bound(_cpidr_density_batch, chunk, timeout=config.CPU_TASK_TIMEOUT_SECONDS * len(chunk))
+        for chunk in chunks
+    ))
+    return [density for part in parts for density in part]
+
+
+async def calculate_density_batch(texts: List[str]) -> List[float]:
+    """
+    Calculate CPIDR density for many texts at once.
+
+    Identical texts are scored once. Cached scores are fetched in one
+    bulk cache read and one score store query, and only the remaining
+    texts are tagged, streamed through spaCy's nlp.pipe in one chunk per
+    CPU pool worker.
+
+    Args:
+        texts: Text contents to analyze
+
+    Returns:
+        Density scores in input order, with the same values and defaults
+        as calculate_density
+    """
+    results: List[Optional[float]] = [None] * len(texts)
+    positions: Dict[str, List[int]] = {}
+    long_texts: List[int] = []
+    for i, text in enumerate(texts):
+        if not text or len(text.strip()) < 50:
+            results[i] = 0.0
+        elif not IDEADENSITY_AVAILABLE:
+            results[i] = 0.5
+        elif _should_sample(text):
+            long_texts.append(i)
+        else:
+            content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+            positions.setdefault(content_hash, []).append(i)
+
+    if long_texts:
+        # Sampled one by one; each is bounded by the sampling word budget
+        sampled = await asyncio.gather(*(calculate_density(texts[i]) for i in long_texts))
+        for i, density in zip(long_texts, sampled):
+            results[i] = density
+
+    if not positions:
+        if not IDEADENSITY_AVAILABLE and texts:
+            logger.warning("[DENSITY] ideadensity library not available, returning default 0.5")
+        return results
+
+    hashes = list(positions)
+    scores: Dict[str, float] = {}
+    try:
+        cached = await get_cache().aget_many("cpidr", hashes, 0)
+        scores.update((h, float(v)) for h, v in cached.items())
+    except Exception as e:
+        logger.warning(f"[DENSITY] Bulk cache lookup failed: {e}")
+
+    missing = [h for h in hashes if h not in scores]
+    store = get_score_store()
+    if missing and store is not None:
+        try:
+            stored = await asyncio.to_thread(store.get_many, "cpidr", SCORER_VERSIONS["cpidr"], missing)
+            scores.update((h, float(v)) for h, v in stored.items())
+            if stored:
+                await get_cache().aset_many("cpidr", stored, 0, 3600)
+        except Exception as e:
+            logger.warning(f"[DENSITY] Bulk score store lookup failed: {e}")
+
+    missing = [h for h in hashes if h not in scores]
+    logger.debug(f"[DENSITY] Batch: {len(texts)} texts, {len(hashes)} unique, {len(missing)} to score")
+    if missing:
+        missing_texts = [texts[positions[h][0]] for h in missing]
+        if SHARED_PARSE_AVAILABLE:
+            try:
+                raw = await _compute_cpidr_batch(missing_texts)
+                computed = {h: max(0.0, min(1.0, float(d))) for h, d in zip(missing, raw)}
+                if store is not None:
+                    await asyncio.to_thread(store.put_many, "cpidr", SCORER_VERSIONS["cpidr"], computed)
+                await get_cache().aset_many("cpidr", computed, 0, 3600)
+                scores.update(computed)
+            except Exception as e:
+                logger.warning(f"[DENSITY] Batch scoring failed: {e}, scoring items separately")
+        if any(h not in scores for h in missing):
+            fallback = await asyncio.gather(*(calculate_density(text) for text in missing_texts))
+            scores.update(zip(missing, fallback))
+
+    for content_hash, indexes in positions.items():
+        for i in indexes:
+            results[i] = scores[content_hash]
+    return results
+
+
 async def calculate_density(text: str) -> float:
     """
     Calculate content density using CPIDR (Content Propositional Idea Density Ratio).
     Results are cached by content hash to avoid redundant calculations.
+    Long texts are estimated from a sample (see estimate_density_metrics).
 
     Args:
         text: The text content to analyze
@@ -104,39 +797,23 @@ async def calculate_density(text: str) -> float:
 
     # Generate SHA-256 hash of content for cache key
     content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
-    cache_key_prefix = "cpidr"
 
-    # Check cache first
-    try:
-        cache = get_cache()
-        cached_result = cache.get(cache_key_prefix, content_hash, 0)
-        if cached_result is not None:
-            logger.debug(f"[DENSITY] Cache hit for CPIDR: {content_hash[:16]}...")
-            return float(cached_result)
-        logger.debug(f"[DENSITY] Cache miss for CPIDR: {content_hash[:16]}...")
-    except Exception as e:
-        logger.warning(f"[DENSITY] Cache lookup failed: {e}")
+    # Check cache and score store first
+    cached = await _lookup_score("cpidr", content_hash)
+    if cached is not None:
+        return cached
+
+    if _should_sample(text):
+        sample = await _sampled_scores(text, content_hash)
+        if sample is not None:
+            return sample["cpidr"]
 
     try:
-        # CPIDR returns either a float (density) or a tuple
-        # (proposition_count, word_count, density, error)
-        # Offload to thread pool to avoid blocking event loop
-        density_result = await asyncio.to_thread(cpidr, text)
-        # Extract density float from result (handle both tuple and float returns)
-        if isinstance(density_result, (tuple, list)):
-            density = density_result[2]
-        else:
-            density = density_result
+        # Offload to the CPU pool to avoid blocking the event loop
+        density = await run_cpu_bound(_cpidr_density, text)
         # Normalize to 0.0-1.0 range (CPIDR typically ranges 0-1 but can vary)
         normalized = max(0.0, min(1.0, float(density)))
-
-        # Cache the result with 1 hour TTL
-        try:
-            cache = get_cache()
-            cache.set(cache_key_prefix, content_hash, 0, normalized, 3600)
-            logger.debug(f"[DENSITY] Cached CPIDR result: {content_hash[:16]}... = {normalized}")
-        except Exception as e:
-            logger.warning(f"[DENSITY] Cache store failed: {e}")
+        await _remember_score("cpidr", content_hash, normalized)
 
         logger.debug(f"[DENSITY] Raw={density}, Normalized={normalized}")
         return normalized
@@ -165,33 +842,17 @@ async def calculate_depid_density(text: str) -> Optional[float]:
 
     # Generate SHA-256 hash of content for cache key
     content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
-    cache_key_prefix = "depid"
 
-    # Check cache first
-    try:
-        cache = get_cache()
-        cached_result = cache.get(cache_key_prefix, content_hash, 0)
-        if cached_result is not None:
-            logger.debug(f"[DEPID] Cache hit: {content_hash[:16]}...")
-            return float(cached_result)
-        logger.debug(f"[DEPID] Cache miss: {content_hash[:16]}...")
-    except Exception as e:
-        logger.warning(f"[DEPID] Cache lookup failed: {e}")
+    # Check cache and score store first
+    cached = await _lookup_score("depid", content_hash)
+    if cached is not None:
+        return cached
 
     try:
-        # DEPID returns: (density, word_count, dependencies)
-        # Offload to thread pool to avoid blocking event loop
-        result = await asyncio.to_thread(depid, text, is_depid_r=True)
-        density, word_count, dependencies = result
+        # Offload to the CPU pool to avoid blocking the event loop
+        density = await run_cpu_bound(_depid_density, text)
         normalized = max(0.0, min(1.0, float(density)))
-
-        # Cache the result with 1 hour TTL
-        try:
-            cache = get_cache()
-            cache.set(cache_key_prefix, content_hash, 0, normalized, 3600)
-            logger.debug(f"[DEPID] Cached result: {content_hash[:16]}... = {normalized}")
-        except Exception as e:
-            logger.warning(f"[DEPID] Cache store failed: {e}")
+        await _remember_score("depid", content_hash, normalized)
 
         logger.debug(f"[DEPID] Raw={density}, Normalized={normalized}")
         return normalized
@@ -202,30 +863,19 @@ async def calculate_depid_density(text: str) -> Optional[float]:
 
 def calculate_readability_scores(text: str) -> Dict[str, float]:
     """
-    Calculate readability metrics using textstat.
+    Calculate readability metrics from one tokenization of the text.
 
     Args:
         text: The text content to analyze
 
     Returns:
-        Dict with readability scores (defaults to None if unavailable)
+        Dict with readability scores (empty for short text or on failure)
     """
     if not text or len(text.strip()) < 50:
         return {}
 
-    if not TEXTSTAT_AVAILABLE or textstat is None:
-        logger.debug("[READABILITY] textstat library not available")
-        return {}
-
     try:
-        textstat.set_lang("en")
-        scores = {
-            "flesch_reading_ease": textstat.flesch_reading_ease(text),
-            "flesch_kincaid_grade": textstat.flesch_kincaid_grade(text),
-            "gunning_fog": textstat.gunning_fog(text),
-            "automated_readability_index": textstat.automated_readability_index(text),
-            "coleman_liau_index": textstat.coleman_liau_index(text),
-        }
+        scores = readability_scores(text)
         logger.debug(f"[READABILITY] Scores: {scores}")
         return scores
     except Exception as e:
@@ -233,6 +883,34 @@ def calculate_readability_scores(text: str) -> Dict[str, float]:
         return {}
 
 
+async def get_readability_scores(text: str) -> Dict[str, float]:
+    """
+    Readability scores for text, read from the persistent score store when
+    this text was scored before.
+
+    Args:
+        text: The text content to analyze
+
+    Returns:
+        Dict with readability scores (see calculate_readability_scores)
+    """
+    if not text or len(text.strip()) < 50:
+        # Too short to score; not worth a store lookup
+        return calculate_readability_scores(text)
+
+    content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    stored = await _load_stored_score("readability", content_hash)
+    if stored is not None:
+        logger.debug(f"[READABILITY] Score store hit: {content_hash[:16]}...")
+        return stored
+
+    # Scoring holds the GIL; run it off the event loop (in parallel with parsing)
+    scores = await run_cpu_bound(calculate_readability_scores, text)
+    if scores:
+        await _save_stored_score("readability", content_hash, scores)
+    return scores
+
+
 def calculate_combined_density(
     cpidr_density: float,
     depid_density: Optional[float],
@@ -338,23 +1016,29 @@ class ContentExtractor:
 
         try:
             fetch_start = time.time()
-            html = await self._fetch_page(url)
+            page = await self._fetch_page(url)
             fetch_duration = time.time() - fetch_start
             
-            if not html:
+            if not page:
                 total_duration = time.time() - extract_start
                 logger.error(f"[EXTRACTOR] Failed to fetch page | Fetch: {fetch_duration:.3f}s | Total: {total_duration:.3f}s")
                 return self._error_response(url, "Failed to fetch page")
 
+            if not isinstance(page, FetchedPage):
+                page = FetchedPage(url, page)
+
+            # Unchanged page: reuse the result computed last time
+            page_cache = get_page_cache()
+            if page.not_modified and page_cache:
+                cached_result = await asyncio.to_thread(page_cache.get_scores, url, "extract")
+                if cached_result is not None:
+                    total_duration = time.time() - extract_start
+                    logger.info(f"[EXTRACTOR] Page unchanged, reusing scores | Fetch: {fetch_duration:.3f}s | Total: {total_duration:.3f}s")
+                    return {**cached_result, "raw_html": page.body}
+
             trafilatura_start = time.time()
-            extracted = trafilatura.extract(
-                html,
-                include_comments=False,
-                include_tables=True,
-                include_links=False,
-                output_format="txt",
-                config=TRAFILATURA_CONFIG,
-            )
+            html = page.body
+            extracted, title = await run_cpu_bound(_extract_document, html, page.encoding)
             trafilatura_duration = time.time() - trafilatura_start
 
             if not extracted:
@@ -362,11 +1046,6 @@ class ContentExtractor:
                 logger.error(f"[EXTRACTOR] No content extracted | Fetch: {fetch_duration:.3f}s | Trafilatura: {trafilatura_duration:.3f}s | Total: {total_duration:.3f}s")
                 return self._error_response(url, "No content extracted")
 
-            metadata_start = time.time()
-            metadata = trafilatura.extract_metadata(html)
-            title = metadata.title if metadata else self._extract_title_fallback(html)
-            metadata_duration = time.time() - metadata_start
-
             signal_start = time.time()
             signal_score = self._calculate_signal_score(
                 content=extracted,
@@ -375,26 +1054,39 @@ class ContentExtractor:
             )
             signal_duration = time.time() - signal_start
 
+            # Scoring cascade: a decisive signal score makes CPIDR/DEPID unnecessary
+            verdict = cascade_verdict(signal_score, config.CASCADE_SIGNAL_LOW, config.CASCADE_SIGNAL_HIGH)
+            skipped_stages = [STAGE_CPIDR, STAGE_DEPID] if verdict else []
+
             density_start = time.time()
-            cpidr_score = await calculate_density(extracted)
-            depid_score = await calculate_depid_density(extracted)
-            readability_scores = calculate_readability_scores(extracted)
+            if verdict:
+                logger.debug(f"[EXTRACTOR] Cascade: signal {signal_score:.2f} is decisive ({verdict}), skipping density")
+                density_metrics = {"cpidr": None, "cpidr_error": None, "depid": None, "depid_error": None}
+                readability_scores = await get_readability_scores(extracted)
+            else:
+                density_metrics, readability_scores = await asyncio.gather(
+                    estimate_density_metrics(extracted),
+                    get_readability_scores(extracted),
+                )
+            cpidr_score, depid_score = density_metrics["cpidr"], density_metrics["depid"]
             density_duration = time.time() - density_start
 
             density_threshold = config.DENSITY_THRESHOLD
 
             combined_start = time.time()
-            combined_density = calculate_combined_density(
-                cpidr_density=cpidr_score,
-                depid_density=depid_score,
-                readability=readability_scores
-            )
+            if cpidr_score is not None:
+                combined_density = calculate_combined_density(
+                    cpidr_density=cpidr_score,
+                    depid_density=depid_score,
+                    readability=readability_scores
+                )
             combined_duration = time.time() - combined_start
 
+            density_log = f"{cpidr_score:.3f}" if cpidr_score is not None else "skipped"
             total_duration = time.time() - extract_start
-            logger.info(f"[EXTRACTOR] Success: {len(extracted)} chars, signal={signal_score:.2f}, density={cpidr_score:.3f} | "
+            logger.info(f"[EXTRACTOR] Success: {len(extracted)} chars, signal={signal_score:.2f}, density={density_log} | "
                        f"Fetch: {fetch_duration:.3f}s | Trafilatura: {trafilatura_duration:.3f}s | "
-                       f"Metadata: {metadata_duration:.3f}s | Signal: {signal_duration:.3f}s | "
+                       f"Signal: {signal_duration:.3f}s | "
                        f"Density: {density_duration:.3f}s | Combined: {combined_duration:.3f}s | Total: {total_duration:.3f}s")
 
             result = {
@@ -405,11 +1097,18 @@ class ContentExtractor:
                 "source": self._extract_domain(url),
                 "length": len(extracted),
                 "signal_score": round(signal_score, 2),
-                "density_score": round(cpidr_score, 3),
+                "density_score": round(cpidr_score, 3) if cpidr_score is not None else None,
                 "depid_density": round(depid_score, 3) if depid_score is not None else None,
+                "density_error": round(density_metrics["cpidr_error"], 3) if cpidr_score is not None else None,
+                "depid_error": round(density_metrics["depid_error"], 3) if depid_score is not None else None,
+                "skipped_stages": skipped_stages,
                 "readability_score": readability_scores,
             }
 
+            if page_cache:
+                scores = {k: v for k, v in result.items() if k != "raw_html"}
+                await asyncio.to_thread(page_cache.set_scores, url, "extract", scores)
+
             return result
 
         except Exception as e:
@@ -417,19 +1116,21 @@ class ContentExtractor:
             logger.error(f"[EXTRACTOR] Error: {str(e)} | Total: {total_duration:.3f}s")
             return self._error_response(url, str(e))
 
-    async def _fetch_page(self, url: str) -> Optional[str]:
-        """Fetch HTML content from a URL using shared connection pool."""
+    async def _fetch_page(self, url: str) -> Optional[FetchedPage]:
+        """
+        Fetch HTML content from a URL using shared connection pool (streamed, size-capped, cached).
+
+        Returns:
+            FetchedPage with the raw HTML bytes, or None on failure
+        """
         try:
             # Validate URL for SSRF protection
-            is_valid, error_message = validate_url(url)
+            is_valid, error_message = await validate_url_async(url)
             if not is_valid:
                 logger.error(f"[FETCH] SSRF validation failed for {url}: {error_message}")
                 return None
             
-            client = get_http_client()
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.text
+            return await fetch_html(url)
         except Exception as e:
             logger.error(f"[FETCH] Failed to fetch {url}: {e}")
             return None
@@ -516,15 +1217,7 @@ class ContentExtractor:
 
     def _extract_title_fallback(self, html: str) -> Optional[str]:
         """Fallback title extraction from HTML."""
-        # First try to match a properly closed title tag
-        match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.I)
-        if match:
-            return match.group(1).strip()
-        # Fallback: match unclosed title tag (malformed HTML)
-        match = re.search(r'<title[^>]*>([^<]+)$', html, re.I)
-        if match:
-            return match.group(1).strip()
-        return None
+        return _title_from_tag(html)
 
     def _error_response(self, url: str, error: str) -> Dict[str, Any]:
         """Return an error response structure."""
@@ -8,12 +8,14 @@ from starlette.responses import FileResponse
 from starlette.staticfiles import StaticFiles as StarletteStaticFiles
 from starlette.types import ASGIApp, Receive, Scope, Send
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import httpx
+import asyncio
 import logging
 import os
 import json
 import time
+import hashlib
 import secrets
 import traceback
 import uuid
@@ -45,9 +47,12 @@ load_dotenv()
 
 from config import config
 from extractor import extractor
-from services.analyzer import heuristic_analyzer
+from services.analyzer import score_page
+from services.cascade import STAGE_CPIDR, STAGE_EXTRACTION, cascade_verdict
+from services.cpu_pool import get_cpu_pool, run_cpu_bound, shutdown_cpu_pool
+from services.url_canonical import canonicalize_url
 from security.api_key import require_api_key
-from security.url_validator import validate_url
+from security.url_validator import validate_url_async
 from models import (
     ScanTopicRequest,
     ExtractionRequest,
@@ -58,6 +63,9 @@ from analytics_middleware import AnalyticsMiddleware, init_db
 from analytics_routes import router as analytics_router
 from analytics_utils import create_visitor, cleanup_old_visitors
 from cache import get_cache
+from cache.page_cache import get_page_cache
+from cache.score_store import get_score_store
+from cache.single_flight import SingleFlight
 from rate_limiter_interface import InMemoryRateLimiter
 
 try:
@@ -388,10 +396,14 @@ async def sanitized_exception_handler(request: Request, exc: Exception):
 @asynccontextmanager
 async def lifespan(app_instance):
     """Manage application lifecycle."""
+    pool = get_cpu_pool()
+    if pool is not None:
+        await pool.start()
     yield
     # Cleanup on shutdown
     from extractor import close_http_client
     await close_http_client()
+    await shutdown_cpu_pool()
     logger.info("[SHUTDOWN] Resources cleaned up")
 
 app = FastAPI(title="SGNL Extraction Engine", version="2.0.0", lifespan=lifespan)
@@ -505,6 +517,9 @@ async def fast_search(req: ScanTopicRequest):
     """
     Fast search endpoint - returns raw Tavily results in <2 seconds.
     Does NOT include LLM analysis. Use /scan-topic for full analysis.
+
+    Cached results are served stale-while-revalidate: only one request per
+    topic calls n8n when the entry expires.
     """
     if not N8N_FAST_SEARCH_URL:
         raise HTTPException(
@@ -516,45 +531,13 @@ async def fast_search(req: ScanTopicRequest):
 
     cache = get_cache()
 
-    cached_result = cache.get("fast-search", req.topic, req.max_results)
-    if cached_result is not None:
-        logger.info(f"[FAST-SEARCH] Cache hit for topic: {req.topic}")
-        return cached_result
-
     try:
-        from extractor import get_http_client
-        client = get_http_client()
-        response = await client.post(
-            N8N_FAST_SEARCH_URL,
-            json={"topic": req.topic, "max_results": req.max_results},
-            headers={"Content-Type": "application/json"},
-            timeout=get_env('FAST_SEARCH_TIMEOUT_SECONDS', 30.0)
+        return await cache.aget_or_refresh(
+            "fast-search", req.topic, req.max_results,
+            lambda: _fetch_fast_search(req),
+            ttl_seconds=config.CACHE_TTL_FAST_SEARCH,
+            slice_results=_slice_search_results,
         )
-        response.raise_for_status()
-
-        try:
-            result = response.json()
-        except Exception:
-            import json
-            result = json.loads(response.content.decode("utf-8", errors="replace"))
-        logger.info(f"[FAST-SEARCH] Raw response: {type(result)}")
-
-        if isinstance(result, dict) and "results" in result:
-            results_array = result["results"]
-        elif isinstance(result, list):
-            results_array = result
-        else:
-            results_array = [result]
-
-        logger.info(f"[FAST-SEARCH] Got {len(results_array)} results")
-
-        response_data = {"results": results_array}
-
-        cache_ttl = config.CACHE_TTL_FAST_SEARCH
-        cache.set("fast-search", req.topic, req.max_results, response_data, ttl_seconds=cache_ttl)
-        logger.info(f"[FAST-SEARCH] Cached result for {cache_ttl}s")
-
-        return response_data
 
     except httpx.TimeoutException:
         logger.error("[FAST-SEARCH] Request timed out after 15 seconds")
@@ -567,58 +550,71 @@ async def fast_search(req: ScanTopicRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _slice_search_results(response_data: dict, max_results: int) -> dict:
+    """Answer a request for fewer results from a cached larger result set."""
+    return {**response_data, "results": response_data["results"][:max_results]}
+
+
+async def _fetch_fast_search(req: ScanTopicRequest) -> dict:
+    """Call the n8n fast-search workflow (cache loader for /fast-search)."""
+    from extractor import get_http_client
+    client = get_http_client()
+    response = await client.post(
+        N8N_FAST_SEARCH_URL,
+        json={"topic": req.topic, "max_results": req.max_results},
+        headers={"Content-Type": "application/json"},
+        timeout=get_env('FAST_SEARCH_TIMEOUT_SECONDS', 30.0)
+    )
+    response.raise_for_status()
+
+    try:
+        result = response.json()
+    except Exception:
+        import json
+        result = json.loads(response.content.decode("utf-8", errors="replace"))
+    logger.info(f"[FAST-SEARCH] Raw response: {type(result)}")
+
+    if isinstance(result, dict) and "results" in result:
+        results_array = result["results"]
+    elif isinstance(result, list):
+        results_array = result
+    else:
+        results_array = [result]
+
+    logger.info(f"[FAST-SEARCH] Got {len(results_array)} results, caching for {config.CACHE_TTL_FAST_SEARCH}s")
+
+    return {"results": results_array}
+
+
+# Extra lease time beyond the n8n timeout, covering parsing and the cache write
+SCAN_TOPIC_LEASE_MARGIN_SECONDS = 30
+
+
 @app.post("/scan-topic")
 async def scan_topic(req: ScanTopicRequest):
     """
     Scan a topic by forwarding request to n8n workflow.
     Returns the JSON response from n8n (includes LLM analysis).
+
+    Cached results are served stale-while-revalidate: only one request per
+    topic calls n8n when the entry expires, across all workers when Redis
+    is available.
     """
     request_start = time.time()
     logger.info(f"[SCAN-TOPIC] Topic: {req.topic}, Max Results: {req.max_results}")
 
     cache = get_cache()
 
-    cache_check_start = time.time()
-    cached_result = cache.get("scan-topic", req.topic, req.max_results)
-    cache_check_duration = time.time() - cache_check_start
-
-    if cached_result is not None:
-        total_duration = time.time() - request_start
-        logger.info(f"[SCAN-TOPIC] Cache hit for topic: {req.topic} | Cache check: {cache_check_duration:.3f}s | Total: {total_duration:.3f}s")
-        return cached_result
-
     try:
-        http_start = time.time()
-        from extractor import get_http_client
-        client = get_http_client()
-        response = await client.post(
-            N8N_WEBHOOK_URL,
-            json={"topic": req.topic, "max_results": req.max_results},
-            headers={"Content-Type": "application/json"},
-            timeout=get_env('SCAN_TOPIC_TIMEOUT_SECONDS', 180.0)
+        result = await cache.aget_or_refresh(
+            "scan-topic", req.topic, req.max_results,
+            lambda: _fetch_scan_topic(req),
+            ttl_seconds=config.CACHE_TTL_SCAN_TOPIC,
+            # One n8n run per topic across all workers; outlives the upstream timeout
+            lease_seconds=int(get_env('SCAN_TOPIC_TIMEOUT_SECONDS', 180.0)) + SCAN_TOPIC_LEASE_MARGIN_SECONDS,
         )
-        response.raise_for_status()
-        http_duration = time.time() - http_start
-
-        parse_start = time.time()
-        try:
-            result = response.json()
-        except Exception:
-            import json
-            result = json.loads(response.content.decode("utf-8", errors="replace"))
-        parse_duration = time.time() - parse_start
-
-        cache_set_start = time.time()
-        cache_ttl = config.CACHE_TTL_SCAN_TOPIC
-        cache.set("scan-topic", req.topic, req.max_results, result, ttl_seconds=cache_ttl)
-        cache_set_duration = time.time() - cache_set_start
-
         total_duration = time.time() - request_start
-        logger.info(f"[SCAN-TOPIC] Got {len(result) if isinstance(result, list) else 1} results | "
-                   f"Cache check: {cache_check_duration:.3f}s | HTTP: {http_duration:.3f}s | "
-                   f"Parse: {parse_duration:.3f}s | Cache set: {cache_set_duration:.3f}s | "
-                   f"Total: {total_duration:.3f}s")
-
+        logger.info(f"[SCAN-TOPIC] Done for topic: {req.topic} | Total: {total_duration:.3f}s")
         return result
 
     except httpx.TimeoutException:
@@ -643,14 +639,69 @@ async def scan_topic(req: ScanTopicRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _fetch_scan_topic(req: ScanTopicRequest):
+    """Call the n8n scan-topic workflow (cache loader for /scan-topic)."""
+    http_start = time.time()
+    from extractor import get_http_client
+    client = get_http_client()
+    response = await client.post(
+        N8N_WEBHOOK_URL,
+        json={"topic": req.topic, "max_results": req.max_results},
+        headers={"Content-Type": "application/json"},
+        timeout=get_env('SCAN_TOPIC_TIMEOUT_SECONDS', 180.0)
+    )
+    response.raise_for_status()
+    http_duration = time.time() - http_start
+
+    parse_start = time.time()
+    try:
+        result = response.json()
+    except Exception:
+        import json
+        result = json.loads(response.content.decode("utf-8", errors="replace"))
+    parse_duration = time.time() - parse_start
+
+    logger.info(f"[SCAN-TOPIC] Got {len(result) if isinstance(result, list) else 1} results | "
+               f"HTTP: {http_duration:.3f}s | Parse: {parse_duration:.3f}s")
+
+    return result
+
+
+# Concurrent /extract calls for the same URL share one extraction
+_extract_flight = SingleFlight()
+
+
 @app.post("/extract", response_model=ExtractionResponse)
 async def extract_content(req: ExtractionRequest, x_api_key: Optional[str] = Header(None)):
     """
     Extract content from a URL using Trafilatura.
     Headers: x-api-key (optional for now)
+
+    Results are cached per URL, and concurrent requests for the same URL
+    share a single extraction.
     """
     logger.info(f"[EXTRACT] URL: {req.url}, Force Depth: {req.force_depth}")
 
+    cache = get_cache()
+    url_key = _extract_cache_key(req.url)
+    cached_result = await cache.aget("extract", url_key, int(req.force_depth))
+    if cached_result is not None:
+        logger.info(f"[EXTRACT] Cache hit: {req.url}")
+        return ExtractionResponse(**cached_result)
+
+    return await _extract_flight.do(
+        f"{url_key}:{int(req.force_depth)}",
+        lambda: _run_extraction(req, url_key),
+    )
+
+
+def _extract_cache_key(url: str) -> str:
+    """Case-preserving cache key for a URL (the cache lowercases its keys)."""
+    return hashlib.md5(canonicalize_url(url).encode()).hexdigest()
+
+
+async def _run_extraction(req: ExtractionRequest, url_key: str) -> ExtractionResponse:
+    """Extract a URL and cache the successful response."""
     try:
         result = await extractor.extract_from_url(req.url, req.force_depth)
         
@@ -658,7 +709,7 @@ async def extract_content(req: ExtractionRequest, x_api_key: Optional[str] = Hea
             logger.warning(f"[EXTRACT] Extraction failed: {result.get('error')}")
             raise HTTPException(status_code=422, detail=f"Extraction failed: {result.get('error')}")
 
-        return ExtractionResponse(
+        response = ExtractionResponse(
             url=result["url"],
             title=result["title"],
             content=result["content"],
@@ -668,10 +719,18 @@ async def extract_content(req: ExtractionRequest, x_api_key: Optional[str] = Hea
             extraction_method="trafilatura",
             density_score=result.get("density_score"),
             depid_density=result.get("depid_density"),
+            density_error=result.get("density_error"),
+            depid_error=result.get("depid_error"),
+            skipped_stages=result.get("skipped_stages", []),
             readability_score=result.get("readability_score"),
             signal_score=result.get("signal_score")
         )
 
+        cache = get_cache()
+        await cache.aset("extract", url_key, int(req.force_depth), response.model_dump(),
+                  ttl_seconds=config.CACHE_TTL_EXTRACT)
+        return response
+
     except HTTPException:
         raise
     except Exception as e:
@@ -683,7 +742,7 @@ async def extract_content(req: ExtractionRequest, x_api_key: Optional[str] = Hea
 async def health():
     """Health check endpoint."""
     cache = get_cache()
-    stats = cache.get_stats()
+    stats = await cache.aget_stats()
 
     # Get Redis-specific status
     redis_status = {
@@ -699,24 +758,39 @@ async def health():
         redis_display = redis_url.replace('redis://', '')
     redis_status["url"] = redis_display
 
+    pool = get_cpu_pool()
+    cpu_pool_stats = pool.get_stats() if pool is not None else {"workers": 0}
+
     return {
         "status": "ok",
         "version": "2.0.0",
         "cache": stats,
-        "redis": redis_status
+        "redis": redis_status,
+        "cpu_pool": cpu_pool_stats
     }
 
 
 @app.get("/cache/stats")
 async def cache_stats(api_key: str = Depends(require_api_key)):
     cache = get_cache()
-    return cache.get_stats()
+    stats = await cache.aget_stats()
+    page_cache = get_page_cache()
+    if page_cache:
+        stats["pages"] = await asyncio.to_thread(page_cache.get_stats)
+    score_store = get_score_store()
+    if score_store:
+        stats["scores"] = await asyncio.to_thread(score_store.get_stats)
+    stats["extract_coalescing"] = _extract_flight.get_stats()
+    return stats
 
 
 @app.post("/cache/clear")
 async def cache_clear(api_key: str = Depends(require_api_key)):
     cache = get_cache()
-    cache.clear()
+    await cache.aclear()
+    page_cache = get_page_cache()
+    if page_cache:
+        await asyncio.to_thread(page_cache.clear)
     return {"status": "ok", "message": "Cache cleared"}
 
 
@@ -743,18 +817,17 @@ async def check_density(req: CheckDensityRequest):
     - Method: POST
     - Body: {"results": {{$json.results}}, "threshold": 0.45}
     """
-    from extractor import calculate_density
+    from extractor import calculate_density_batch
     
     logger.info(f"[CHECK-DENSITY] Checking {len(req.results)} items, threshold={req.threshold}")
     
     enriched = []
     skipped_count = 0
     
-    for item in req.results:
-        content = item.get("content", "")
-        
-        # Calculate density
-        density_score = await calculate_density(content) if content else 0.0
+    # Score all items in one batch (deduplicated, cached, tagged together)
+    density_scores = await calculate_density_batch([item.get("content") or "" for item in req.results])
+    
+    for item, density_score in zip(req.results, density_scores):
         skipped_llm = density_score < req.threshold
         
         if skipped_llm:
@@ -796,6 +869,134 @@ class AnalyzedResult(BaseModel):
     final_score: float  # Combined score
 
 
+async def _score_fetched_result(url: str, content: str, query: str):
+    """Fetch a result page and score it with heuristics and density.
+
+    With SCORING_CASCADE_ENABLED, a decisive structure score skips text
+    extraction and density scoring (density_score is then None).
+
+    Returns:
+        Tuple of (heuristic_score, heuristic_reason, density_score, skipped_stages)
+    """
+    from extractor import calculate_density, fetch_html
+
+    # Validate URL for SSRF protection before fetching
+    is_valid, error_message = await validate_url_async(url)
+    if not is_valid:
+        logger.warning(f"[ANALYZE] URL validation failed for {url}: {error_message}")
+        raise Exception(f"URL validation failed: {error_message}")
+
+    # Scoring only needs the start of a long page
+    page = await fetch_html(url, stop_after_bytes=get_env('FETCH_SCORING_BYTES', 1_000_000))
+
+    # Unchanged page: reuse the scores computed for this query last time
+    page_cache = get_page_cache()
+    scores_key = "analyze:" + hashlib.md5(query.lower().strip().encode()).hexdigest()
+    if page.not_modified and page_cache:
+        cached_scores = await asyncio.to_thread(page_cache.get_scores, url, scores_key)
+        if cached_scores is not None:
+            logger.debug(f"[ANALYZE] Page unchanged, reusing scores for {url}")
+            # Entries stored before the cascade have no skipped stages
+            return (*cached_scores, [])[:4]
+
+    # Parse once for the heuristic score and the clean text
+    cascade_bounds = None
+    if config.SCORING_CASCADE_ENABLED:
+        cascade_bounds = (config.CASCADE_HEURISTIC_LOW, config.CASCADE_HEURISTIC_HIGH)
+    heuristic, extracted_text = await run_cpu_bound(score_page, page.body, query, page.encoding, cascade_bounds)
+
+    skipped_stages = []
+    if cascade_bounds and cascade_verdict(heuristic["score"], *cascade_bounds):
+        # Clearly good or clearly junk: no extraction or density needed
+        density_score = None
+        skipped_stages = [STAGE_EXTRACTION, STAGE_CPIDR]
+        logger.debug(f"[ANALYZE] Cascade decided on structure score {heuristic['score']} for {url}")
+    elif extracted_text:
+        density_score = await calculate_density(extracted_text)
+    else:
+        density_score = await calculate_density(content) if content else 0.0
+
+    if page_cache:
+        scores = [heuristic["score"], heuristic["reason"], density_score, skipped_stages]
+        await asyncio.to_thread(page_cache.set_scores, url, scores_key, scores)
+
+    return heuristic["score"], heuristic["reason"], density_score, skipped_stages
+
+
+def _dedupe_results(results: List[dict]) -> Tuple[List[dict], int]:
+    """Drop results that point at the same page, keeping the best-scored one.
+
+    Returns:
+        Tuple of (unique results in first-seen order, number dropped)
+    """
+    unique: dict = {}
+    for index, item in enumerate(results):
+        url = item.get("url", "")
+        key = canonicalize_url(url) if url else f"#{index}"
+        kept = unique.get(key)
+        if kept is None or item.get("score", 0) > kept.get("score", 0):
+            unique[key] = item
+    return list(unique.values()), len(results) - len(unique)
+
+
+async def _analyze_result_item(item: dict, query: str, density_threshold: float, timeout: float) -> dict:
+    """Analyze a single search result within its time budget.
+
+    Falls back to a neutral heuristic score and snippet-based density
+    when the page cannot be fetched or scored in time.
+    """
+    from extractor import calculate_density
+
+    url = item.get("url", "")
+    title = item.get("title", "Untitled")
+    content = item.get("content", "")
+    original_score = item.get("score", 0.5)
+
+    skipped_stages = []
+    try:
+        heuristic_score, heuristic_reason, density_score, skipped_stages = await asyncio.wait_for(
+            _score_fetched_result(url, content, query),
+            timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"[ANALYZE] Timed out after {timeout}s for {url}")
+        heuristic_score = 50  # Default
+        heuristic_reason = "Could not analyze (timed out)"
+        density_score = await calculate_density(content) if content else 0.5
+    except Exception as e:
+        logger.warning(f"[ANALYZE] Failed to fetch {url}: {e}")
+        heuristic_score = 50  # Default
+        heuristic_reason = "Could not analyze (fetch failed)"
+        density_score = await calculate_density(content) if content else 0.5
+
+    # Determine if LLM should be skipped
+    if density_score is None:
+        # Decided by the structure score alone (scoring cascade)
+        skipped_llm = heuristic_score <= config.CASCADE_HEURISTIC_LOW
+        if skipped_llm:
+            logger.info(f"[ANALYZE] Low structure score for {url}: {heuristic_score}")
+    else:
+        skipped_llm = density_score < density_threshold
+        if skipped_llm:
+            logger.info(f"[ANALYZE] Low density for {url}: {density_score:.3f}")
+
+    # Combine scores: 60% heuristic, 40% original
+    final_score = (heuristic_score * 0.6 + original_score * 100 * 0.4) / 100
+
+    return {
+        "url": url,
+        "title": title,
+        "content": content,
+        "original_score": original_score,
+        "heuristic_score": heuristic_score,
+        "heuristic_reason": heuristic_reason,
+        "density_score": round(density_score, 3) if density_score is not None else None,
+        "skipped_llm": skipped_llm,
+        "skipped_stages": skipped_stages,
+        "final_score": round(final_score, 3)
+    }
+
+
 @app.post("/analyze-results")
 async def analyze_results(req: AnalyzeResultsRequest):
     """
@@ -804,76 +1005,28 @@ async def analyze_results(req: AnalyzeResultsRequest):
     
     Flow: n8n → Tavily Search → This Endpoint → n8n LLM Node
     
+    Results are fetched and scored concurrently, bounded by
+    ANALYZE_CONCURRENCY, and each one gets ANALYZE_ITEM_TIMEOUT_SECONDS
+    before it falls back to its search snippet.
+    
     Returns enriched results with heuristic and density scores.
     Low-density items are flagged for LLM skip.
     """
-    from extractor import calculate_density
-    import trafilatura
-    
     logger.info(f"[ANALYZE] Query: {req.query}, Results: {len(req.results)}")
 
     DENSITY_THRESHOLD = get_env('DENSITY_THRESHOLD', 0.45)
-    analyzed = []
-    
-    for item in req.results:
-        url = item.get("url", "")
-        title = item.get("title", "Untitled")
-        content = item.get("content", "")
-        original_score = item.get("score", 0.5)
-        
-        # Fetch raw HTML for heuristic analysis
-        try:
-            # Validate URL for SSRF protection before fetching
-            is_valid, error_message = validate_url(url)
-            if not is_valid:
-                logger.warning(f"[ANALYZE] URL validation failed for {url}: {error_message}")
-                raise Exception(f"URL validation failed: {error_message}")
-            
-            from extractor import get_http_client
-            client = get_http_client()
-            response = await client.get(url)
-            raw_html = response.text
-            
-            # Calculate heuristic score
-            heuristic = heuristic_analyzer.calculate_structure_score(
-                raw_html,
-                req.query
-            )
-            heuristic_score = heuristic["score"]
-            heuristic_reason = heuristic["reason"]
-            
-            # Extract clean text and calculate density
-            extracted_text = trafilatura.extract(raw_html, include_comments=False, include_tables=True)
-            if extracted_text:
-                density_score = await calculate_density(extracted_text)
-            else:
-                density_score = await calculate_density(content) if content else 0.0
-            
-        except Exception as e:
-            logger.warning(f"[ANALYZE] Failed to fetch {url}: {e}")
-            heuristic_score = 50  # Default
-            heuristic_reason = "Could not analyze (fetch failed)"
-            density_score = await calculate_density(content) if content else 0.5
-        
-        # Determine if LLM should be skipped
-        skipped_llm = density_score < DENSITY_THRESHOLD
-        if skipped_llm:
-            logger.info(f"[ANALYZE] Low density for {url}: {density_score:.3f}")
-        
-        # Combine scores: 60% heuristic, 40% original
-        final_score = (heuristic_score * 0.6 + original_score * 100 * 0.4) / 100
-        
-        analyzed.append({
-            "url": url,
-            "title": title,
-            "content": content,
-            "original_score": original_score,
-            "heuristic_score": heuristic_score,
-            "heuristic_reason": heuristic_reason,
-            "density_score": round(density_score, 3),
-            "skipped_llm": skipped_llm,
-            "final_score": round(final_score, 3)
-        })
+    item_timeout = get_env('ANALYZE_ITEM_TIMEOUT_SECONDS', 20.0)
+    semaphore = asyncio.Semaphore(get_env('ANALYZE_CONCURRENCY', 5))
+
+    async def _bounded(item: dict) -> dict:
+        async with semaphore:
+            return await _analyze_result_item(item, req.query, DENSITY_THRESHOLD, item_timeout)
+
+    results, duplicates = _dedupe_results(req.results)
+    if duplicates:
+        logger.info(f"[ANALYZE] Dropped {duplicates} duplicate results (same canonical URL)")
+
+    analyzed = list(await asyncio.gather(*(_bounded(item) for item in results)))
     
     # Sort by final_score descending
     analyzed.sort(key=lambda x: x["final_score"], reverse=True)
@@ -885,7 +1038,8 @@ async def analyze_results(req: AnalyzeResultsRequest):
         "query": req.query,
         "results": analyzed,
         "count": len(analyzed),
-        "skipped_llm_count": skipped_count
+        "skipped_llm_count": skipped_count,
+        "duplicates_removed": duplicates
     }
 
 
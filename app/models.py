@@ -20,5 +20,8 @@ class ExtractionResponse(BaseModel):
     extraction_method: str = "trafilatura"
     density_score: Optional[float] = None
     depid_density: Optional[float] = None
+    density_error: Optional[float] = None  # 95% error bar; 0.0 when scored exactly
+    depid_error: Optional[float] = None
+    skipped_stages: List[str] = []  # Stages skipped by the scoring cascade
     readability_score: Optional[Dict[str, float]] = None
     signal_score: Optional[float] = None
@@ -1,6 +1,7 @@
 """Security module for authentication, authorization, and SSRF protection."""
 
 from .api_key import require_api_key
-from .url_validator import validate_url, SSRFValidator
+from .url_validator import validate_url, validate_url_async, SSRFValidator
+from .pinned_transport import PinnedIPTransport
 
-__all__ = ["require_api_key", "validate_url", "SSRFValidator"]
+__all__ = ["require_api_key", "validate_url", "validate_url_async", "SSRFValidator", "PinnedIPTransport"]
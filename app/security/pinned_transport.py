@@ -0,0 +1,162 @@
+"""
+Pinned-IP HTTP Transport
+
+Makes outbound connections go to the exact address the SSRF validator
+approved. The hostname is resolved once (through the shared DNS cache)
+and the socket is opened to that IP, so there is no second lookup by the
+HTTP client and no window for DNS rebinding between validation and
+connection. TLS SNI, certificate checks, and the Host header still use
+the original hostname.
+"""
+
+import ipaddress
+import logging
+import typing
+from typing import Iterable, Optional, Set
+
+import httpcore
+import httpx
+
+from .url_validator import (
+    _is_private_ip,
+    _resolve_hostname_cached_async,
+    validate_redirect_url_async,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PinnedNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that swaps the hostname for its validated IP at connect time.
+
+    Hosts listed in trusted_hosts (our own upstreams, e.g. the n8n webhooks)
+    skip pinning and SSRF checks and are resolved normally.
+    """
+
+    def __init__(
+        self,
+        trusted_hosts: Optional[Iterable[str]] = None,
+        backend: Optional[httpcore.AsyncNetworkBackend] = None
+    ):
+        self.trusted_hosts: Set[str] = {host.lower() for host in trusted_hosts or ()}
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def resolve(self, host: str) -> str:
+        """
+        Return the address to connect to for a hostname.
+
+        Raises:
+            httpcore.ConnectError: If the host cannot be resolved or maps to a private IP
+        """
+        if host.lower() in self.trusted_hosts:
+            return host
+
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            pass
+        else:
+            if _is_private_ip(host):
+                logger.warning(f"[SECURITY] Blocked connection to private IP: {host}")
+                raise httpcore.ConnectError(f"Connection to private IP {host} is not allowed")
+            return host
+
+        ip, error = await _resolve_hostname_cached_async(host)
+        if error:
+            raise httpcore.ConnectError(f"Could not resolve hostname {host}: {error}")
+        if _is_private_ip(ip):
+            logger.warning(f"[SECURITY] Blocked connection: {host} resolved to private IP {ip}")
+            raise httpcore.ConnectError(f"Connection to private IP is not allowed (resolved from {host})")
+
+        logger.debug(f"[SECURITY] Pinned {host} -> {ip}")
+        return ip
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[typing.Iterable[httpcore.SOCKET_OPTION]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        address = await self.resolve(host)
+        return await self._backend.connect_tcp(
+            address,
+            port,
+            timeout=timeout,
+            local_address=local_address,
+            socket_options=socket_options,
+        )
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[typing.Iterable[httpcore.SOCKET_OPTION]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class PinnedIPTransport(httpx.AsyncHTTPTransport):
+    """
+    httpx transport whose connections are pinned to SSRF-validated addresses.
+
+    Use validate_redirect as a response event hook so every redirect hop
+    is checked with validate_redirect_url before httpx follows it.
+
+    Usage:
+        transport = PinnedIPTransport(limits=limits, trusted_hosts={"n8n.example.com"})
+        client = httpx.AsyncClient(
+            transport=transport,
+            follow_redirects=True,
+            event_hooks={"response": [transport.validate_redirect]},
+        )
+    """
+
+    def __init__(
+        self,
+        limits: httpx.Limits = httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        trusted_hosts: Optional[Iterable[str]] = None,
+        http2: bool = False
+    ):
+        super().__init__(limits=limits, http2=http2)
+        self.network_backend = PinnedNetworkBackend(trusted_hosts=trusted_hosts)
+        # Rebuild the pool with the pinning backend (httpx has no parameter for it)
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http2=http2,
+            network_backend=self.network_backend,
+        )
+
+    @property
+    def trusted_hosts(self) -> Set[str]:
+        return self.network_backend.trusted_hosts
+
+    async def validate_redirect(self, response: httpx.Response) -> None:
+        """
+        Response hook that rejects redirects to disallowed destinations.
+
+        Raises:
+            httpx.RequestError: If the Location target fails SSRF validation
+        """
+        if not response.is_redirect:
+            return
+
+        request = response.request
+        if request.url.host.lower() in self.trusted_hosts:
+            return
+
+        location = response.headers.get("location", "")
+        is_valid, error = await validate_redirect_url_async(str(request.url), location)
+        if not is_valid:
+            logger.warning(f"[SECURITY] Blocked redirect from {request.url} to {location}: {error}")
+            raise httpx.RequestError(f"Redirect blocked: {error}", request=request)
@@ -6,12 +6,16 @@ before they are fetched. Blocks private IP ranges, metadata endpoints,
 and validates DNS resolution to prevent DNS rebinding attacks.
 """
 
+import asyncio
 import ipaddress
 import logging
 import re
 import socket
+import threading
+import time
+from collections import OrderedDict
 from typing import Tuple, Optional, Set
-from urllib.parse import urlparse, urlsplit
+from urllib.parse import urljoin, urlparse, urlsplit
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +56,78 @@ BLOCKED_HOSTS: Set[str] = {
 # Additional sensitive ports to block
 BLOCKED_PORTS = {22, 23, 25, 53, 110, 143, 3389, 3306, 5432, 6379, 27017}
 
+# DNS cache settings (failures are cached for a shorter time than answers)
+DNS_CACHE_TTL_SECONDS = 300
+DNS_NEGATIVE_CACHE_TTL_SECONDS = 30
+DNS_CACHE_MAX_ENTRIES = 1024
+
+
+class DNSCache:
+    """
+    Thread-safe, TTL-bounded cache of hostname resolution results.
+
+    Successful lookups and failures (negative caching) are both stored,
+    with separate TTLs. Entries are evicted in LRU order once the cache
+    holds max_entries hosts. Shared by the sync and async validation paths.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DNS_CACHE_TTL_SECONDS,
+        negative_ttl_seconds: float = DNS_NEGATIVE_CACHE_TTL_SECONDS,
+        max_entries: int = DNS_CACHE_MAX_ENTRIES
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Optional[str], Optional[str], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, hostname: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """
+        Look up a cached resolution result.
+
+        Args:
+            hostname: The hostname that was resolved
+
+        Returns:
+            Tuple of (ip_address, error_message) or None on a cache miss
+        """
+        key = hostname.lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            ip, error, expiry = entry
+            if time.monotonic() > expiry:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return ip, error
+
+    def set(self, hostname: str, ip: Optional[str], error: Optional[str]) -> None:
+        """Store a resolution result (a failure when error is set)."""
+        ttl = self.negative_ttl_seconds if error else self.ttl_seconds
+        key = hostname.lower()
+        with self._lock:
+            self._entries[key] = (ip, error, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Shared resolver cache used by validate_url and SSRFValidator
+_dns_cache = DNSCache()
+
 
 def _is_private_ip(ip_str: str) -> bool:
     """
@@ -107,6 +183,49 @@ def _resolve_hostname(hostname: str) -> Tuple[Optional[str], Optional[str]]:
         return None, f"DNS resolution error: {str(e)}"
 
 
+async def _resolve_hostname_async(hostname: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Resolve a hostname without blocking the event loop.
+
+    Args:
+        hostname: The hostname to resolve
+
+    Returns:
+        Tuple of (ip_address, error_message). ip_address is None if resolution fails.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.getaddrinfo(hostname, None)
+        if result:
+            ip = result[0][4][0]
+            return ip, None
+        return None, "DNS resolution returned no results"
+    except socket.gaierror as e:
+        return None, f"DNS resolution failed: {str(e)}"
+    except Exception as e:
+        return None, f"DNS resolution error: {str(e)}"
+
+
+def _resolve_hostname_cached(hostname: str) -> Tuple[Optional[str], Optional[str]]:
+    """Resolve a hostname through the shared DNS cache (blocking on a miss)."""
+    cached = _dns_cache.get(hostname)
+    if cached is not None:
+        return cached
+    ip, error = _resolve_hostname(hostname)
+    _dns_cache.set(hostname, ip, error)
+    return ip, error
+
+
+async def _resolve_hostname_cached_async(hostname: str) -> Tuple[Optional[str], Optional[str]]:
+    """Resolve a hostname through the shared DNS cache without blocking."""
+    cached = _dns_cache.get(hostname)
+    if cached is not None:
+        return cached
+    ip, error = await _resolve_hostname_async(hostname)
+    _dns_cache.set(hostname, ip, error)
+    return ip, error
+
+
 def _is_blocked_host(hostname: str) -> bool:
     """
     Check if hostname is in the blocked hosts list.
@@ -126,56 +245,48 @@ def _is_blocked_host(hostname: str) -> bool:
     return False
 
 
-def validate_url(url: str) -> Tuple[bool, str]:
+def _check_url_static(url: str) -> Tuple[Optional[str], str]:
     """
-    Validate a URL for SSRF protection.
-
-    Performs comprehensive validation including:
-    - URL format and length validation
-    - Scheme validation (only http/https)
-    - IP address validation (blocks private ranges)
-    - DNS resolution and re-validation (prevents DNS rebinding)
-    - Blocked host validation (metadata endpoints)
-    - Port validation
+    Run every validation check that does not need DNS.
 
     Args:
         url: The URL to validate
 
     Returns:
-        Tuple of (is_valid, error_message). is_valid is True if URL is safe to fetch.
+        Tuple of (hostname, error_message). hostname is None if the URL is rejected.
     """
     # Check URL length
     if len(url) > MAX_URL_LENGTH:
         logger.warning(f"[SECURITY] URL exceeds maximum length: {len(url)} chars")
-        return False, f"URL exceeds maximum length of {MAX_URL_LENGTH} characters"
+        return None, f"URL exceeds maximum length of {MAX_URL_LENGTH} characters"
 
     # Parse URL
     try:
         parsed = urlparse(url)
     except Exception as e:
         logger.warning(f"[SECURITY] Failed to parse URL: {e}")
-        return False, f"Invalid URL format: {str(e)}"
+        return None, f"Invalid URL format: {str(e)}"
 
     # Validate scheme
     scheme = parsed.scheme.lower()
     if not scheme:
         logger.warning("[SECURITY] URL missing scheme")
-        return False, "URL must include a scheme (http:// or https://)"
+        return None, "URL must include a scheme (http:// or https://)"
 
     if scheme not in ALLOWED_SCHEMES:
         logger.warning(f"[SECURITY] Disallowed scheme: {scheme}")
-        return False, f"Scheme '{scheme}' is not allowed. Only http:// and https:// are permitted"
+        return None, f"Scheme '{scheme}' is not allowed. Only http:// and https:// are permitted"
 
     # Validate hostname
     hostname = parsed.hostname
     if not hostname:
         logger.warning("[SECURITY] URL missing hostname")
-        return False, "URL must include a hostname"
+        return None, "URL must include a hostname"
 
     # Check for blocked hosts before resolution
     if _is_blocked_host(hostname):
         logger.warning(f"[SECURITY] Blocked host detected: {hostname}")
-        return False, f"Access to host '{hostname}' is not allowed"
+        return None, f"Access to host '{hostname}' is not allowed"
 
     # Check if hostname is an IP address
     try:
@@ -183,7 +294,7 @@ def validate_url(url: str) -> Tuple[bool, str]:
         # Direct IP access - validate immediately
         if _is_private_ip(hostname):
             logger.warning(f"[SECURITY] Private IP access blocked: {hostname}")
-            return False, f"Access to private IP addresses is not allowed"
+            return None, f"Access to private IP addresses is not allowed"
     except ValueError:
         # Not an IP, it's a hostname - need DNS resolution
         pass
@@ -192,10 +303,18 @@ def validate_url(url: str) -> Tuple[bool, str]:
     port = parsed.port
     if port is not None and port in BLOCKED_PORTS:
         logger.warning(f"[SECURITY] Blocked port detected: {port}")
-        return False, f"Access to port {port} is not allowed"
+        return None, f"Access to port {port} is not allowed"
 
-    # Resolve hostname to IP (DNS validation)
-    resolved_ip, error = _resolve_hostname(hostname)
+    return hostname, ""
+
+
+def _check_resolved_ip(
+    url: str,
+    hostname: str,
+    resolved_ip: Optional[str],
+    error: Optional[str]
+) -> Tuple[bool, str]:
+    """Validate the result of resolving a URL's hostname."""
     if error:
         logger.warning(f"[SECURITY] DNS resolution failed for {hostname}: {error}")
         return False, f"Could not resolve hostname: {error}"
@@ -209,6 +328,68 @@ def validate_url(url: str) -> Tuple[bool, str]:
     return True, ""
 
 
+def validate_url(url: str) -> Tuple[bool, str]:
+    """
+    Validate a URL for SSRF protection.
+
+    Performs comprehensive validation including:
+    - URL format and length validation
+    - Scheme validation (only http/https)
+    - IP address validation (blocks private ranges)
+    - DNS resolution and re-validation (prevents DNS rebinding)
+    - Blocked host validation (metadata endpoints)
+    - Port validation
+
+    DNS answers come from the shared DNS cache when available. In async
+    code use validate_url_async, which never blocks the event loop.
+
+    Args:
+        url: The URL to validate
+
+    Returns:
+        Tuple of (is_valid, error_message). is_valid is True if URL is safe to fetch.
+    """
+    hostname, error = _check_url_static(url)
+    if hostname is None:
+        return False, error
+
+    # Resolve hostname to IP (DNS validation)
+    resolved_ip, error = _resolve_hostname_cached(hostname)
+    return _check_resolved_ip(url, hostname, resolved_ip, error)
+
+
+async def validate_url_async(url: str) -> Tuple[bool, str]:
+    """
+    Validate a URL for SSRF protection without blocking the event loop.
+
+    Runs the same checks as validate_url, resolving the hostname with the
+    event loop's non-blocking resolver and the shared DNS cache.
+
+    Args:
+        url: The URL to validate
+
+    Returns:
+        Tuple of (is_valid, error_message). is_valid is True if URL is safe to fetch.
+    """
+    hostname, error = _check_url_static(url)
+    if hostname is None:
+        return False, error
+
+    resolved_ip, error = await _resolve_hostname_cached_async(hostname)
+    return _check_resolved_ip(url, hostname, resolved_ip, error)
+
+
+def _resolve_redirect_target(base_url: str, redirect_url: str) -> str:
+    """
+    Turn a redirect Location into an absolute URL.
+
+    Relative (/path, path) and protocol-relative (//host/path) locations are
+    resolved against the URL that issued the redirect; absolute ones are
+    returned unchanged.
+    """
+    return urljoin(base_url, redirect_url)
+
+
 def validate_redirect_url(base_url: str, redirect_url: str) -> Tuple[bool, str]:
     """
     Validate a redirect URL against the original base URL.
@@ -224,15 +405,27 @@ def validate_redirect_url(base_url: str, redirect_url: str) -> Tuple[bool, str]:
         Tuple of (is_valid, error_message)
     """
     # If redirect URL is relative, it's generally safer but still validate
-    if redirect_url.startswith('/') or not bool(urlparse(redirect_url).netloc):
-        # Relative redirect - combine with base
-        parsed_base = urlparse(base_url)
-        redirect_url = f"{parsed_base.scheme}://{parsed_base.netloc}{redirect_url}"
+    redirect_url = _resolve_redirect_target(base_url, redirect_url)
 
     # Validate the redirect URL
     return validate_url(redirect_url)
 
 
+async def validate_redirect_url_async(base_url: str, redirect_url: str) -> Tuple[bool, str]:
+    """
+    Validate a redirect URL without blocking the event loop.
+
+    Args:
+        base_url: The original request URL
+        redirect_url: The URL being redirected to
+
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    redirect_url = _resolve_redirect_target(base_url, redirect_url)
+    return await validate_url_async(redirect_url)
+
+
 class SSRFValidator:
     """
     SSRF Validator class for managing URL validation state and configuration.
@@ -280,53 +473,49 @@ class SSRFValidator:
                 elif isinstance(network, ipaddress.IPv6Network):
                     self._private_ipv6.append(network)
 
-    def validate(self, url: str) -> Tuple[bool, str]:
-        """
-        Validate a URL using this validator's configuration.
-
-        Args:
-            url: The URL to validate
+    def _check_static(self, url: str) -> Tuple[Optional[str], str]:
+        """Run this validator's checks that do not need DNS.
 
         Returns:
-            Tuple of (is_valid, error_message)
+            Tuple of (hostname, error_message). hostname is None if the URL is rejected.
         """
         # Check URL length
         if len(url) > self.max_url_length:
             logger.warning(f"[SECURITY] URL exceeds maximum length: {len(url)} chars")
-            return False, f"URL exceeds maximum length of {self.max_url_length} characters"
+            return None, f"URL exceeds maximum length of {self.max_url_length} characters"
 
         # Parse URL
         try:
             parsed = urlparse(url)
         except Exception as e:
             logger.warning(f"[SECURITY] Failed to parse URL: {e}")
-            return False, f"Invalid URL format: {str(e)}"
+            return None, f"Invalid URL format: {str(e)}"
 
         # Validate scheme
         scheme = parsed.scheme.lower()
         if not scheme:
-            return False, "URL must include a scheme (http:// or https://)"
+            return None, "URL must include a scheme (http:// or https://)"
 
         if scheme not in self.allowed_schemes:
             logger.warning(f"[SECURITY] Disallowed scheme: {scheme}")
-            return False, f"Scheme '{scheme}' is not allowed"
+            return None, f"Scheme '{scheme}' is not allowed"
 
         # Validate hostname
         hostname = parsed.hostname
         if not hostname:
-            return False, "URL must include a hostname"
+            return None, "URL must include a hostname"
 
         # Check blocked hosts
         hostname_lower = hostname.lower()
         if hostname_lower in self._blocked_hosts_all:
             logger.warning(f"[SECURITY] Blocked host detected: {hostname}")
-            return False, f"Access to host '{hostname}' is not allowed"
+            return None, f"Access to host '{hostname}' is not allowed"
 
         # Validate IP if hostname is an IP address
         try:
             ip = ipaddress.ip_address(hostname)
             if self._is_ip_blocked(hostname):
-                return False, f"Access to private IP addresses is not allowed"
+                return None, f"Access to private IP addresses is not allowed"
         except ValueError:
             pass
 
@@ -334,10 +523,17 @@ class SSRFValidator:
         port = parsed.port
         if port is not None and port in self._blocked_ports_all:
             logger.warning(f"[SECURITY] Blocked port detected: {port}")
-            return False, f"Access to port {port} is not allowed"
+            return None, f"Access to port {port} is not allowed"
 
-        # DNS resolution and validation
-        resolved_ip, error = _resolve_hostname(hostname)
+        return hostname, ""
+
+    def _check_resolved(
+        self,
+        hostname: str,
+        resolved_ip: Optional[str],
+        error: Optional[str]
+    ) -> Tuple[bool, str]:
+        """Validate the result of resolving a hostname."""
         if error:
             logger.warning(f"[SECURITY] DNS resolution failed for {hostname}: {error}")
             return False, f"Could not resolve hostname: {error}"
@@ -349,6 +545,41 @@ class SSRFValidator:
 
         return True, ""
 
+    def validate(self, url: str) -> Tuple[bool, str]:
+        """
+        Validate a URL using this validator's configuration.
+
+        Args:
+            url: The URL to validate
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        hostname, error = self._check_static(url)
+        if hostname is None:
+            return False, error
+
+        # DNS resolution and validation
+        resolved_ip, error = _resolve_hostname_cached(hostname)
+        return self._check_resolved(hostname, resolved_ip, error)
+
+    async def validate_async(self, url: str) -> Tuple[bool, str]:
+        """
+        Validate a URL without blocking the event loop.
+
+        Args:
+            url: The URL to validate
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        hostname, error = self._check_static(url)
+        if hostname is None:
+            return False, error
+
+        resolved_ip, error = await _resolve_hostname_cached_async(hostname)
+        return self._check_resolved(hostname, resolved_ip, error)
+
     def _is_ip_blocked(self, ip_str: str) -> bool:
         """Check if IP is in blocked networks."""
         try:
@@ -370,7 +601,4 @@ class SSRFValidator:
 
     def validate_redirect(self, base_url: str, redirect_url: str) -> Tuple[bool, str]:
         """Validate a redirect URL."""
-        if redirect_url.startswith('/') or not bool(urlparse(redirect_url).netloc):
-            parsed_base = urlparse(base_url)
-            redirect_url = f"{parsed_base.scheme}://{parsed_base.netloc}{redirect_url}"
-        return self.validate(redirect_url)
+        return self.validate(_resolve_redirect_target(base_url, redirect_url))
@@ -4,11 +4,12 @@ Logic-based content scoring without LLM (for speed).
 """
 
 import re
-from typing import Any, Dict, List, Tuple
-from bs4 import BeautifulSoup
+from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 import logging
 
+from .document import ParsedDocument
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,6 +17,9 @@ class HeuristicAnalyzer:
     """
     Analyzes raw HTML content and returns a signal score based on
     structural heuristics (no LLM required).
+
+    All checks read from a ParsedDocument, so a page that is also being
+    extracted is only parsed once.
     """
     
     # Coding-related keywords that indicate technical content
@@ -64,24 +68,32 @@ class HeuristicAnalyzer:
     
     def calculate_structure_score(
         self, 
-        html_content: str, 
+        html_content: Union[bytes, str, ParsedDocument], 
         query_context: str
     ) -> Dict[str, Any]:
         """
         Analyze HTML content and return a signal score.
         
         Args:
-            html_content: Raw HTML of the page
+            html_content: Raw HTML of the page (bytes or str), or an already parsed document
             query_context: User's search query for context
             
         Returns:
             Dict with 'score' (0-100) and 'reason' (explanation)
         """
-        if not html_content or len(html_content) < 100:
+        if isinstance(html_content, (bytes, str)) or html_content is None:
+            html, doc = html_content, None
+        else:
+            html, doc = html_content.html, html_content
+
+        if not html or len(html) < 100:
             return {"score": 0, "reason": "Empty or too short content", "adjustments": []}
 
         try:
-            soup = BeautifulSoup(html_content, "lxml")
+            if doc is None:
+                doc = ParsedDocument(html)
+            if not doc.parsed:
+                raise ValueError("no document tree")
         except Exception as e:
             logger.warning(f"Failed to parse HTML: {e}")
             return {"score": 30, "reason": "Failed to parse HTML", "adjustments": []}
@@ -92,28 +104,28 @@ class HeuristicAnalyzer:
         
         # 1. Code Density Analysis
         code_score, code_reason = self._analyze_code_density(
-            soup, query_context
+            doc, query_context
         )
         if code_score != 0:
             adjustments.append((code_score, code_reason))
         
         # 2. Data Density (tables)
-        data_score, data_reason = self._analyze_data_density(soup)
+        data_score, data_reason = self._analyze_data_density(doc)
         if data_score != 0:
             adjustments.append((data_score, data_reason))
         
         # 3. Slop Detection (HTML bloat)
-        slop_score, slop_reason = self._detect_slop(html_content, soup)
+        slop_score, slop_reason = self._detect_slop(doc)
         if slop_score != 0:
             adjustments.append((slop_score, slop_reason))
         
         # 4. Affiliate Detection
-        affiliate_score, affiliate_reason = self._detect_affiliates(soup)
+        affiliate_score, affiliate_reason = self._detect_affiliates(doc)
         if affiliate_score != 0:
             adjustments.append((affiliate_score, affiliate_reason))
         
         # 5. Title Hype Detection
-        hype_score, hype_reason = self._detect_hype(soup)
+        hype_score, hype_reason = self._detect_hype(doc)
         if hype_score != 0:
             adjustments.append((hype_score, hype_reason))
         
@@ -141,7 +153,7 @@ class HeuristicAnalyzer:
     
     def _analyze_code_density(
         self, 
-        soup: BeautifulSoup, 
+        doc: ParsedDocument, 
         query: str
     ) -> Tuple[int, str]:
         """Boost score if coding content matches coding query."""
@@ -150,10 +162,8 @@ class HeuristicAnalyzer:
             kw in query_lower for kw in self.CODING_KEYWORDS
         )
         
-        # Count code elements
-        pre_tags = len(soup.find_all("pre"))
-        code_tags = len(soup.find_all("code"))
-        total_code = pre_tags + code_tags
+        # Count code elements (<pre> and <code>)
+        total_code = doc.code_blocks
         
         if is_coding_query and total_code >= 3:
             return (20, f"High code density ({total_code} blocks)")
@@ -165,34 +175,28 @@ class HeuristicAnalyzer:
         
         return (0, "")
     
-    def _analyze_data_density(self, soup: BeautifulSoup) -> Tuple[int, str]:
+    def _analyze_data_density(self, doc: ParsedDocument) -> Tuple[int, str]:
         """Boost score if structured data (tables) exists."""
-        tables = soup.find_all("table")
+        tables = doc.tables
         
-        if len(tables) >= 3:
-            return (15, f"Structured data tables ({len(tables)})")
-        elif len(tables) >= 1:
+        if tables >= 3:
+            return (15, f"Structured data tables ({tables})")
+        elif tables >= 1:
             return (8, "Contains data tables")
         
         return (0, "")
     
-    def _detect_slop(
-        self, 
-        html: str, 
-        soup: BeautifulSoup
-    ) -> Tuple[int, str]:
+    def _detect_slop(self, doc: ParsedDocument) -> Tuple[int, str]:
         """Penalize if HTML-to-text ratio indicates bloat/ads."""
-        text = soup.get_text(separator=" ", strip=True)
-
         # Calculate ratio
-        html_len = len(html)
-        text_len = len(text)
+        html_len = doc.html_length
+        text_len = doc.text_length
 
         # Check for NO text first (more severe than thin content)
         if text_len == 0:
             return (-30, "No readable text content")
 
-        if len(text) < 200:
+        if text_len < 200:
             return (-20, "Very thin content")
         
         ratio = html_len / text_len
@@ -210,13 +214,11 @@ class HeuristicAnalyzer:
         
         return (0, "")
     
-    def _detect_affiliates(self, soup: BeautifulSoup) -> Tuple[int, str]:
+    def _detect_affiliates(self, doc: ParsedDocument) -> Tuple[int, str]:
         """Penalize if external links contain affiliate patterns."""
-        links = soup.find_all("a", href=True)
         affiliate_count = 0
         
-        for link in links:
-            href = link.get("href", "")
+        for href in doc.links:
             if self.affiliate_regex.search(href):
                 affiliate_count += 1
         
@@ -229,19 +231,17 @@ class HeuristicAnalyzer:
         
         return (0, "")
     
-    def _detect_hype(self, soup: BeautifulSoup) -> Tuple[int, str]:
+    def _detect_hype(self, doc: ParsedDocument) -> Tuple[int, str]:
         """Penalize if title contains hype/clickbait words."""
         # Check title tag first (higher penalty)
-        title_tag = soup.find("title")
-        if title_tag:
-            title = title_tag.get_text()
+        title = doc.title
+        if title:
             if self.hype_regex.search(title):
                 return (-20, f"Clickbait title detected: '{title[:50]}...'")
 
         # Also check h1 (lower penalty)
-        h1_tag = soup.find("h1")
-        if h1_tag:
-            h1_text = h1_tag.get_text()
+        h1_text = doc.h1
+        if h1_text:
             if self.hype_regex.search(h1_text):
                 return (-15, f"Hype headline detected: '{h1_text[:50]}...'")
 
@@ -250,3 +250,33 @@ class HeuristicAnalyzer:
 
 # Singleton instance
 heuristic_analyzer = HeuristicAnalyzer()
+
+
+def score_page(
+    html: Union[bytes, str],
+    query: str,
+    encoding: Optional[str] = None,
+    cascade_bounds: Optional[Tuple[float, float]] = None
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Parse a page once, then score its structure and extract its text.
+
+    Runs through the CPU pool, so it takes and returns plain values.
+
+    Args:
+        html: Raw HTML of the page (fetched bytes or str)
+        query: User's search query for context
+        encoding: Charset from the HTTP Content-Type header, if any
+        cascade_bounds: (low, high) structure scores at or beyond which
+            the score alone decides and text extraction is skipped
+
+    Returns:
+        Tuple of (structure score dict, extracted text or None); the text
+        is also None when extraction was skipped
+    """
+    doc = ParsedDocument(html, encoding)
+    heuristic = heuristic_analyzer.calculate_structure_score(doc, query)
+    if cascade_bounds and not cascade_bounds[0] < heuristic["score"] < cascade_bounds[1]:
+        return heuristic, None
+    extracted_text = doc.extract_text(include_comments=False, include_tables=True)
+    return heuristic, extracted_text
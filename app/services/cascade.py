@@ -0,0 +1,44 @@
+"""
+SGNL Scoring Cascade
+Skips expensive scoring stages when a cheap score already decides.
+
+Most search results are clearly good or clearly junk, and a signal or
+structure score computed in microseconds shows it. With
+SCORING_CASCADE_ENABLED, a cheap score at or beyond its low/high bound
+is decisive and the NLP stages after it (text extraction, CPIDR, DEPID)
+are skipped. Responses list the skipped stages in "skipped_stages".
+"""
+
+from typing import Optional
+
+from config import config
+
+# Stage names reported in "skipped_stages"
+STAGE_EXTRACTION = "extraction"
+STAGE_CPIDR = "cpidr"
+STAGE_DEPID = "depid"
+
+VERDICT_LOW = "low"
+VERDICT_HIGH = "high"
+
+
+def cascade_verdict(score: float, low: float, high: float) -> Optional[str]:
+    """
+    Decide from a cheap score alone.
+
+    Args:
+        score: Cheap score (signal or structure score)
+        low: Scores at or below this are clearly junk
+        high: Scores at or above this are clearly good
+
+    Returns:
+        "low" or "high" when the score is decisive, None when the
+        expensive stages must run (or the cascade is disabled)
+    """
+    if not config.SCORING_CASCADE_ENABLED:
+        return None
+    if score <= low:
+        return VERDICT_LOW
+    if score >= high:
+        return VERDICT_HIGH
+    return None
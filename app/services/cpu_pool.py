@@ -0,0 +1,375 @@
+"""
+SGNL CPU Pool
+Process-pool execution for CPU-bound extraction and scoring stages.
+
+Trafilatura extraction, the lxml structure analysis, and the
+CPIDR/DEPID density metrics hold the GIL for as long as they run, so a
+single large page stalls every other request on the event loop. This
+module runs those stages in a small set of warm worker processes:
+
+- Workers are started with the "spawn" context and pre-import the heavy
+  libraries (trafilatura, lxml, ideadensity/spaCy) before taking work.
+- Every task has a timeout. A task that overruns has its worker killed and
+  replaced, so the work is actually stopped rather than left running.
+- Workers are recycled after a fixed number of tasks to bound memory growth
+  from parser caches and fragmented heaps.
+
+Functions sent to the pool must be importable top-level callables and their
+arguments and results must be picklable.
+
+With CPU_POOL_WORKERS=0 (the default) tasks run inline via asyncio.to_thread,
+which keeps the event loop responsive but is still limited by the GIL. The
+timeout still applies there, but a thread cannot be killed: the caller gets
+CPUTaskTimeout while the thread runs to completion.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from typing import Any, Callable, Dict, Optional
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Modules imported by each worker before it accepts tasks
+WARM_MODULES = (
+    "lxml.html",
+    "trafilatura",
+    "services.readability",
+    "services.document",
+    "services.analyzer",
+    "ideadensity",
+)
+
+# Grace period for a worker to exit after a shutdown request
+WORKER_STOP_TIMEOUT_SECONDS = 2.0
+
+
+class CPUTaskTimeout(asyncio.TimeoutError):
+    """Raised when a pooled task exceeds its time budget and its worker is killed."""
+
+
+class WorkerCrashed(RuntimeError):
+    """Raised when a worker process dies while running a task."""
+
+
+def _warm_up() -> None:
+    """Import heavy dependencies so the first real task does not pay for them."""
+    import importlib
+
+    for module_name in WARM_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            pass
+
+    # Load the spaCy models used by CPIDR/DEPID once per worker
+    try:
+        from ideadensity import cpidr
+        from ideadensity.depid import get_nlp
+        cpidr("Workers load the language model once at startup.")
+        get_nlp()
+    except Exception:
+        pass
+
+
+def _worker_main(conn, warm: bool) -> None:
+    """
+    Worker process loop: receive (fn, args, kwargs), send back (ok, value).
+
+    A None message asks the worker to exit.
+    """
+    if warm:
+        _warm_up()
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        except Exception as e:
+            # The task could not be unpickled in this process
+            conn.send((False, e))
+            continue
+
+        if message is None:
+            break
+
+        fn, args, kwargs = message
+        try:
+            result = (True, fn(*args, **kwargs))
+        except Exception as e:
+            result = (False, e)
+
+        try:
+            conn.send(result)
+        except Exception as e:
+            conn.send((False, RuntimeError(f"Task result could not be returned: {e!r}")))
+
+    conn.close()
+
+
+class _Worker:
+    """A single worker process and the parent end of its pipe."""
+
+    def __init__(self, ctx, warm: bool):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, warm), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks_done = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        """Stop the worker immediately, abandoning any task it is running."""
+        try:
+            self.process.kill()
+            self.process.join(WORKER_STOP_TIMEOUT_SECONDS)
+        finally:
+            self.conn.close()
+
+    def stop(self) -> None:
+        """Ask the worker to exit after its current task, killing it if it does not."""
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        self.process.join(WORKER_STOP_TIMEOUT_SECONDS)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class CPUPool:
+    """
+    Pool of warm worker processes for CPU-bound work.
+
+    Usage:
+        pool = CPUPool(workers=2, task_timeout=15.0)
+        await pool.start()
+        text = await pool.run(trafilatura.extract, html)
+        await pool.shutdown()
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        task_timeout: float = 15.0,
+        max_tasks_per_worker: int = 200,
+        warm: bool = True
+    ):
+        """
+        Initialize the pool (workers are started by start() or on first use).
+
+        Args:
+            workers: Number of worker processes
+            task_timeout: Default per-task timeout in seconds
+            max_tasks_per_worker: Tasks a worker runs before it is replaced
+            warm: Pre-import heavy libraries in each worker
+        """
+        if workers < 1:
+            raise ValueError("CPUPool requires at least one worker")
+
+        self.workers = workers
+        self.task_timeout = task_timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.warm = warm
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: Optional[asyncio.Queue] = None
+        self._all: set = set()
+        self._reaping: set = set()
+        self._closed = False
+
+        # Statistics
+        self.tasks_completed = 0
+        self.tasks_failed = 0
+        self.timeouts = 0
+        self.recycled = 0
+        self.crashed = 0
+
+    @property
+    def started(self) -> bool:
+        return self._idle is not None
+
+    async def start(self) -> None:
+        """Start all worker processes."""
+        if self.started:
+            return
+        self._closed = False
+        self._idle = asyncio.Queue()
+        for _ in range(self.workers):
+            self._idle.put_nowait(self._spawn())
+        logger.info(f"[CPU_POOL] Started {self.workers} workers")
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._ctx, self.warm)
+        self._all.add(worker)
+        return worker
+
+    def _retire(self, worker: _Worker, kill: bool) -> None:
+        """Stop a worker in a thread; joining it can take WORKER_STOP_TIMEOUT_SECONDS."""
+        self._all.discard(worker)
+        reaper = asyncio.create_task(asyncio.to_thread(worker.kill if kill else worker.stop))
+        self._reaping.add(reaper)
+        reaper.add_done_callback(self._reaping.discard)
+
+    def _replace(self, worker: _Worker, kill: bool) -> _Worker:
+        self._retire(worker, kill)
+        return self._spawn()
+
+    async def _wait_readable(self, worker: _Worker, timeout: float) -> None:
+        """Wait until the worker has sent a result, without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fd = worker.conn.fileno()
+
+        def _on_readable():
+            if not ready.done():
+                ready.set_result(None)
+
+        loop.add_reader(fd, _on_readable)
+        try:
+            await asyncio.wait_for(ready, timeout)
+        finally:
+            loop.remove_reader(fd)
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) in a worker process.
+
+        Args:
+            fn: Importable top-level callable
+            timeout: Seconds before the task is abandoned (defaults to task_timeout)
+
+        Returns:
+            The value returned by fn
+
+        Raises:
+            CPUTaskTimeout: If the task exceeds its timeout (the worker is killed)
+            WorkerCrashed: If the worker process dies during the task
+            Exception: Any exception raised by fn
+        """
+        if self._closed:
+            raise RuntimeError("CPU pool is shut down")
+        if not self.started:
+            await self.start()
+
+        timeout = self.task_timeout if timeout is None else timeout
+        worker = await self._idle.get()
+        if not worker.is_alive():
+            worker = self._replace(worker, kill=True)
+
+        try:
+            # Pickling and writing a large page blocks; keep it off the loop
+            await asyncio.to_thread(worker.conn.send, (fn, args, kwargs))
+            await self._wait_readable(worker, timeout)
+            ok, value = worker.conn.recv()
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"[CPU_POOL] Task {getattr(fn, '__name__', fn)} exceeded {timeout}s, killing worker {worker.pid}")
+            self._idle.put_nowait(self._replace(worker, kill=True))
+            raise CPUTaskTimeout(f"CPU task exceeded {timeout}s")
+        except asyncio.CancelledError:
+            # The caller gave up; stop the work instead of letting it run on
+            self._idle.put_nowait(self._replace(worker, kill=True))
+            raise
+        except (EOFError, OSError) as e:
+            self.crashed += 1
+            logger.error(f"[CPU_POOL] Worker {worker.pid} died: {e}")
+            self._idle.put_nowait(self._replace(worker, kill=True))
+            raise WorkerCrashed(f"CPU worker died while running task: {e}")
+        except BaseException:
+            # Sending the task failed (e.g. unpicklable argument); worker is unaffected
+            self._idle.put_nowait(worker)
+            raise
+
+        worker.tasks_done += 1
+        if worker.tasks_done >= self.max_tasks_per_worker:
+            self.recycled += 1
+            logger.debug(f"[CPU_POOL] Recycling worker {worker.pid} after {worker.tasks_done} tasks")
+            worker = self._replace(worker, kill=False)
+        self._idle.put_nowait(worker)
+
+        if ok:
+            self.tasks_completed += 1
+            return value
+        self.tasks_failed += 1
+        raise value
+
+    async def shutdown(self) -> None:
+        """Stop all worker processes."""
+        self._closed = True
+        for worker in list(self._all):
+            self._retire(worker, kill=False)
+        self._idle = None
+        # Workers stop concurrently
+        await asyncio.gather(*self._reaping, return_exceptions=True)
+        logger.info("[CPU_POOL] Shut down")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        return {
+            "workers": self.workers,
+            "alive": sum(1 for w in self._all if w.is_alive()),
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "tasks_completed": self.tasks_completed,
+            "tasks_failed": self.tasks_failed,
+            "timeouts": self.timeouts,
+            "recycled": self.recycled,
+            "crashed": self.crashed,
+        }
+
+
+# Global pool instance (None when CPU_POOL_WORKERS is 0)
+_cpu_pool: Optional[CPUPool] = None
+
+
+def get_cpu_pool() -> Optional[CPUPool]:
+    """Get or create the global CPU pool, or None if pooling is disabled."""
+    global _cpu_pool
+    if _cpu_pool is None and config.CPU_POOL_WORKERS > 0:
+        _cpu_pool = CPUPool(
+            workers=config.CPU_POOL_WORKERS,
+            task_timeout=config.CPU_TASK_TIMEOUT_SECONDS,
+            max_tasks_per_worker=config.CPU_POOL_MAX_TASKS_PER_WORKER,
+        )
+    return _cpu_pool
+
+
+async def run_cpu_bound(fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Run a CPU-bound callable off the event loop.
+
+    Uses the process pool when CPU_POOL_WORKERS > 0, otherwise a thread.
+
+    Raises:
+        CPUTaskTimeout: If the task exceeds timeout (default
+            CPU_TASK_TIMEOUT_SECONDS); a thread is abandoned, not stopped
+    """
+    pool = get_cpu_pool()
+    if pool is None:
+        timeout = config.CPU_TASK_TIMEOUT_SECONDS if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.to_thread(fn, *args, **kwargs), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[CPU_POOL] Task {getattr(fn, '__name__', fn)} exceeded {timeout}s in a thread, abandoning it")
+            raise CPUTaskTimeout(f"CPU task exceeded {timeout}s")
+    return await pool.run(fn, *args, timeout=timeout, **kwargs)
+
+
+async def shutdown_cpu_pool() -> None:
+    """Stop the global CPU pool if it was started."""
+    global _cpu_pool
+    if _cpu_pool is not None:
+        await _cpu_pool.shutdown()
+        _cpu_pool = None
@@ -0,0 +1,206 @@
+"""
+SGNL Sampled Density Estimation
+Estimates idea density ratios of long texts from a sample of paragraphs.
+
+CPIDR and DEPID are ratios of propositions to words over the whole text,
+so scoring a 40k-word paper costs forty times a blog post for a single
+number. Instead the text is split into paragraph units, grouped into
+contiguous strata (beginning, middle, ..., end) so every part of the
+document is represented. Units are scored one per stratum per round, in
+a random order seeded by the text, and sampling stops once the 95%
+confidence half-width of every ratio is within the target or the word
+budget is spent.
+
+Each ratio is a stratified combined ratio estimate: sampled propositions
+and words are scaled up per stratum and divided, and the error bar comes
+from the linearized variance of that estimate with the finite population
+correction, so it shrinks to 0 when every unit has been scored.
+"""
+
+import math
+import random
+import re
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Bump when the unit, strata or stopping constants below change; part of
+# the key of stored estimates, so old estimates are not served
+SAMPLER_VERSION = "1"
+
+# z-score for a two-sided 95% confidence interval
+Z_95 = 1.96
+
+# Paragraph units are merged up to at least this many words
+MIN_UNIT_WORDS = 60
+
+# Longer lines are split at sentence ends before merging
+MAX_UNIT_WORDS = 400
+
+# Number of contiguous strata, and the fewest units each must hold
+STRATA = 4
+MIN_UNITS_PER_STRATUM = 4
+
+# Units scored before the error bar is trusted (small-sample variances are noisy)
+MIN_SAMPLED_UNITS = 32
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Scores a batch of units: one {metric: (propositions, words)} per unit
+UnitScorer = Callable[[List[str]], List[Dict[str, Tuple[float, float]]]]
+
+
+def split_units(text: str, min_words: int = MIN_UNIT_WORDS, max_words: int = MAX_UNIT_WORDS) -> List[str]:
+    """
+    Split text into paragraph units of at least min_words words.
+
+    Lines are paragraphs; lines over max_words are cut at sentence ends,
+    and short pieces are merged with the following ones.
+    """
+    pieces = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if len(line.split()) > max_words:
+            pieces.extend(_SENTENCE_END.split(line))
+        else:
+            pieces.append(line)
+
+    units = []
+    current: List[str] = []
+    words = 0
+    for piece in pieces:
+        current.append(piece)
+        words += len(piece.split())
+        if words >= min_words:
+            units.append("\n".join(current))
+            current, words = [], 0
+    if current:
+        if units:
+            units[-1] += "\n" + "\n".join(current)
+        else:
+            units.append("\n".join(current))
+    return units
+
+
+class StratifiedRatio:
+    """
+    Combined ratio estimate of sum(numerator) / sum(denominator) over all
+    units, from a stratified sample of them.
+    """
+
+    def __init__(self, stratum_sizes: Sequence[int]):
+        """
+        Args:
+            stratum_sizes: Number of units in each stratum
+        """
+        self.stratum_sizes = list(stratum_sizes)
+        self.samples: List[List[Tuple[float, float]]] = [[] for _ in self.stratum_sizes]
+
+    def add(self, stratum: int, numerator: float, denominator: float):
+        """Record one scored unit of a stratum."""
+        self.samples[stratum].append((numerator, denominator))
+
+    def _totals(self) -> Tuple[float, float]:
+        numerator = denominator = 0.0
+        for size, sample in zip(self.stratum_sizes, self.samples):
+            if sample:
+                numerator += size * sum(y for y, _ in sample) / len(sample)
+                denominator += size * sum(x for _, x in sample) / len(sample)
+        return numerator, denominator
+
+    def ratio(self) -> float:
+        """Estimated ratio (0.0 when no words were sampled)."""
+        numerator, denominator = self._totals()
+        return numerator / denominator if denominator > 0 else 0.0
+
+    def half_width(self, z: float = Z_95) -> float:
+        """
+        Half-width of the confidence interval of ratio().
+
+        Returns:
+            0.0 when every unit was scored, inf while a partly sampled
+            stratum has fewer than two units scored
+        """
+        numerator, denominator = self._totals()
+        if denominator <= 0:
+            return math.inf
+        ratio = numerator / denominator
+
+        variance = 0.0
+        for size, sample in zip(self.stratum_sizes, self.samples):
+            n = len(sample)
+            if n >= size:
+                continue
+            if n < 2:
+                return math.inf
+            residuals = [y - ratio * x for y, x in sample]
+            mean = sum(residuals) / n
+            spread = sum((r - mean) ** 2 for r in residuals) / (n - 1)
+            variance += size * size * (1 - n / size) * spread / n
+        return z * math.sqrt(variance) / denominator
+
+
+def _strata(unit_count: int) -> List[range]:
+    """Contiguous strata of unit indexes."""
+    count = max(1, min(STRATA, unit_count // MIN_UNITS_PER_STRATUM))
+    bounds = [unit_count * i // count for i in range(count + 1)]
+    return [range(bounds[i], bounds[i + 1]) for i in range(count)]
+
+
+def estimate_ratios(
+    units: List[str],
+    score_units: UnitScorer,
+    max_error: float,
+    max_words: int,
+    seed: int,
+) -> Dict[str, object]:
+    """
+    Estimate density ratios of the whole text from a sample of its units.
+
+    Args:
+        units: Paragraph units of the text (see split_units)
+        score_units: Returns {metric: (propositions, words)} for each unit
+        max_error: Stop once every metric's 95% half-width is at most this
+        max_words: Stop once this many words have been scored
+        seed: Seeds the sampling order, so the same text gives the same estimate
+
+    Returns:
+        Dict with {metric: (ratio, half_width)} under "ratios", and
+        "sampled_units", "total_units", "sampled_words" and "total_words"
+    """
+    strata = _strata(len(units))
+    rng = random.Random(seed)
+    orders = []
+    for stratum in strata:
+        order = list(stratum)
+        rng.shuffle(order)
+        orders.append(order)
+
+    estimates: Dict[str, StratifiedRatio] = {}
+    sampled_units = sampled_words = 0
+    for round_index in range(max(len(order) for order in orders)):
+        picks = [(s, order[round_index]) for s, order in enumerate(orders) if round_index < len(order)]
+        scores = score_units([units[i] for _, i in picks])
+        for (stratum, i), unit_scores in zip(picks, scores):
+            for metric, (propositions, words) in unit_scores.items():
+                if metric not in estimates:
+                    estimates[metric] = StratifiedRatio([len(s) for s in strata])
+                estimates[metric].add(stratum, propositions, words)
+            sampled_words += len(units[i].split())
+        sampled_units += len(picks)
+
+        # Two rounds give every stratum the two units its variance needs
+        if sampled_words >= max_words and round_index >= 1:
+            break
+        if sampled_units >= MIN_SAMPLED_UNITS and estimates and all(
+            e.half_width() <= max_error for e in estimates.values()
+        ):
+            break
+
+    return {
+        "ratios": {metric: (e.ratio(), e.half_width()) for metric, e in estimates.items()},
+        "sampled_units": sampled_units,
+        "total_units": len(units),
+        "sampled_words": sampled_words,
+        "total_words": sum(len(unit.split()) for unit in units),
+    }
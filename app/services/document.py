@@ -0,0 +1,269 @@
+"""
+SGNL Parsed Document
+Parses a page's HTML once into an lxml tree and shares it between stages.
+
+Extraction (Trafilatura), metadata, and the heuristic structure counts all
+read from the same tree instead of each re-parsing the raw HTML.
+
+Fetched pages arrive as bytes and are handed to libxml2 as-is with the
+charset from the HTTP header or the document's <meta> tag, so the page is
+never decoded into a Python str; only the extracted text is. String input
+goes through Trafilatura's own loader, so extraction results are the same
+as passing the string to trafilatura directly.
+"""
+
+import codecs
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import lxml.html
+import trafilatura
+from trafilatura.utils import load_html
+
+logger = logging.getLogger(__name__)
+
+# Elements whose text is not readable page content
+NON_TEXT_TAGS = {"script", "style", "template"}
+
+# How far into the document to look for a <meta> charset declaration
+CHARSET_SNIFF_BYTES = 4096
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-z0-9_.:-]+)""", re.IGNORECASE)
+
+# Byte versions of Trafilatura's repairs for markup that trips up libxml2
+_DOCTYPE_TAG = re.compile(rb"^< ?! ?DOCTYPE[^>]*/[^<>]*>", re.IGNORECASE)
+_FAULTY_HTML = re.compile(rb"(<html.*?)\s*/>", re.IGNORECASE)
+
+
+@lru_cache(maxsize=32)
+def _parser_for(encoding: str) -> lxml.html.HTMLParser:
+    """HTML parser with Trafilatura's settings for a given input encoding."""
+    return lxml.html.HTMLParser(
+        collect_ids=False,
+        default_doctype=False,
+        encoding=encoding,
+        remove_comments=True,
+        remove_pis=True,
+    )
+
+
+def sniff_encoding(data: bytes, declared: Optional[str] = None) -> str:
+    """
+    Pick the encoding for raw HTML bytes.
+
+    The HTTP header charset wins, then a <meta> charset near the start of
+    the document, then UTF-8.
+
+    Args:
+        data: Raw HTML
+        declared: Charset from the Content-Type header, if any
+
+    Returns:
+        A codec name known to Python
+    """
+    candidates = [declared]
+    match = _META_CHARSET.search(data, 0, CHARSET_SNIFF_BYTES)
+    if match:
+        candidates.append(match.group(1).decode("ascii"))
+
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            codecs.lookup(candidate)
+            return candidate
+        except LookupError:
+            logger.debug(f"[DOCUMENT] Unknown charset {candidate!r}")
+    return "utf-8"
+
+
+def _load_html_bytes(data: bytes, encoding: str) -> Tuple[Optional[lxml.html.HtmlElement], bool]:
+    """
+    Parse raw HTML bytes like trafilatura.utils.load_html, without decoding to str.
+
+    Returns:
+        Tuple of (tree or None, whether Trafilatura would accept the document)
+    """
+    beginning = data[:50].lower()
+    if b"doctype" in beginning:
+        firstline, _, rest = data.partition(b"\n")
+        data = _DOCTYPE_TAG.sub(b"", firstline, count=1) + b"\n" + rest
+    for line in data[:4096].splitlines()[:4]:
+        if b"<html" in line and line.endswith(b"/>"):
+            data = _FAULTY_HTML.sub(rb"\1>", data, count=1)
+            break
+
+    try:
+        parser = _parser_for(encoding)
+    except LookupError:
+        # Known to Python but not to libxml2
+        parser = _parser_for("utf-8")
+
+    try:
+        tree = lxml.html.fromstring(data, parser=parser)
+    except Exception as e:
+        logger.debug(f"[DOCUMENT] lxml could not parse HTML: {e}")
+        return None, False
+
+    # Same rejection test as Trafilatura: is it (well-formed) HTML at all?
+    extractable = not (b"html" not in beginning and len(tree) < 2)
+    return tree, extractable
+
+
+class ParsedDocument:
+    """
+    An HTML page parsed once, with lazily computed structure statistics.
+
+    Usage:
+        doc = ParsedDocument(body, encoding="utf-8")
+        text = doc.extract_text(include_tables=True)
+        title = doc.metadata_title()
+        code_blocks, tables = doc.code_blocks, doc.tables
+    """
+
+    def __init__(self, html: Union[bytes, str], encoding: Optional[str] = None):
+        """
+        Parse the HTML.
+
+        Args:
+            html: Raw HTML of the page, as fetched bytes or a str
+            encoding: Charset from the HTTP Content-Type header (bytes only)
+        """
+        self.html = html
+        self.html_length = len(html)
+        self.encoding: Optional[str] = None
+        self.tree = None
+        self.extractable = False
+        self._stats: Optional[Dict[str, Any]] = None
+
+        if not html:
+            return
+
+        if isinstance(html, (bytes, bytearray)):
+            self.encoding = sniff_encoding(html, encoding)
+            self.tree, self.extractable = _load_html_bytes(bytes(html), self.encoding)
+            return
+
+        self.tree = load_html(html)
+
+        # Trafilatura rejects inputs that do not look like HTML documents;
+        # keep extraction consistent with that but still count structure
+        self.extractable = self.tree is not None
+        if self.tree is None and html.strip():
+            try:
+                self.tree = lxml.html.fromstring(html)
+            except Exception as e:
+                logger.debug(f"[DOCUMENT] lxml could not parse HTML: {e}")
+
+    @property
+    def parsed(self) -> bool:
+        """True if the HTML produced a tree."""
+        return self.tree is not None
+
+    def extract_text(self, **kwargs) -> Optional[str]:
+        """
+        Extract the main text with Trafilatura from the parsed tree.
+
+        Args:
+            **kwargs: Options passed to trafilatura.extract
+
+        Returns:
+            Extracted text, or None if nothing could be extracted
+        """
+        if not self.extractable:
+            return None
+        # Trafilatura copies a tree it is given, so the shared tree stays intact
+        return trafilatura.extract(self.tree, **kwargs)
+
+    def metadata_title(self) -> Optional[str]:
+        """Title from Trafilatura metadata, falling back to the <title> tag."""
+        if self.extractable:
+            metadata = trafilatura.extract_metadata(self.tree)
+            if metadata:
+                return metadata.title
+        return self.title
+
+    def _scan(self) -> Dict[str, Any]:
+        """Collect all structure statistics in a single pass over the tree."""
+        if self._stats is not None:
+            return self._stats
+
+        code_blocks = 0
+        tables = 0
+        links: List[str] = []
+        title = None
+        h1 = None
+        text_pieces = 0
+        text_chars = 0
+
+        if self.tree is not None:
+            for element in self.tree.iter():
+                tag = element.tag
+                if isinstance(tag, str):
+                    if tag in ("pre", "code"):
+                        code_blocks += 1
+                    elif tag == "table":
+                        tables += 1
+                    elif tag == "a":
+                        href = element.get("href")
+                        if href is not None:
+                            links.append(href)
+                    elif tag == "title" and title is None:
+                        title = element.text_content()
+                    elif tag == "h1" and h1 is None:
+                        h1 = element.text_content()
+
+                    if tag not in NON_TEXT_TAGS and element.text:
+                        stripped = element.text.strip()
+                        if stripped:
+                            text_pieces += 1
+                            text_chars += len(stripped)
+
+                if element.tail and element is not self.tree:
+                    stripped = element.tail.strip()
+                    if stripped:
+                        text_pieces += 1
+                        text_chars += len(stripped)
+
+        self._stats = {
+            "code_blocks": code_blocks,
+            "tables": tables,
+            "links": links,
+            "title": title,
+            "h1": h1,
+            # Length of the visible text joined with single spaces
+            "text_length": text_chars + max(0, text_pieces - 1),
+        }
+        return self._stats
+
+    @property
+    def code_blocks(self) -> int:
+        """Number of <pre> and <code> elements."""
+        return self._scan()["code_blocks"]
+
+    @property
+    def tables(self) -> int:
+        """Number of <table> elements."""
+        return self._scan()["tables"]
+
+    @property
+    def links(self) -> List[str]:
+        """href values of all <a> elements that have one."""
+        return self._scan()["links"]
+
+    @property
+    def title(self) -> Optional[str]:
+        """Text of the first <title> element, if any."""
+        return self._scan()["title"]
+
+    @property
+    def h1(self) -> Optional[str]:
+        """Text of the first <h1> element, if any."""
+        return self._scan()["h1"]
+
+    @property
+    def text_length(self) -> int:
+        """Length of the page's visible text (scripts and styles excluded)."""
+        return self._scan()["text_length"]
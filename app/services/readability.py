@@ -0,0 +1,186 @@
+"""
+SGNL Readability
+Computes the five readability scores from one tokenization of the text.
+
+textstat re-tokenizes the text and re-counts sentences and syllables for
+each score it computes, and switches language through global state
+(textstat.set_lang), which races between threads. Here the text is split
+into sentence fragments once, each fragment is tokenized once, and
+Flesch Reading Ease, Flesch-Kincaid Grade, Gunning Fog, ARI and
+Coleman-Liau are all derived from the resulting counts.
+
+Tokenization follows textstat's English rules: punctuation other than
+contraction apostrophes is dropped, and fragments of two words or fewer
+("Fig. 3.") do not count as sentences. Syllables come from pyphen's
+hyphenation patterns (a vowel-group heuristic without pyphen) and are
+cached per word; the source is part of the score store version, so every
+host stores the same scores under a key. Nothing here is configured at
+runtime, so the functions are safe to call from any thread or worker
+process.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict
+
+try:
+    import pyphen
+    PYPHEN_AVAILABLE = True
+except ImportError:
+    pyphen = None
+    PYPHEN_AVAILABLE = False
+
+# Where syllable counts come from (part of the score store key)
+SYLLABLE_SOURCE = f"pyphen-{getattr(pyphen, '__version__', 'unknown')}" if PYPHEN_AVAILABLE else "heuristic"
+
+# Bump when tokenization or formulas change (part of the score store key)
+ENGINE_VERSION = "1"
+
+# Distinct words whose syllable counts are kept
+SYLLABLE_CACHE_SIZE = 65536
+
+# Words with at least this many syllables are complex (Gunning Fog)
+COMPLEX_WORD_SYLLABLES = 3
+
+# Fragments with at most this many words are not sentences
+MAX_IGNORED_FRAGMENT_WORDS = 2
+
+_SENTENCE_FRAGMENT = re.compile(r"\b[^.!?]+[.!?]*")
+_NONCONTRACTION_APOSTROPHE = re.compile(r"'(?![tsd]|ve|ll|re)")
+_PUNCTUATION = re.compile(r"[^\w\s']")
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+
+class TextCounts:
+    """Counts shared by all readability formulas."""
+
+    def __init__(self):
+        self.sentences = 0
+        self.words = 0
+        self.syllables = 0
+        self.complex_words = 0
+        # Letters exclude punctuation; characters include it (ARI)
+        self.letters = 0
+        self.characters = 0
+        # Whitespace-separated tokens, punctuation-only ones included (ARI)
+        self.tokens = 0
+
+
+@lru_cache(maxsize=None)
+def _hyphenator():
+    """pyphen hyphenator for US English, or None if pyphen is missing."""
+    if not PYPHEN_AVAILABLE:
+        return None
+    return pyphen.Pyphen(lang="en_US")
+
+
+def _heuristic_syllables(word: str) -> int:
+    groups = len(_VOWEL_GROUPS.findall(word))
+    if word.endswith("e") and not word.endswith("le") and groups > 1:
+        groups -= 1
+    return max(1, groups)
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def count_syllables(word: str) -> int:
+    """
+    Syllables in one lowercase word.
+
+    Args:
+        word: Lowercase word without surrounding punctuation
+
+    Returns:
+        Syllable count (at least 1 for non-empty words)
+    """
+    hyphenator = _hyphenator()
+    if hyphenator is not None:
+        return len(hyphenator.positions(word)) + 1
+    return _heuristic_syllables(word)
+
+
+def count_text(text: str) -> TextCounts:
+    """
+    Tokenize text once and count what the readability formulas need.
+
+    A dot inside a token ("3.5", "e.g.") ends a fragment, so it splits
+    the token as well.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        TextCounts for the text
+    """
+    counts = TextCounts()
+    fragments = 0
+    for match in _SENTENCE_FRAGMENT.finditer(text):
+        fragment = match.group()
+        tokens = fragment.split()
+        counts.tokens += len(tokens)
+        counts.characters += sum(len(token) for token in tokens)
+
+        words = _PUNCTUATION.sub("", _NONCONTRACTION_APOSTROPHE.sub("", fragment)).split()
+        fragments += 1
+        if len(words) > MAX_IGNORED_FRAGMENT_WORDS:
+            counts.sentences += 1
+        counts.words += len(words)
+        for word in words:
+            counts.letters += len(word) - word.count("'")
+            syllables = count_syllables(word.lower())
+            counts.syllables += syllables
+            if syllables >= COMPLEX_WORD_SYLLABLES:
+                counts.complex_words += 1
+
+    if fragments:
+        counts.sentences = max(1, counts.sentences)
+    return counts
+
+
+def scores_from_counts(counts: TextCounts) -> Dict[str, float]:
+    """
+    Readability scores from shared counts.
+
+    Args:
+        counts: Output of count_text
+
+    Returns:
+        Dict with flesch_reading_ease, flesch_kincaid_grade, gunning_fog,
+        automated_readability_index and coleman_liau_index (0.0 each for
+        text without words)
+    """
+    if counts.words == 0 or counts.sentences == 0:
+        return {
+            "flesch_reading_ease": 0.0,
+            "flesch_kincaid_grade": 0.0,
+            "gunning_fog": 0.0,
+            "automated_readability_index": 0.0,
+            "coleman_liau_index": 0.0,
+        }
+
+    words_per_sentence = counts.words / counts.sentences
+    syllables_per_word = counts.syllables / counts.words
+    letters_per_100 = 100 * counts.letters / counts.words
+    sentences_per_100 = 100 * counts.sentences / counts.words
+    complex_percent = 100 * counts.complex_words / counts.words
+    characters_per_token = counts.characters / counts.tokens
+
+    return {
+        "flesch_reading_ease": 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word,
+        "flesch_kincaid_grade": 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59,
+        "gunning_fog": 0.4 * (words_per_sentence + complex_percent),
+        "automated_readability_index": 4.71 * characters_per_token + 0.5 * words_per_sentence - 21.43,
+        "coleman_liau_index": 0.058 * letters_per_100 - 0.296 * sentences_per_100 - 15.8,
+    }
+
+
+def readability_scores(text: str) -> Dict[str, float]:
+    """
+    Compute all five readability scores of text in one pass.
+
+    Args:
+        text: Text to score
+
+    Returns:
+        Dict of scores (see scores_from_counts)
+    """
+    return scores_from_counts(count_text(text))
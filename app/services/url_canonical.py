@@ -0,0 +1,151 @@
+"""
+SGNL URL Canonicalization
+Maps the many spellings of one page's URL to a single key.
+
+Search providers return the same article with tracking parameters,
+fragments, "www." prefixes, trailing slashes and (on some sites) AMP
+variants. Every
+URL-keyed cache, batch de-duplication and fetch coalescing goes through
+canonicalize_url() so those variants share one entry and one fetch.
+
+The canonical URL is a key, not a replacement: pages are still fetched
+from the URL the caller gave.
+
+Per-domain rules come from URL_CANONICAL_RULES (JSON), for example:
+
+    {"news.ycombinator.com": {"keep_params": ["id"]},
+     "example.org": {"drop_params": ["session"], "keep_www": true},
+     "medium.com": {"drop_params": ["ref", "amp"]},
+     "theguardian.com": {"strip_amp": true}}
+
+Supported rule keys:
+- keep_params: only these query parameters are kept (case-insensitive)
+- drop_params: extra query parameters to remove (case-insensitive)
+- keep_www: do not strip a leading "www."
+- keep_trailing_slash: do not strip a trailing "/" from the path
+- strip_amp: map AMP copies ("amp." host prefix, "/amp" path suffix) to
+  the article; off by default because "amp" is a real name elsewhere
+  (amp.dev, /guides/amp)
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any, Dict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only track the click, never select content.
+# "ref" and "amp" select content on some sites (GitHub's ?ref= picks a
+# branch), so they are only dropped through per-domain drop_params.
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid",
+    "igshid", "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok",
+    "ref_src", "ref_url", "referrer", "spm", "cmpid", "ncid", "sr_share",
+})
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "oly_", "vero_")
+
+# Path suffixes that mark an AMP copy of an article (strip_amp rule)
+_AMP_PATH_SUFFIXES = ("/amp", "/amp.html")
+
+
+def _rules_for(host: str) -> Dict[str, Any]:
+    """Rules for a host, matching on the host or any parent domain."""
+    rules = config.URL_CANONICAL_RULES_MAP
+    if not rules:
+        return {}
+    parts = host.split(".")
+    for i in range(len(parts) - 1):
+        domain_rules = rules.get(".".join(parts[i:]))
+        if domain_rules is not None:
+            return domain_rules
+    return {}
+
+
+def _strip_host_prefix(host: str, prefix: str) -> str:
+    """Remove prefix from host unless that would leave a single label ("www.com")."""
+    if host.startswith(prefix) and "." in host[len(prefix):]:
+        return host[len(prefix):]
+    return host
+
+
+def _is_tracking_param(name: str, value: str) -> bool:
+    lowered = name.lower()
+    if lowered == "outputtype":
+        return value.lower() == "amp"
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+@lru_cache(maxsize=4096)
+def _canonicalize(url: str, rules_json: str) -> str:
+    # rules_json is only part of the memoization key, so new rules take effect
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower().rstrip(".")
+    rules = _rules_for(host)
+
+    # Host: AMP and www. prefixes, default ports
+    if rules.get("strip_amp"):
+        host = _strip_host_prefix(host, "amp.")
+    if not rules.get("keep_www"):
+        host = _strip_host_prefix(host, "www.")
+    netloc = host
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+
+    # Path: AMP suffixes and trailing slashes
+    path = parts.path or "/"
+    if rules.get("strip_amp"):
+        trimmed = path.rstrip("/")
+        for suffix in _AMP_PATH_SUFFIXES:
+            if trimmed.lower().endswith(suffix):
+                path = trimmed[: -len(suffix)] or "/"
+                break
+    if len(path) > 1 and path.endswith("/") and not rules.get("keep_trailing_slash"):
+        path = path.rstrip("/") or "/"
+
+    # Query: drop tracking parameters, sort the rest
+    keep = rules.get("keep_params")
+    if keep is not None:
+        keep = {name.lower() for name in keep}
+    drop = {name.lower() for name in rules.get("drop_params", ())}
+    params = []
+    for name, value in parse_qsl(parts.query, keep_blank_values=True):
+        if keep is not None:
+            if name.lower() in keep:
+                params.append((name, value))
+        elif not _is_tracking_param(name, value) and name.lower() not in drop:
+            params.append((name, value))
+    params.sort()
+    query = urlencode(params)
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonicalize a URL for use as a cache or de-duplication key.
+
+    Lowercases the scheme and host, drops default ports, the fragment, a
+    "www." host prefix, trailing slashes and tracking query parameters
+    (utm_*, fbclid, gclid, ...), and sorts the remaining query parameters.
+    Per-domain rules can keep parameters or prefixes that matter for a
+    site, or map its AMP copies to the article.
+
+    Args:
+        url: URL as returned by a search provider or given by a client
+
+    Returns:
+        Canonical URL string (falls back to the stripped input if it
+        cannot be parsed)
+    """
+    try:
+        return _canonicalize(url, config.URL_CANONICAL_RULES)
+    except ValueError as e:
+        logger.debug(f"[URL] Could not canonicalize {url!r}: {e}")
+        return url.strip()
+
@@ -1,10 +1,30 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+import cache.page_cache as page_cache_module
+import cache.score_store as score_store_module
 import httpx
 from unittest.mock import AsyncMock, MagicMock
 
 
+@pytest.fixture(autouse=True)
+def isolated_page_cache(tmp_path, monkeypatch):
+    """Give every test its own empty on-disk page cache."""
+    page_cache = page_cache_module.PageCache(str(tmp_path / "pages.db"), max_bytes=10_000_000)
+    monkeypatch.setattr(page_cache_module, "_page_cache", page_cache)
+    yield page_cache
+    page_cache.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_score_store(tmp_path, monkeypatch):
+    """Give every test its own empty persistent score store."""
+    store = score_store_module.ScoreStore(str(tmp_path / "scores.db"), max_bytes=10_000_000)
+    monkeypatch.setattr(score_store_module, "_score_store", store)
+    yield store
+    store.close()
+
+
 @pytest.fixture
 def client():
     """FastAPI test client."""
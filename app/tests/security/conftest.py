@@ -392,3 +392,16 @@ def secure_test_env(monkeypatch):
     yield
 
     # Cleanup is handled automatically by monkeypatch
+
+
+# =============================================================================
+# DNS Cache Fixtures
+# =============================================================================
+
+@pytest.fixture(autouse=True)
+def clear_dns_cache():
+    """Start every test with an empty resolver cache so DNS mocks take effect."""
+    from app.security.url_validator import _dns_cache
+    _dns_cache.clear()
+    yield
+    _dns_cache.clear()
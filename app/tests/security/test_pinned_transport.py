@@ -0,0 +1,116 @@
+"""
+Tests for the pinned-IP transport.
+
+Covers connect-time pinning to validated addresses, trusted upstream
+hosts, and redirect validation through the response hook.
+"""
+
+import httpcore
+import httpx
+import pytest
+
+from app.security.pinned_transport import PinnedIPTransport, PinnedNetworkBackend
+from app.security.url_validator import _dns_cache
+
+
+class RecordingBackend(httpcore.AsyncMockBackend):
+    """Mock backend that records which address each connection targets."""
+
+    def __init__(self, buffer):
+        super().__init__(buffer)
+        self.connected_hosts = []
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.connected_hosts.append(host)
+        return await super().connect_tcp(host, port, timeout, local_address, socket_options)
+
+
+OK_RESPONSE = [
+    b"HTTP/1.1 200 OK\r\n",
+    b"Content-Type: text/html\r\n",
+    b"Content-Length: 2\r\n",
+    b"\r\n",
+    b"ok",
+]
+
+
+class TestPinnedNetworkBackend:
+    """Tests for address pinning at connect time."""
+
+    @pytest.mark.asyncio
+    async def test_resolves_through_shared_cache(self):
+        """Test the validated address from the DNS cache is used."""
+        _dns_cache.set('example.com', '93.184.216.34', None)
+        backend = PinnedNetworkBackend()
+        assert await backend.resolve('example.com') == '93.184.216.34'
+
+    @pytest.mark.asyncio
+    async def test_private_resolution_rejected(self):
+        """Test a host resolving to a private IP cannot be connected to."""
+        _dns_cache.set('rebind.example.com', '127.0.0.1', None)
+        backend = PinnedNetworkBackend()
+        with pytest.raises(httpcore.ConnectError):
+            await backend.resolve('rebind.example.com')
+
+    @pytest.mark.asyncio
+    async def test_private_ip_literal_rejected(self):
+        """Test direct connections to private IP literals are rejected."""
+        backend = PinnedNetworkBackend()
+        with pytest.raises(httpcore.ConnectError):
+            await backend.resolve('10.0.0.1')
+
+    @pytest.mark.asyncio
+    async def test_trusted_host_not_pinned(self):
+        """Test trusted upstream hosts are passed through unchanged."""
+        _dns_cache.set('n8n.internal', '10.0.0.7', None)
+        backend = PinnedNetworkBackend(trusted_hosts={'N8N.internal'})
+        assert await backend.resolve('n8n.internal') == 'n8n.internal'
+
+    @pytest.mark.asyncio
+    async def test_connect_uses_pinned_address(self):
+        """Test the socket is opened to the IP while the request keeps its hostname."""
+        _dns_cache.set('example.com', '93.184.216.34', None)
+        recorder = RecordingBackend(OK_RESPONSE)
+        transport = PinnedIPTransport()
+        transport.network_backend._backend = recorder
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get('http://example.com/page')
+
+        assert response.status_code == 200
+        assert response.text == 'ok'
+        assert response.request.headers['host'] == 'example.com'
+        assert recorder.connected_hosts == ['93.184.216.34']
+
+
+class TestRedirectValidation:
+    """Tests for the redirect response hook."""
+
+    @pytest.mark.asyncio
+    async def test_redirect_to_private_ip_blocked(self):
+        """Test a redirect to a private address raises before it is followed."""
+        transport = PinnedIPTransport()
+        request = httpx.Request('GET', 'https://example.com/start')
+        response = httpx.Response(302, headers={'location': 'http://169.254.169.254/latest/'}, request=request)
+
+        with pytest.raises(httpx.RequestError):
+            await transport.validate_redirect(response)
+
+    @pytest.mark.asyncio
+    async def test_relative_redirect_allowed(self):
+        """Test a relative redirect on a public host is allowed."""
+        _dns_cache.set('example.com', '93.184.216.34', None)
+        transport = PinnedIPTransport()
+        request = httpx.Request('GET', 'https://example.com/start')
+        response = httpx.Response(301, headers={'location': 'next'}, request=request)
+
+        await transport.validate_redirect(response)
+
+    @pytest.mark.asyncio
+    async def test_non_redirect_ignored(self):
+        """Test ordinary responses pass through the hook untouched."""
+        transport = PinnedIPTransport()
+        request = httpx.Request('GET', 'https://example.com/start')
+        response = httpx.Response(200, request=request)
+
+        await transport.validate_redirect(response)
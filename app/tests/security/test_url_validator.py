@@ -12,8 +12,11 @@ from unittest.mock import patch
 
 from app.security.url_validator import (
     validate_url,
+    validate_url_async,
     validate_redirect_url,
     SSRFValidator,
+    DNSCache,
+    _dns_cache,
     _is_private_ip,
     _resolve_hostname,
     _is_blocked_host,
@@ -454,6 +457,85 @@ class TestSSRFValidator:
         assert 'private' in error.lower()
 
 
+class TestDNSCache:
+    """Tests for the shared DNS cache and the async resolver path."""
+
+    def test_positive_and_negative_entries(self):
+        """Test both answers and failures are cached."""
+        cache = DNSCache()
+        cache.set('example.com', '93.184.216.34', None)
+        cache.set('nonexistent.invalid', None, 'DNS resolution failed')
+        assert cache.get('EXAMPLE.com') == ('93.184.216.34', None)
+        assert cache.get('nonexistent.invalid') == (None, 'DNS resolution failed')
+        assert cache.get('other.com') is None
+
+    def test_entries_expire(self):
+        """Test entries are dropped after their TTL."""
+        cache = DNSCache(ttl_seconds=0, negative_ttl_seconds=0)
+        cache.set('example.com', '93.184.216.34', None)
+        assert cache.get('example.com') is None
+
+    def test_lru_bound(self):
+        """Test the cache never holds more than max_entries hosts."""
+        cache = DNSCache(max_entries=2)
+        cache.set('a.com', '93.184.216.1', None)
+        cache.set('b.com', '93.184.216.2', None)
+        cache.get('a.com')
+        cache.set('c.com', '93.184.216.3', None)
+        assert len(cache) == 2
+        assert cache.get('b.com') is None
+        assert cache.get('a.com') is not None
+
+    @patch('app.security.url_validator._resolve_hostname')
+    def test_validate_url_resolves_once(self, mock_resolve):
+        """Test repeated validation of a host hits the resolver once."""
+        mock_resolve.return_value = ('93.184.216.34', None)
+        assert validate_url('https://example.com/a')[0] is True
+        assert validate_url('https://example.com/b')[0] is True
+        assert SSRFValidator().validate('https://example.com/c')[0] is True
+        assert mock_resolve.call_count == 1
+
+    @patch('app.security.url_validator._resolve_hostname')
+    def test_validate_url_caches_failures(self, mock_resolve):
+        """Test failed lookups are served from the negative cache."""
+        mock_resolve.return_value = (None, "DNS resolution failed")
+        assert validate_url('https://nonexistent.example.com/')[0] is False
+        assert validate_url('https://nonexistent.example.com/')[0] is False
+        assert mock_resolve.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_validate_url_async_uses_loop_resolver(self):
+        """Test the async path resolves through the event loop, not socket.getaddrinfo."""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        answer = [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', ('93.184.216.34', 0))]
+        with patch.object(loop, 'getaddrinfo', return_value=answer) as mock_loop_resolve, \
+             patch('socket.getaddrinfo') as mock_blocking_resolve:
+            is_valid, error = await validate_url_async('https://example.com/')
+        assert is_valid is True
+        assert error == ''
+        mock_loop_resolve.assert_called_once()
+        mock_blocking_resolve.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_validate_url_async_blocks_private_resolution(self):
+        """Test the async path still rejects hosts resolving to private IPs."""
+        _dns_cache.set('internal.example.com', '10.0.0.5', None)
+        is_valid, error = await validate_url_async('http://internal.example.com/')
+        assert is_valid is False
+        assert 'private' in error.lower()
+
+    @pytest.mark.asyncio
+    async def test_ssrf_validator_async_shares_cache(self):
+        """Test SSRFValidator.validate_async reads the shared cache."""
+        _dns_cache.set('example.com', '203.0.113.1', None)
+        import ipaddress
+        validator = SSRFValidator(custom_private_networks=[ipaddress.ip_network('203.0.113.0/24')])
+        is_valid, error = await validator.validate_async('http://example.com/')
+        assert is_valid is False
+        assert 'private' in error.lower()
+
+
 class TestEdgeCases:
     """Edge case tests."""
 
@@ -0,0 +1,182 @@
+"""Tests for the concurrent /analyze-results pipeline."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+import extractor
+import app.main as main_module
+from app.main import AnalyzeResultsRequest
+from services.analyzer import heuristic_analyzer
+
+
+class SlowClient:
+    """Fake HTTP client that tracks how many fetches run at once."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @asynccontextmanager
+    async def stream(self, method, url, *args, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(url, 0.05))
+            yield httpx.Response(
+                200,
+                headers={"content-type": "text/html; charset=utf-8"},
+                content=b"<html><body><p>page</p></body></html>",
+                request=httpx.Request(method, url),
+            )
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def analyze_env(monkeypatch):
+    """Patch the network and scoring stages used by /analyze-results."""
+    def fake_structure_score(html, query):
+        return {"score": 50, "reason": "stub", "adjustments": []}
+
+    def install(client, concurrency=2, timeout=5.0):
+        monkeypatch.setattr(extractor, "get_http_client", lambda: client)
+        monkeypatch.setattr(main_module, "validate_url_async", AsyncMock(return_value=(True, "")))
+        monkeypatch.setattr(extractor, "calculate_density", AsyncMock(return_value=0.6))
+        monkeypatch.setattr(
+            heuristic_analyzer, "calculate_structure_score", fake_structure_score
+        )
+        monkeypatch.setattr("trafilatura.extract", lambda *args, **kwargs: None)
+
+        original_get_env = main_module.get_env
+
+        def mock_get_env(key, default=None):
+            if key == "ANALYZE_CONCURRENCY":
+                return concurrency
+            if key == "ANALYZE_ITEM_TIMEOUT_SECONDS":
+                return timeout
+            return original_get_env(key, default)
+
+        monkeypatch.setattr(main_module, "get_env", mock_get_env)
+
+    return install
+
+
+class TestAnalyzeResultsConcurrency:
+    """Test bounded fan-out, per-item timeouts, and ordering."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_run_concurrently_within_cap(self, analyze_env):
+        """Fetches overlap but never exceed ANALYZE_CONCURRENCY."""
+        client = SlowClient({})
+        analyze_env(client, concurrency=3)
+
+        results = [{"url": f"https://example.com/{i}", "content": "snippet", "score": 0.5} for i in range(8)]
+        response = await main_module.analyze_results(AnalyzeResultsRequest(results=results, query="q"))
+
+        assert response["count"] == 8
+        assert client.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_slow_item_falls_back_after_timeout(self, analyze_env):
+        """A result that exceeds its budget gets the fallback score instead of blocking."""
+        client = SlowClient({"https://slow.example.com/": 5.0})
+        analyze_env(client, concurrency=2, timeout=0.2)
+
+        results = [
+            {"url": "https://slow.example.com/", "content": "snippet", "score": 0.9},
+            {"url": "https://fast.example.com/", "content": "snippet", "score": 0.1},
+        ]
+        response = await main_module.analyze_results(AnalyzeResultsRequest(results=results, query="q"))
+
+        by_url = {r["url"]: r for r in response["results"]}
+        assert by_url["https://slow.example.com/"]["heuristic_reason"] == "Could not analyze (timed out)"
+        assert by_url["https://fast.example.com/"]["heuristic_reason"] == "stub"
+
+    @pytest.mark.asyncio
+    async def test_results_sorted_by_final_score(self, analyze_env):
+        """Completion order does not affect the final_score ordering."""
+        client = SlowClient({"https://a.example.com/": 0.2, "https://b.example.com/": 0.01})
+        analyze_env(client, concurrency=5)
+
+        results = [
+            {"url": "https://b.example.com/", "content": "snippet", "score": 0.1},
+            {"url": "https://a.example.com/", "content": "snippet", "score": 0.9},
+            {"url": "https://c.example.com/", "content": "snippet", "score": 0.5},
+        ]
+        response = await main_module.analyze_results(AnalyzeResultsRequest(results=results, query="q"))
+
+        final_scores = [r["final_score"] for r in response["results"]]
+        assert final_scores == sorted(final_scores, reverse=True)
+        assert response["results"][0]["url"] == "https://a.example.com/"
+
+
+class TestAnalyzeResultsCascade:
+    """Test skipping extraction and density when the structure score decides."""
+
+    @pytest.fixture
+    def structure_score(self, analyze_env, monkeypatch):
+        analyze_env(SlowClient({}))
+        density = AsyncMock(return_value=0.6)
+        monkeypatch.setattr(extractor, "calculate_density", density)
+        monkeypatch.setattr(main_module.config, "SCORING_CASCADE_ENABLED", True)
+
+        def set_score(score):
+            monkeypatch.setattr(
+                heuristic_analyzer, "calculate_structure_score",
+                lambda html, query: {"score": score, "reason": "stub", "adjustments": []},
+            )
+            return density
+
+        return set_score
+
+    async def _analyze(self):
+        results = [{"url": "https://example.com/a", "content": "snippet", "score": 0.5}]
+        response = await main_module.analyze_results(AnalyzeResultsRequest(results=results, query="q"))
+        return response["results"][0]
+
+    @pytest.mark.asyncio
+    async def test_clear_junk_skips_density(self, structure_score):
+        """A very low structure score flags the result without scoring density."""
+        density = structure_score(10)
+        result = await self._analyze()
+
+        assert result["skipped_llm"] is True
+        assert result["density_score"] is None
+        assert result["skipped_stages"] == ["extraction", "cpidr"]
+        density.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_clear_quality_skips_density(self, structure_score):
+        """A very high structure score keeps the result for the LLM."""
+        density = structure_score(90)
+        result = await self._analyze()
+
+        assert result["skipped_llm"] is False
+        assert result["skipped_stages"] == ["extraction", "cpidr"]
+        density.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_undecided_runs_all_stages(self, structure_score):
+        """Scores between the bounds still get density scoring."""
+        density = structure_score(50)
+        result = await self._analyze()
+
+        assert result["density_score"] == 0.6
+        assert result["skipped_stages"] == []
+        density.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, structure_score, monkeypatch):
+        """Without SCORING_CASCADE_ENABLED every stage runs."""
+        monkeypatch.setattr(main_module.config, "SCORING_CASCADE_ENABLED", False)
+        density = structure_score(10)
+        result = await self._analyze()
+
+        assert result["density_score"] == 0.6
+        assert result["skipped_stages"] == []
+        density.assert_awaited_once()
@@ -1,6 +1,6 @@
 import pytest
 from app.services.analyzer import HeuristicAnalyzer
-from bs4 import BeautifulSoup
+from app.services.document import ParsedDocument
 from unittest.mock import patch
 
 
@@ -49,10 +49,10 @@ class TestHeuristicAnalyzer:
     def test_calculate_structure_score_parse_error(self):
         """Test structure score calculation with malformed HTML."""
         # Use a valid HTML string (≥100 chars) to pass length check
-        # Mock BeautifulSoup to raise an exception during parsing
+        # Mock ParsedDocument to raise an exception during parsing
         long_html = "<html><body>" + "This is longer content " * 20 + "</body></html>"
 
-        with patch('app.services.analyzer.BeautifulSoup', side_effect=Exception("Parse error")):
+        with patch('app.services.analyzer.ParsedDocument', side_effect=Exception("Parse error")):
             analyzer = HeuristicAnalyzer()
             result = analyzer.calculate_structure_score(long_html, "test")
 
@@ -62,8 +62,8 @@ class TestHeuristicAnalyzer:
     def test_analyze_code_density_with_code(self, sample_html):
         """Test code density analysis with HTML containing code."""
         analyzer = HeuristicAnalyzer()
-        soup = BeautifulSoup(sample_html, "lxml")
-        score, reason = analyzer._analyze_code_density(soup, "python tutorial")
+        doc = ParsedDocument(sample_html)
+        score, reason = analyzer._analyze_code_density(doc, "python tutorial")
 
         assert score > 0
         assert "code" in reason.lower()
@@ -72,8 +72,8 @@ class TestHeuristicAnalyzer:
         """Test code density analysis with HTML containing no code."""
         html_no_code = "<html><body><p>This is just plain text content.</p></body></html>"
         analyzer = HeuristicAnalyzer()
-        soup = BeautifulSoup(html_no_code, "lxml")
-        score, reason = analyzer._analyze_code_density(soup, "plain text")
+        doc = ParsedDocument(html_no_code)
+        score, reason = analyzer._analyze_code_density(doc, "plain text")
 
         assert score == 0
         assert reason == ""
@@ -81,8 +81,8 @@ class TestHeuristicAnalyzer:
     def test_analyze_data_density_with_tables(self, sample_html):
         """Test data density analysis with HTML containing tables."""
         analyzer = HeuristicAnalyzer()
-        soup = BeautifulSoup(sample_html, "lxml")
-        score, reason = analyzer._analyze_data_density(soup)
+        doc = ParsedDocument(sample_html)
+        score, reason = analyzer._analyze_data_density(doc)
 
         assert score > 0
         assert "table" in reason.lower()
@@ -91,8 +91,8 @@ class TestHeuristicAnalyzer:
         """Test data density analysis with HTML containing no tables."""
         html_no_tables = "<html><body><p>No tables here.</p></body></html>"
         analyzer = HeuristicAnalyzer()
-        soup = BeautifulSoup(html_no_tables, "lxml")
-        score, reason = analyzer._analyze_data_density(soup)
+        doc = ParsedDocument(html_no_tables)
+        score, reason = analyzer._analyze_data_density(doc)
 
         assert score == 0
         assert reason == ""
@@ -104,8 +104,8 @@ class TestHeuristicAnalyzer:
         bloated_div = '<div class="container wrapper main" id="div1" data-test="value" style="display:block"><span class="label" data-attr="val"><em class="italic" style="color:red"><strong class="bold"><a href="#" class="link" id="link1" data-track="yes" target="_blank" rel="nofollow">click</a></strong></em></span></div>'
         bloated_html = bloated_div * 50
         analyzer = HeuristicAnalyzer()
-        soup = BeautifulSoup(bloated_html, "lxml")
-        score, reason = analyzer._detect_slop(bloated_html, soup)
+        doc = ParsedDocument(bloated_html)
+        score, reason = analyzer._detect_slop(doc)
 
         assert score < 0
         assert "bloated" in reason.lower() or "ratio" in reason.lower()
@@ -115,8 +115,8 @@ class TestHeuristicAnalyzer:
         # Long text with minimal markup should get positive score
         clean_html = "<html><body><p>" + "This is clean text content. " * 20 + "</p></body></html>"
         analyzer = HeuristicAnalyzer()
-        soup = BeautifulSoup(clean_html, "lxml")
-        score, reason = analyzer._detect_slop(clean_html, soup)
+        doc = ParsedDocument(clean_html)
+        score, reason = analyzer._detect_slop(doc)
 
         assert score >= 0
 
@@ -124,8 +124,8 @@ class TestHeuristicAnalyzer:
         """Test slop detection with HTML containing no readable text."""
         no_text_html = "<html><body>" + "<img src='test.jpg'>" * 10 + "<script>alert('test');</script></body></html>"
         analyzer = HeuristicAnalyzer()
-        soup = BeautifulSoup(no_text_html, "lxml")
-        score, reason = analyzer._detect_slop(no_text_html, soup)
+        doc = ParsedDocument(no_text_html)
+        score, reason = analyzer._detect_slop(doc)
 
         assert score < 0
         assert "readable text" in reason.lower()
@@ -140,8 +140,8 @@ class TestHeuristicAnalyzer:
         </body></html>
         """
         analyzer = HeuristicAnalyzer()
-        soup = BeautifulSoup(html_with_affiliates, "lxml")
-        score, reason = analyzer._detect_affiliates(soup)
+        doc = ParsedDocument(html_with_affiliates)
+        score, reason = analyzer._detect_affiliates(doc)
 
         assert score < 0
         assert "affiliate" in reason.lower()
@@ -149,8 +149,8 @@ class TestHeuristicAnalyzer:
     def test_detect_affiliates_no_affiliate_links(self, sample_html):
         """Test affiliate detection with no affiliate links."""
         analyzer = HeuristicAnalyzer()
-        soup = BeautifulSoup(sample_html, "lxml")
-        score, reason = analyzer._detect_affiliates(soup)
+        doc = ParsedDocument(sample_html)
+        score, reason = analyzer._detect_affiliates(doc)
 
         assert score == 0
         assert reason == ""
@@ -159,8 +159,8 @@ class TestHeuristicAnalyzer:
         """Test hype detection with clickbait title."""
         html_hype = "<html><head><title>You won't believe this shocking secret!</title></head><body></body></html>"
         analyzer = HeuristicAnalyzer()
-        soup = BeautifulSoup(html_hype, "lxml")
-        score, reason = analyzer._detect_hype(soup)
+        doc = ParsedDocument(html_hype)
+        score, reason = analyzer._detect_hype(doc)
 
         assert score < 0
         assert "clickbait" in reason.lower() or "hype" in reason.lower()
@@ -169,8 +169,8 @@ class TestHeuristicAnalyzer:
         """Test hype detection with clickbait H1."""
         html_hype = "<html><body><h1>Mind-blowing revolutionary breakthrough!</h1></body></html>"
         analyzer = HeuristicAnalyzer()
-        soup = BeautifulSoup(html_hype, "lxml")
-        score, reason = analyzer._detect_hype(soup)
+        doc = ParsedDocument(html_hype)
+        score, reason = analyzer._detect_hype(doc)
 
         assert score < 0
         assert "headline" in reason.lower() or "hype" in reason.lower()
@@ -178,8 +178,8 @@ class TestHeuristicAnalyzer:
     def test_detect_hype_no_hype(self, sample_html):
         """Test hype detection with normal title."""
         analyzer = HeuristicAnalyzer()
-        soup = BeautifulSoup(sample_html, "lxml")
-        score, reason = analyzer._detect_hype(soup)
+        doc = ParsedDocument(sample_html)
+        score, reason = analyzer._detect_hype(doc)
 
         assert score == 0
         assert reason == ""
@@ -1,9 +1,14 @@
 """Tests for cache module (TTLCache, HybridCache, RedisCache)."""
 
+import asyncio
+import json
 import pytest
 import time
 from unittest.mock import AsyncMock, MagicMock, patch
 from app.cache import TTLCache, HybridCache
+from app.cache.keys import make_cache_key, normalize_topic
+from app.cache import codec as codec_module
+from app.cache.codec import Codec, CodecError
 from app.cache.redis_cache import RedisCache
 
 
@@ -164,6 +169,159 @@ class TestTTLCache:
 
         assert len(errors) == 0
 
+    def test_byte_budget_evicts_lru(self):
+        """Entries are evicted once their approximate size exceeds max_bytes."""
+        cache = TTLCache(max_size=100, max_bytes=20_000, shards=1)
+        big = {"results": ["x" * 1000 for _ in range(5)]}
+
+        for i in range(10):
+            cache.set("prefix", f"topic{i}", 10, big, 300)
+
+        stats = cache.get_stats()
+        assert stats["bytes"] <= 20_000
+        assert stats["evictions"] > 0
+        assert cache.get("prefix", "topic0", 10) is None
+        assert cache.get("prefix", "topic9", 10) == big
+
+    def test_oversized_value_rejected(self):
+        """A value larger than the whole budget is not cached."""
+        cache = TTLCache(max_size=100, max_bytes=1_000, shards=1)
+        cache.set("prefix", "small", 10, "v", 300)
+        cache.set("prefix", "huge", 10, "x" * 5_000, 300)
+
+        assert cache.get("prefix", "huge", 10) is None
+        assert cache.get("prefix", "small", 10) == "v"
+        assert cache.get_stats()["rejected"] == 1
+
+    @pytest.mark.parametrize("policy", ["lru", "tinylfu"])
+    def test_oversized_value_drops_previous_value(self, policy):
+        """A rejected overwrite removes the older value instead of keeping it."""
+        cache = TTLCache(max_size=100, max_bytes=1_000, shards=1, policy=policy)
+        cache.set("prefix", "topic", 1, "small", 60)
+        cache.set("prefix", "topic", 1, "x" * 5_000, 60)
+
+        assert cache.get("prefix", "topic", 1) is None
+        assert cache.get_stats()["bytes"] == 0
+
+    def test_sharded_cache_respects_limits(self):
+        """Sharded caches spread keys and stay within max_size."""
+        cache = TTLCache(max_size=512, max_bytes=0, shards=8)
+        for i in range(1000):
+            cache.set("prefix", f"topic{i}", 10, i, 300)
+
+        stats = cache.get_stats()
+        assert stats["shards"] == 8
+        assert stats["total_entries"] <= 512
+        assert stats["evictions"] == 1000 - stats["total_entries"]
+        assert cache.get("prefix", "topic999", 10) == 999
+        assert len(cache.cache) == stats["total_entries"]
+
+    def test_small_caches_use_one_shard(self):
+        """Small caches keep exact LRU order in a single shard."""
+        assert TTLCache(max_size=100, shards=8).get_stats()["shards"] == 1
+
+    def test_overwritten_key_keeps_new_expiry(self):
+        """An old heap item for a re-set key does not expire the new value."""
+        cache = TTLCache(max_size=10)
+        cache.set("prefix", "topic", 10, "old", 1)
+        cache.set("prefix", "topic", 10, "new", 300)
+
+        time.sleep(1.2)
+
+        assert cache.get("prefix", "topic", 10) == "new"
+        assert cache.get_stats()["expirations"] == 0
+
+    def test_counters(self):
+        """Hits, misses and expirations are counted."""
+        cache = TTLCache(max_size=10)
+        cache.set("prefix", "a", 10, 1, 300)
+        cache.set("prefix", "b", 10, 2, 1)
+        cache.get("prefix", "a", 10)
+        cache.get("prefix", "missing", 10)
+
+        time.sleep(1.2)
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["expirations"] == 1
+        assert stats["total_entries"] == 1
+
+
+
+class TestTinyLFUPolicy:
+    """Test the W-TinyLFU admission policy and per-prefix regions."""
+
+    @staticmethod
+    def _hit_rate(policy):
+        import random
+
+        rnd = random.Random(7)
+        cache = TTLCache(max_size=200, max_bytes=0, shards=1, policy=policy, regions={})
+        topics = rnd.choices(range(2000), weights=[1 / (i + 1) for i in range(2000)], k=20000)
+        hits = 0
+        for i, topic in enumerate(topics):
+            # Popular topics interleaved with one-off keys
+            for key in (f"topic{topic}", f"once{i}"):
+                if cache.get("prefix", key, 10) is not None:
+                    hits += 1
+                else:
+                    cache.set("prefix", key, 10, key, 3600)
+        return hits / (2 * len(topics))
+
+    def test_higher_hit_rate_on_skewed_workload(self):
+        """TinyLFU keeps popular entries that one-off keys flush out of an LRU."""
+        assert self._hit_rate("tinylfu") > self._hit_rate("lru") + 0.05
+
+    def test_popular_entry_survives_scan(self):
+        """A frequently read entry is not evicted by a stream of new keys."""
+        cache = TTLCache(max_size=100, max_bytes=0, shards=1, policy="tinylfu", regions={})
+        cache.set("prefix", "popular", 10, "value", 300)
+        for _ in range(5):
+            assert cache.get("prefix", "popular", 10) == "value"
+
+        for i in range(500):
+            cache.get("prefix", f"once{i}", 10)
+            cache.set("prefix", f"once{i}", 10, i, 300)
+
+        assert cache.get("prefix", "popular", 10) == "value"
+        stats = cache.get_stats()
+        assert stats["total_entries"] <= 100
+        assert stats["admission_rejected"] > 0
+
+    def test_regions_isolate_prefixes(self):
+        """Entries of a prefix with its own region cannot evict other prefixes."""
+        cache = TTLCache(max_size=100, max_bytes=0, shards=1, regions={"cpidr": 0.2})
+        for i in range(50):
+            cache.set("scan-topic:swr", f"topic{i}", 0, i, 300)
+        for i in range(500):
+            cache.set("cpidr", f"hash{i}", 0, i, 300)
+
+        assert all(cache.get("scan-topic:swr", f"topic{i}", 0) == i for i in range(50))
+        assert cache.get_stats()["regions"] == {"cpidr": 20, "default": 50}
+
+    def test_unknown_policy_rejected(self):
+        """Misconfigured policies fail fast."""
+        with pytest.raises(ValueError):
+            TTLCache(policy="fifo")
+
+    def test_frequency_sketch(self):
+        """The sketch ranks often-seen keys above rare ones and ages counts."""
+        from app.cache.policies import FrequencySketch
+
+        sketch = FrequencySketch(1024)
+        for _ in range(10):
+            sketch.increment("hot")
+        sketch.increment("cold")
+
+        assert sketch.frequency("hot") > sketch.frequency("cold") >= 1
+        assert sketch.frequency("never") == 0
+
+        before = sketch.frequency("hot")
+        for i in range(sketch.sample_size):
+            sketch.increment(f"k{i}")
+        assert sketch.frequency("hot") < before
+
 
 class TestHybridCache:
     """Test HybridCache class methods with Redis fallback behavior."""
@@ -330,6 +488,453 @@ class TestHybridCache:
             assert cache.get("prefix", "topic", 10) is None
 
 
+class TestHybridCacheTwoTier:
+    """Test async read-through from Redis (L2) into memory (L1)."""
+
+    @staticmethod
+    def _cache_with_redis(**redis_methods):
+        cache = HybridCache(max_size=100)
+        redis_mock = MagicMock()
+        redis_mock.ping = AsyncMock(return_value=True)
+        for name, method in redis_methods.items():
+            setattr(redis_mock, name, method)
+        cache._redis_cache = redis_mock
+        return cache, redis_mock
+
+    @pytest.mark.asyncio
+    async def test_aget_promotes_redis_hit_into_memory(self):
+        """A Redis hit is returned and copied into memory with its remaining TTL."""
+        cache, redis_mock = self._cache_with_redis(
+            get_with_ttl=AsyncMock(return_value=({"results": [1]}, 120))
+        )
+
+        assert await cache.aget("prefix", "topic", 10) == {"results": [1]}
+        assert cache._memory_cache.get("prefix", "topic", 10) == {"results": [1]}
+
+        # Served from memory the second time
+        assert await cache.aget("prefix", "topic", 10) == {"results": [1]}
+        redis_mock.get_with_ttl.assert_awaited_once()
+        assert cache.l2_hits == 1
+        assert cache.l1_hits == 1
+
+        key = cache._memory_cache._generate_key("prefix", "topic", 10)
+        remaining = cache._memory_cache.cache[key].expiry - time.time()
+        assert 110 < remaining <= 120
+
+    @pytest.mark.asyncio
+    async def test_aget_miss_in_both_tiers(self):
+        """A key missing from memory and Redis returns None."""
+        cache, _ = self._cache_with_redis(get_with_ttl=AsyncMock(return_value=(None, -2)))
+
+        assert await cache.aget("prefix", "topic", 10) is None
+        assert cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_aget_redis_failure_backs_off(self):
+        """A Redis error falls back to memory and pauses reconnect attempts."""
+        cache, redis_mock = self._cache_with_redis(
+            get_with_ttl=AsyncMock(side_effect=Exception("connection reset"))
+        )
+
+        assert await cache.aget("prefix", "topic", 10) is None
+        assert cache.is_redis_available() is False
+
+        assert await cache.aget("prefix", "topic", 10) is None
+        redis_mock.ping.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_aset_writes_both_tiers(self):
+        """aset stores in memory and awaits the Redis write."""
+        cache, redis_mock = self._cache_with_redis(set=AsyncMock(return_value=True))
+
+        await cache.aset("prefix", "topic", 10, "value", 300)
+
+        assert cache.get("prefix", "topic", 10) == "value"
+        redis_mock.set.assert_awaited_once_with(
+            cache._generate_key("prefix", "topic", 10), "value", ttl=300
+        )
+
+    @pytest.mark.asyncio
+    async def test_aset_without_redis(self):
+        """aset works from memory when Redis is not configured."""
+        cache = HybridCache(max_size=100)
+        cache._redis_cache = None
+
+        await cache.aset("prefix", "topic", 10, "value", 300)
+        assert await cache.aget("prefix", "topic", 10) == "value"
+
+    @pytest.mark.asyncio
+    async def test_aclear_clears_both_tiers(self):
+        """aclear flushes Redis and memory."""
+        cache, redis_mock = self._cache_with_redis(clear=AsyncMock(return_value=True))
+        cache.set("prefix", "topic", 10, "value", 300)
+
+        await cache.aclear()
+
+        redis_mock.clear.assert_awaited_once()
+        assert len(cache._memory_cache.cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_aget_stats_includes_redis(self):
+        """aget_stats awaits Redis statistics instead of blocking on them."""
+        cache, _ = self._cache_with_redis(get_stats=AsyncMock(return_value={"total_entries": 7}))
+
+        stats = await cache.aget_stats()
+
+        assert stats["redis_available"] is True
+        assert stats["redis"] == {"total_entries": 7}
+        assert stats["memory"]["max_size"] == 100
+
+
+class TestHybridCacheStaleWhileRevalidate:
+    """Test stampede protection in aget_or_refresh."""
+
+    @staticmethod
+    def _memory_only_cache():
+        cache = HybridCache(max_size=100)
+        cache._redis_cache = None
+        return cache
+
+    @staticmethod
+    def _counting_loader(values, delay=0.05, fail=False):
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(delay)
+            if fail:
+                raise RuntimeError("upstream down")
+            return values[min(len(calls), len(values)) - 1]
+
+        return loader, calls
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Concurrent callers on a cold key run the loader once."""
+        cache = self._memory_only_cache()
+        loader, calls = self._counting_loader(["v1"])
+
+        results = await asyncio.gather(*(
+            cache.aget_or_refresh("scan-topic", "topic", 5, loader, ttl_seconds=60)
+            for _ in range(10)
+        ))
+
+        assert results == ["v1"] * 10
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_fresh_value_served_without_loading(self):
+        """A fresh entry is returned without calling the loader."""
+        cache = self._memory_only_cache()
+        loader, calls = self._counting_loader(["v1", "v2"])
+
+        await cache.aget_or_refresh("scan-topic", "topic", 5, loader, ttl_seconds=60)
+        assert await cache.aget_or_refresh("scan-topic", "topic", 5, loader, ttl_seconds=60) == "v1"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self):
+        """An expired entry is served immediately and refreshed once in the background."""
+        cache = self._memory_only_cache()
+        loader, calls = self._counting_loader(["v1", "v2"])
+
+        await cache.aget_or_refresh("scan-topic", "topic", 5, loader, ttl_seconds=0, stale_seconds=60)
+
+        results = await asyncio.gather(*(
+            cache.aget_or_refresh("scan-topic", "topic", 5, loader, ttl_seconds=60, stale_seconds=60)
+            for _ in range(5)
+        ))
+        assert results == ["v1"] * 5
+        assert cache.stale_served == 5
+
+        await asyncio.sleep(0.1)
+        assert len(calls) == 2
+        assert await cache.aget_or_refresh("scan-topic", "topic", 5, loader, ttl_seconds=60) == "v2"
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_value(self):
+        """A failing background refresh leaves the stale value in place."""
+        cache = self._memory_only_cache()
+        good_loader, _ = self._counting_loader(["v1"], delay=0)
+        await cache.aget_or_refresh("scan-topic", "topic", 5, good_loader, ttl_seconds=0, stale_seconds=60)
+
+        bad_loader, calls = self._counting_loader([None], delay=0, fail=True)
+        assert await cache.aget_or_refresh("scan-topic", "topic", 5, bad_loader, ttl_seconds=60) == "v1"
+        await asyncio.sleep(0.01)
+
+        assert len(calls) == 1
+        assert await cache.aget_or_refresh("scan-topic", "topic", 5, bad_loader, ttl_seconds=60) == "v1"
+
+    @pytest.mark.asyncio
+    async def test_loader_error_raised_on_miss(self):
+        """With nothing cached, every waiting caller gets the loader's error."""
+        cache = self._memory_only_cache()
+        loader, calls = self._counting_loader([None], fail=True)
+
+        results = await asyncio.gather(*(
+            cache.aget_or_refresh("scan-topic", "topic", 5, loader, ttl_seconds=60)
+            for _ in range(3)
+        ), return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert len(calls) == 1
+
+
+class SharedRedisStub:
+    """In-process stand-in for the Redis lease/value API shared by several workers."""
+
+    def __init__(self):
+        self.values = {}
+        self.leases = {}
+        self.written = {}
+        self.fence = 0
+        self.released = None
+
+    async def ping(self):
+        return True
+
+    async def get_with_ttl(self, key):
+        return self.values.get(key), 60
+
+    async def set(self, key, value, ttl=None):
+        self.values[key] = value
+        return True
+
+    async def get_many_with_ttl(self, keys):
+        self.bulk_reads = getattr(self, "bulk_reads", 0) + 1
+        return [(self.values.get(key), 60) for key in keys]
+
+    async def set_many(self, items, ttl):
+        self.values.update(items)
+
+    async def acquire_lease(self, name, ttl_seconds):
+        self.fence += 1
+        if name in self.leases:
+            return None
+        self.leases[name] = self.fence
+        self.released = asyncio.Event()
+        return self.fence
+
+    async def release_lease(self, name, fence):
+        if self.leases.get(name) != fence:
+            return False
+        del self.leases[name]
+        self.released.set()
+        return True
+
+    async def wait_for_lease(self, name, timeout, poll_interval=1.0):
+        if name not in self.leases:
+            return True
+        try:
+            await asyncio.wait_for(self.released.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def set_fenced(self, key, value, ttl, lease_name, fence):
+        if self.written.get(lease_name, 0) > fence:
+            return False
+        self.written[lease_name] = fence
+        self.values[key] = value
+        return True
+
+
+class TestTopicNormalization:
+    """Test canonicalization of topics in cache keys."""
+
+    def test_near_identical_topics_share_key(self):
+        """Case, width, spacing and trailing punctuation do not change the key."""
+        base = make_cache_key("fast-search", "Rust async runtime", 10)
+        for variant in ("rust  async runtime?", "  RUST async runtime.", "Ｒｕｓｔ async runtime", "\"rust async runtime\""):
+            assert make_cache_key("fast-search", variant, 10) == base
+
+    def test_technical_terms_preserved(self):
+        """Symbols that are part of a term are kept."""
+        assert normalize_topic("C++ vs C#?") == "c++ vs c#"
+        assert normalize_topic(".NET and Node.js") == ".net and node.js"
+        assert normalize_topic("C++") != normalize_topic("C")
+
+    def test_optional_stopwords_and_ordering(self):
+        """Stopword removal and term sorting are opt-in."""
+        assert normalize_topic("how to use Rust") == "how to use rust"
+        assert normalize_topic("how to use Rust", drop_stopwords=True) == "use rust"
+        assert normalize_topic("async rust", sort_terms=True) == normalize_topic("rust async", sort_terms=True)
+        assert normalize_topic("async rust") != normalize_topic("rust async")
+
+
+class TestHybridCacheResultSubsumption:
+    """Test answering smaller max_results requests from a larger cached entry."""
+
+    @staticmethod
+    def _memory_only_cache():
+        cache = HybridCache(max_size=100)
+        cache._redis_cache = None
+        return cache
+
+    @staticmethod
+    def _slice(value, n):
+        return {"results": value["results"][:n]}
+
+    def _loader_for(self, n, calls):
+        async def loader():
+            calls.append(n)
+            return {"results": list(range(n))}
+        return loader
+
+    @pytest.mark.asyncio
+    async def test_smaller_request_sliced_from_larger(self):
+        """A cached 10-result entry answers a request for 5."""
+        cache = self._memory_only_cache()
+        calls = []
+
+        await cache.aget_or_refresh("fast-search", "rust", 10, self._loader_for(10, calls),
+                                    ttl_seconds=60, slice_results=self._slice)
+        result = await cache.aget_or_refresh("fast-search", "Rust?", 5, self._loader_for(5, calls),
+                                             ttl_seconds=60, slice_results=self._slice)
+
+        assert result == {"results": [0, 1, 2, 3, 4]}
+        assert calls == [10]
+
+    @pytest.mark.asyncio
+    async def test_larger_request_replaces_smaller(self):
+        """A request for more results than cached loads and keeps the larger set."""
+        cache = self._memory_only_cache()
+        calls = []
+
+        await cache.aget_or_refresh("fast-search", "rust", 5, self._loader_for(5, calls),
+                                    ttl_seconds=60, slice_results=self._slice)
+        await cache.aget_or_refresh("fast-search", "rust", 10, self._loader_for(10, calls),
+                                    ttl_seconds=60, slice_results=self._slice)
+        result = await cache.aget_or_refresh("fast-search", "rust", 8, self._loader_for(8, calls),
+                                             ttl_seconds=60, slice_results=self._slice)
+
+        assert calls == [5, 10]
+        assert len(result["results"]) == 8
+
+    @pytest.mark.asyncio
+    async def test_small_request_does_not_shrink_stale_entry(self):
+        """A stale larger entry is served sliced and not refreshed by a smaller request."""
+        cache = self._memory_only_cache()
+        calls = []
+
+        await cache.aget_or_refresh("fast-search", "rust", 10, self._loader_for(10, calls),
+                                    ttl_seconds=0, stale_seconds=60, slice_results=self._slice)
+        result = await cache.aget_or_refresh("fast-search", "rust", 3, self._loader_for(3, calls),
+                                             ttl_seconds=60, slice_results=self._slice)
+        await asyncio.sleep(0.01)
+
+        assert result == {"results": [0, 1, 2]}
+        assert calls == [10]
+
+
+class TestHybridCacheDistributedLease:
+    """Test cross-worker de-duplication with a Redis lease."""
+
+    @staticmethod
+    def _worker(redis_stub):
+        cache = HybridCache(max_size=100)
+        cache._redis_cache = redis_stub
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_second_worker_waits_for_leader(self):
+        """Two workers missing the same key trigger one upstream call."""
+        redis_stub = SharedRedisStub()
+        worker_a, worker_b = self._worker(redis_stub), self._worker(redis_stub)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"summary": "done"}
+
+        results = await asyncio.gather(
+            worker_a.aget_or_refresh("scan-topic", "topic", 5, loader, ttl_seconds=60, lease_seconds=10),
+            worker_b.aget_or_refresh("scan-topic", "topic", 5, loader, ttl_seconds=60, lease_seconds=10),
+        )
+
+        assert results == [{"summary": "done"}] * 2
+        assert len(calls) == 1
+        assert worker_a.lease_waits + worker_b.lease_waits == 1
+        assert redis_stub.leases == {}
+
+    @pytest.mark.asyncio
+    async def test_follower_loads_when_leader_fails(self):
+        """If the lease holder fails, a waiting worker computes the value itself."""
+        redis_stub = SharedRedisStub()
+        worker_a, worker_b = self._worker(redis_stub), self._worker(redis_stub)
+
+        async def failing_loader():
+            await asyncio.sleep(0.05)
+            raise RuntimeError("n8n error")
+
+        async def good_loader():
+            return "from follower"
+
+        results = await asyncio.gather(
+            worker_a.aget_or_refresh("scan-topic", "topic", 5, failing_loader, ttl_seconds=60, lease_seconds=10),
+            worker_b.aget_or_refresh("scan-topic", "topic", 5, good_loader, ttl_seconds=60, lease_seconds=10),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], RuntimeError)
+        assert results[1] == "from follower"
+
+    @pytest.mark.asyncio
+    async def test_stale_write_from_expired_lease_discarded(self):
+        """A result written with an older fencing token does not replace a newer one."""
+        redis_stub = SharedRedisStub()
+        cache = self._worker(redis_stub)
+        key = cache._generate_key("scan-topic:swr", "topic", 5)
+
+        await cache._aset_fenced("scan-topic:swr", "topic", 5, {"value": "new"}, 60, key, fence=2)
+        await cache._aset_fenced("scan-topic:swr", "topic", 5, {"value": "old"}, 60, key, fence=1)
+
+        assert redis_stub.values[key] == {"value": "new"}
+
+    @pytest.mark.asyncio
+    async def test_without_redis_runs_locally(self):
+        """With Redis unavailable the lease is skipped and the loader still runs."""
+        cache = HybridCache(max_size=100)
+        cache._redis_cache = None
+
+        async def loader():
+            return "local"
+
+        assert await cache.aget_or_refresh("scan-topic", "topic", 5, loader, ttl_seconds=60, lease_seconds=10) == "local"
+
+
+class TestHybridCacheBulk:
+    """Test multi-key reads and writes."""
+
+    @pytest.mark.asyncio
+    async def test_l1_misses_read_from_redis_in_one_call(self):
+        """Keys missing from memory are fetched together and promoted."""
+        redis_stub = SharedRedisStub()
+        writer = HybridCache(max_size=100)
+        writer._redis_cache = redis_stub
+        await writer.aset_many("cpidr", {"a" * 64: 0.5, "b" * 64: 0.6}, 0, 3600)
+
+        reader = HybridCache(max_size=100)
+        reader._redis_cache = redis_stub
+        reader._memory_cache.set("cpidr", "c" * 64, 0, 0.7, 3600)
+        found = await reader.aget_many("cpidr", ["a" * 64, "b" * 64, "c" * 64, "d" * 64], 0)
+
+        assert found == {"a" * 64: 0.5, "b" * 64: 0.6, "c" * 64: 0.7}
+        assert redis_stub.bulk_reads == 1
+        assert reader._memory_cache.get("cpidr", "a" * 64, 0) == 0.5
+        assert reader.metrics.snapshot()["cpidr"]["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_memory_only(self):
+        """Without Redis, bulk calls use the memory tier."""
+        cache = HybridCache(max_size=100)
+        cache._redis_cache = None
+        await cache.aset_many("cpidr", {"a" * 64: 0.5}, 0, 3600)
+
+        assert await cache.aget_many("cpidr", ["a" * 64, "b" * 64], 0) == {"a" * 64: 0.5}
+
+
 class TestRedisUrl:
     """Test Redis URL formatting with password authentication."""
 
@@ -393,6 +998,76 @@ class TestRedisUrl:
             assert "/" in cache._redis_url  # Has database
 
 
+class TestCodec:
+    """Test binary serialization and compression of cache values."""
+
+    VALUE = {"summary": "Rust async runtimes compared", "results": [{"url": f"https://e.com/{i}", "content": "tokio " * 50} for i in range(20)]}
+
+    @pytest.mark.parametrize("serializer", ["json", "orjson"])
+    @pytest.mark.parametrize("compression", ["none", "zlib", "zstd"])
+    def test_round_trip(self, serializer, compression):
+        """Every serializer/compression combination decodes to the original value."""
+        if serializer == "orjson" and not codec_module.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        if compression == "zstd" and not codec_module.ZSTD_AVAILABLE:
+            pytest.skip("zstandard not installed")
+
+        codec = Codec(serializer=serializer, compression=compression, min_compress_bytes=256)
+        data = codec.encode(self.VALUE)
+
+        assert data[0] == 0x81
+        assert codec.decode(data) == self.VALUE
+        # Any codec instance can read it
+        assert Codec(serializer="json", compression="zlib").decode(data) == self.VALUE
+
+    def test_large_values_compressed(self):
+        """Values above the threshold are stored compressed and much smaller."""
+        codec = Codec(compression="zlib", min_compress_bytes=256)
+        data = codec.encode(self.VALUE)
+
+        assert data[1] & 0x0F == codec_module.COMPRESSION_ZLIB
+        assert len(data) < len(json.dumps(self.VALUE)) / 4
+
+    def test_small_values_not_compressed(self):
+        """Values below the threshold skip compression."""
+        codec = Codec(compression="zlib", min_compress_bytes=1024)
+        data = codec.encode({"a": 1})
+
+        assert data[1] & 0x0F == codec_module.COMPRESSION_NONE
+        assert codec.decode(data) == {"a": 1}
+
+    def test_legacy_json_entries_decoded(self):
+        """Plain JSON written by older versions is still readable."""
+        codec = Codec()
+        assert codec.decode(json.dumps({"results": [1, 2]}).encode()) == {"results": [1, 2]}
+        assert codec.decode('"text"') == "text"
+        assert codec.decode(b"0.75") == 0.75
+
+    def test_corrupt_value_raises_codec_error(self):
+        """Damaged data raises CodecError instead of returning garbage."""
+        codec = Codec(compression="zlib", min_compress_bytes=0)
+        data = codec.encode(self.VALUE)
+
+        with pytest.raises(CodecError):
+            codec.decode(data[:-10])
+        with pytest.raises(CodecError):
+            codec.decode(b"\x95\x00{}")
+
+    def test_non_json_types_stringified(self):
+        """Values json.dumps(default=str) handled before still encode."""
+        import datetime
+        codec = Codec()
+        value = {"when": datetime.date(2024, 1, 2), "big": 2 ** 70}
+        assert codec.decode(codec.encode(value)) == {"when": "2024-01-02", "big": 2 ** 70}
+
+    def test_unknown_options_rejected(self):
+        """Misconfigured codecs fail fast."""
+        with pytest.raises(ValueError):
+            Codec(serializer="pickle")
+        with pytest.raises(ValueError):
+            Codec(compression="brotli")
+
+
 class TestRedisCache:
     """Test RedisCache async operations."""
 
@@ -429,6 +1104,85 @@ class TestRedisCache:
         await cache.delete("test_key")
         await cache.close()
 
+    @pytest.mark.asyncio
+    async def test_get_with_ttl(self):
+        """Test value and remaining TTL are read together (will test if Redis available)."""
+        import os
+
+        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        cache = RedisCache(redis_url=redis_url)
+
+        if not await cache.ping():
+            pytest.skip("Redis not available")
+
+        await cache.set("test_ttl_key", {"a": 1}, ttl=60)
+        value, ttl = await cache.get_with_ttl("test_ttl_key")
+        assert value == {"a": 1}
+        assert 0 < ttl <= 60
+
+        assert await cache.get_with_ttl("nonexistent_key_12345") == (None, -2)
+
+        await cache.delete("test_ttl_key")
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_lease_and_fenced_set(self):
+        """Test lease exclusivity, release, and fencing (will test if Redis available)."""
+        import os
+
+        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        cache = RedisCache(redis_url=redis_url)
+
+        if not await cache.ping():
+            pytest.skip("Redis not available")
+
+        first = await cache.acquire_lease("test_lease", 10)
+        assert first is not None
+        assert await cache.acquire_lease("test_lease", 10) is None
+        assert await cache.release_lease("test_lease", first) is True
+        assert await cache.wait_for_lease("test_lease", timeout=1) is True
+
+        second = await cache.acquire_lease("test_lease", 10)
+        assert second > first
+        assert await cache.set_fenced("test_fenced", "new", 60, "test_lease", second) is True
+        assert await cache.set_fenced("test_fenced", "old", 60, "test_lease", first) is False
+        assert await cache.get("test_fenced") == "new"
+
+        await cache.release_lease("test_lease", second)
+        for key in ("test_fenced", "lease:test_lease:fence", "lease:test_lease:written"):
+            await cache.delete(key)
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_lease_fence_survives_counter_eviction(self):
+        """Tokens stay above the last write when the counter is lost (will test if Redis available)."""
+        import os
+
+        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        cache = RedisCache(redis_url=redis_url)
+
+        if not await cache.ping():
+            pytest.skip("Redis not available")
+
+        for _ in range(3):
+            fence = await cache.acquire_lease("test_evicted", 10)
+            await cache.release_lease("test_evicted", fence)
+        assert await cache.set_fenced("test_evicted_value", "old", 60, "test_evicted", fence) is True
+
+        # allkeys-lru may evict the counter while :written is still alive
+        await cache.delete("lease:test_evicted:fence")
+        fresh = await cache.acquire_lease("test_evicted", 10)
+        assert fresh > fence
+        assert await cache.set_fenced("test_evicted_value", "new", 60, "test_evicted", fresh) is True
+
+        r = await cache._get_redis()
+        assert await r.ttl("lease:test_evicted:fence") >= await r.ttl("lease:test_evicted:written")
+
+        await cache.release_lease("test_evicted", fresh)
+        for key in ("test_evicted_value", "lease:test_evicted:fence", "lease:test_evicted:written"):
+            await cache.delete(key)
+        await cache.close()
+
     @pytest.mark.asyncio
     async def test_get_nonexistent(self):
         """Test getting nonexistent key returns None."""
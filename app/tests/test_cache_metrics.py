@@ -0,0 +1,119 @@
+"""Tests for per-prefix cache metrics."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+import app.main as main_module
+from app.cache import HybridCache, TTLCache
+from app.cache.metrics import CacheMetrics, Histogram, metric_prefix
+
+
+class TestCacheMetrics:
+    """Test counters and histograms."""
+
+    def test_metric_prefix_groups_keys(self):
+        """Keys and sub-prefixes are grouped by their first segment."""
+        assert metric_prefix("scan-topic:swr") == "scan-topic"
+        assert metric_prefix("cpidr:abc123:0") == "cpidr"
+        assert metric_prefix("extract") == "extract"
+
+    def test_histogram_percentiles(self):
+        """Percentiles report the upper bound of the matching bucket."""
+        histogram = Histogram((1, 10, 100))
+        for value in [0.5] * 90 + [50] * 9 + [500]:
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 100
+        assert snapshot["p50"] == 1
+        assert snapshot["p95"] == 100
+        assert snapshot["p99"] == 100
+        assert snapshot["max"] == 500
+        assert Histogram((1,)).snapshot()["p99"] == 0.0
+
+    def test_snapshot_by_prefix(self):
+        """Counters and histograms are reported per prefix group."""
+        metrics = CacheMetrics()
+        metrics.incr("scan-topic:swr", "hits")
+        metrics.incr("scan-topic", "hits")
+        metrics.incr("cpidr", "misses")
+        metrics.observe_latency("scan-topic", "get_ms", 0.002)
+        metrics.observe_size("cpidr", "value_bytes", 300)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["scan-topic"]["hits"] == 2
+        assert snapshot["scan-topic"]["get_ms"]["count"] == 1
+        assert snapshot["scan-topic"]["get_ms"]["p50"] == 2.5
+        assert snapshot["cpidr"]["misses"] == 1
+        assert snapshot["cpidr"]["value_bytes"]["p50"] == 1024
+
+
+class TestCacheInstrumentation:
+    """Test the caches record per-prefix metrics."""
+
+    def test_ttl_cache_counts_by_prefix(self):
+        """TTLCache reports hits, misses and evictions per prefix."""
+        cache = TTLCache(max_size=2, max_bytes=0, shards=1, regions={})
+        cache.set("cpidr", "a", 0, 1, 300)
+        cache.get("cpidr", "a", 0)
+        cache.get("depid", "b", 0)
+        cache.set("scan-topic:swr", "t1", 0, 1, 300)
+        cache.set("scan-topic:swr", "t2", 0, 1, 300)
+
+        prefixes = cache.get_stats()["prefixes"]
+        assert prefixes["cpidr"] == {"hits": 1, "evictions": 1}
+        assert prefixes["depid"] == {"misses": 1}
+
+    @pytest.mark.asyncio
+    async def test_hybrid_cache_counts_tiers_and_latency(self):
+        """HybridCache reports L1/L2 hits, misses and get/set latency per prefix."""
+        cache = HybridCache(max_size=100)
+        redis_mock = MagicMock()
+        redis_mock.ping = AsyncMock(return_value=True)
+        redis_mock.set = AsyncMock(return_value=True)
+        redis_mock.get_with_ttl = AsyncMock(side_effect=[({"v": 1}, 60), (None, -2)])
+        cache._redis_cache = redis_mock
+
+        await cache.aget("fast-search:swr", "rust", 0)  # L2 hit
+        await cache.aget("fast-search:swr", "rust", 0)  # L1 hit
+        await cache.aget("extract", "https://example.com", 0)  # miss
+        await cache.aset("extract", "https://example.com", 0, {"v": 2}, 60)
+
+        prefixes = cache.get_stats()["prefixes"]
+        assert prefixes["fast-search"]["l2_hits"] == 1
+        assert prefixes["fast-search"]["l1_hits"] == 1
+        assert prefixes["fast-search"]["get_ms"]["count"] == 2
+        assert prefixes["extract"]["misses"] == 1
+        assert prefixes["extract"]["sets"] == 1
+        assert prefixes["extract"]["set_ms"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_hits_counted(self):
+        """Serving a stale entry counts a stale hit for the prefix."""
+        cache = HybridCache(max_size=100)
+        cache._redis_cache = None
+
+        async def loader():
+            return {"results": [1]}
+
+        await cache.aget_or_refresh("scan-topic", "rust", 10, loader, ttl_seconds=0, stale_seconds=60)
+        await cache.aget_or_refresh("scan-topic", "rust", 10, loader, ttl_seconds=0, stale_seconds=60)
+
+        prefixes = cache.get_stats()["prefixes"]
+        assert prefixes["scan-topic"]["stale_hits"] == 1
+        assert prefixes["scan-topic"]["refreshes"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_cache_stats_endpoint_exposes_prefixes(self, monkeypatch):
+        """/cache/stats includes per-prefix metrics of memory and hybrid tiers."""
+        cache = HybridCache(max_size=100)
+        cache._redis_cache = None
+        cache.set("cpidr", "hash", 0, 0.5, 60)
+        await cache.aget("cpidr", "hash", 0)
+        monkeypatch.setattr(main_module, "get_cache", lambda: cache)
+        monkeypatch.setattr(main_module, "get_page_cache", lambda: None)
+
+        stats = await main_module.cache_stats(api_key="test")
+
+        assert stats["prefixes"]["cpidr"]["l1_hits"] == 1
+        assert stats["memory"]["prefixes"]["cpidr"]["hits"] == 1
@@ -0,0 +1,167 @@
+"""Tests for the CPU process pool."""
+
+import asyncio
+import multiprocessing.connection
+import operator
+import os
+import threading
+import time
+
+import pytest
+
+from app.services import cpu_pool as cpu_pool_module
+from app.services.cpu_pool import CPUPool, CPUTaskTimeout, run_cpu_bound
+
+
+@pytest.fixture
+async def pool():
+    """Single-worker pool without warm-up (keeps tests fast)."""
+    instance = CPUPool(workers=1, task_timeout=5.0, max_tasks_per_worker=100, warm=False)
+    await instance.start()
+    yield instance
+    await instance.shutdown()
+
+
+class TestCPUPool:
+    """Test task execution, timeouts and worker recycling."""
+
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_process(self, pool):
+        """Tasks execute in a separate process and return their result."""
+        worker_pid = await pool.run(os.getpid)
+        assert worker_pid != os.getpid()
+        assert await pool.run(operator.add, 2, 3) == 5
+
+    @pytest.mark.asyncio
+    async def test_task_exception_propagates(self, pool):
+        """Exceptions raised by the task are re-raised and the worker is kept."""
+        pid_before = await pool.run(os.getpid)
+        with pytest.raises(ZeroDivisionError):
+            await pool.run(operator.truediv, 1, 0)
+        assert await pool.run(os.getpid) == pid_before
+        assert pool.get_stats()["tasks_failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_and_replaces_worker(self, pool):
+        """An overrunning task is stopped and the pool keeps serving."""
+        pid_before = await pool.run(os.getpid)
+
+        with pytest.raises(CPUTaskTimeout):
+            await pool.run(time.sleep, 10, timeout=0.5)
+
+        pid_after = await pool.run(os.getpid)
+        assert pid_after != pid_before
+        # The old worker is reaped in the background
+        await asyncio.gather(*pool._reaping)
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid_before, 0)
+        assert pool.get_stats()["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_worker_recycled_after_max_tasks(self):
+        """Workers are replaced after max_tasks_per_worker tasks."""
+        pool = CPUPool(workers=1, max_tasks_per_worker=2, warm=False)
+        try:
+            pids = [await pool.run(os.getpid) for _ in range(3)]
+        finally:
+            await pool.shutdown()
+
+        assert pids[0] == pids[1]
+        assert pids[2] != pids[0]
+        assert pool.recycled == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_worker_stop_does_not_block(self, monkeypatch):
+        """Recycling waits for the old worker in a thread, not on the loop."""
+        stop = cpu_pool_module._Worker.stop
+
+        def slow_stop(worker):
+            time.sleep(2)
+            stop(worker)
+
+        monkeypatch.setattr(cpu_pool_module._Worker, "stop", slow_stop)
+        pool = CPUPool(workers=1, max_tasks_per_worker=1, warm=False)
+        try:
+            start = time.monotonic()
+            worker_pid = await pool.run(os.getpid)
+            elapsed = time.monotonic() - start
+        finally:
+            await pool.shutdown()
+
+        assert elapsed < 1.5
+        # shutdown() still waits for every worker to exit
+        with pytest.raises(ProcessLookupError):
+            os.kill(worker_pid, 0)
+
+    @pytest.mark.asyncio
+    async def test_tasks_sent_off_loop(self, pool, monkeypatch):
+        """Pickling and writing a large page to the worker happens in a thread."""
+        send = multiprocessing.connection.Connection.send
+        senders = []
+
+        def recording_send(conn, obj):
+            senders.append(threading.current_thread())
+            send(conn, obj)
+
+        monkeypatch.setattr(multiprocessing.connection.Connection, "send", recording_send)
+        page = b"x" * 5_000_000
+        assert await pool.run(len, page) == len(page)
+
+        assert senders and threading.main_thread() not in senders
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self):
+        """CPU work in the pool runs in parallel and leaves the loop free."""
+        pool = CPUPool(workers=2, warm=False)
+        await pool.start()
+        try:
+            # Wait until both workers are up so startup is not timed
+            await asyncio.gather(pool.run(os.getpid), pool.run(os.getpid))
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.05)
+                    ticks += 1
+
+            ticker_task = asyncio.create_task(ticker())
+            start = time.monotonic()
+            await asyncio.gather(pool.run(time.sleep, 0.5), pool.run(time.sleep, 0.5))
+            elapsed = time.monotonic() - start
+            ticker_task.cancel()
+        finally:
+            await pool.shutdown()
+
+        assert elapsed < 0.95
+        assert ticks >= 5
+
+    def test_requires_workers(self):
+        """A pool with no workers is rejected."""
+        with pytest.raises(ValueError):
+            CPUPool(workers=0)
+
+
+class TestRunCpuBound:
+    """Test the module-level dispatch helper."""
+
+    @pytest.mark.asyncio
+    async def test_runs_inline_when_pool_disabled(self, monkeypatch):
+        """With CPU_POOL_WORKERS=0 tasks run in a thread of this process."""
+        monkeypatch.setattr(cpu_pool_module.config, "CPU_POOL_WORKERS", 0)
+        monkeypatch.setattr(cpu_pool_module, "_cpu_pool", None)
+
+        assert await run_cpu_bound(os.getpid) == os.getpid()
+        assert cpu_pool_module.get_cpu_pool() is None
+
+    @pytest.mark.asyncio
+    async def test_inline_task_times_out(self, monkeypatch):
+        """The thread fallback honours the timeout too."""
+        monkeypatch.setattr(cpu_pool_module.config, "CPU_POOL_WORKERS", 0)
+        monkeypatch.setattr(cpu_pool_module, "_cpu_pool", None)
+
+        start = time.monotonic()
+        with pytest.raises(CPUTaskTimeout):
+            await run_cpu_bound(time.sleep, 1.0, timeout=0.2)
+        assert time.monotonic() - start < 0.9
+
@@ -0,0 +1,179 @@
+"""Tests for sampled density estimation of long texts."""
+
+import random
+
+import pytest
+from unittest.mock import patch
+
+import extractor
+from services.density_sampling import StratifiedRatio, estimate_ratios, split_units
+
+
+def _synthetic_units(count, seed=7):
+    """Units whose text encodes (propositions, words); density drifts through the document."""
+    rng = random.Random(seed)
+    units = []
+    for i in range(count):
+        words = rng.randint(60, 140)
+        density = 0.4 + 0.2 * i / count + rng.uniform(-0.05, 0.05)
+        units.append((round(words * density), words))
+    return units
+
+
+def _score_synthetic(units):
+    def score_units(texts):
+        return [{"cpidr": units[int(text.split()[0])]} for text in texts]
+    # Unit text: its index followed by filler words, so word counts match
+    texts = [" ".join([str(i)] + ["w"] * (words - 1)) for i, (_, words) in enumerate(units)]
+    return texts, score_units
+
+
+class TestSplitUnits:
+    """Test paragraph unit splitting."""
+
+    def test_short_paragraphs_merged(self):
+        """Units have at least min_words words; a short tail joins the last unit."""
+        text = "\n".join(["one two three four five"] * 5)
+        units = split_units(text, min_words=10)
+
+        assert len(units) == 2
+        assert all(len(unit.split()) >= 10 for unit in units)
+        assert sum(len(unit.split()) for unit in units) == 25
+
+    def test_long_lines_cut_at_sentences(self):
+        """A single huge line is still split into several units."""
+        text = " ".join(["This is one sentence of eight words."] * 50)
+        units = split_units(text, min_words=40, max_words=100)
+
+        assert len(units) == 8
+        assert all(len(unit.split()) >= 40 and unit.endswith(".") for unit in units)
+
+
+class TestStratifiedRatio:
+    """Test the combined ratio estimator."""
+
+    def test_full_sample_is_exact(self):
+        """With every unit scored the estimate is the true ratio and the error is 0."""
+        estimate = StratifiedRatio([2, 1])
+        estimate.add(0, 3, 10)
+        estimate.add(0, 5, 10)
+        estimate.add(1, 2, 5)
+
+        assert estimate.ratio() == pytest.approx(10 / 25)
+        assert estimate.half_width() == 0.0
+
+    def test_too_few_units_has_no_bound(self):
+        """A partly sampled stratum needs two units for a variance."""
+        estimate = StratifiedRatio([10])
+        estimate.add(0, 3, 10)
+
+        assert estimate.half_width() == float("inf")
+
+
+class TestEstimateRatios:
+    """Test sampling until the error bar is reached."""
+
+    def test_estimate_within_error_bar(self):
+        """The estimate covers the true ratio and stops before scoring everything."""
+        units = _synthetic_units(400)
+        texts, score_units = _score_synthetic(units)
+        truth = sum(p for p, _ in units) / sum(w for _, w in units)
+
+        result = estimate_ratios(texts, score_units, max_error=0.01, max_words=100_000, seed=1)
+        ratio, half_width = result["ratios"]["cpidr"]
+
+        assert half_width <= 0.01
+        assert abs(ratio - truth) <= 2 * half_width
+        assert result["sampled_units"] < result["total_units"]
+
+    def test_word_budget_bounds_work(self):
+        """Sampling stops at the word budget even if the target error is not met."""
+        units = _synthetic_units(400)
+        texts, score_units = _score_synthetic(units)
+
+        result = estimate_ratios(texts, score_units, max_error=1e-6, max_words=2_000, seed=1)
+
+        assert result["sampled_words"] < 2_000 + 4 * 140
+        assert result["ratios"]["cpidr"][1] > 0
+
+    def test_same_seed_same_estimate(self):
+        """The sampling order is reproducible, so cached estimates are stable."""
+        texts, score_units = _score_synthetic(_synthetic_units(200))
+
+        first = estimate_ratios(texts, score_units, max_error=0.02, max_words=3_000, seed=42)
+        second = estimate_ratios(texts, score_units, max_error=0.02, max_words=3_000, seed=42)
+
+        assert first == second
+
+
+class TestSampledDensity:
+    """Test sampled scoring in the density functions."""
+
+    LONG_TEXT = "\n".join(
+        f"Paragraph {i} describes measurements, methods and results in plain, direct sentences."
+        for i in range(400)
+    )
+
+    @staticmethod
+    def _fake_counts(nlp, text):
+        words = len(text.split())
+        return {"cpidr": (words // 2, words), "depid": (words // 4, words)}
+
+    @pytest.fixture
+    def sampled_mode(self, monkeypatch):
+        monkeypatch.setattr(extractor.config, "DENSITY_MODE", "sampled")
+        monkeypatch.setattr(extractor.config, "DENSITY_SAMPLE_MIN_WORDS", 1000)
+        monkeypatch.setattr(extractor.config, "DENSITY_SAMPLE_MAX_WORDS", 1000)
+        with patch('extractor.SHARED_PARSE_AVAILABLE', True), \
+             patch('extractor.get_depid_nlp', return_value=None), \
+             patch('extractor._parse_counts', side_effect=self._fake_counts) as mock_counts:
+            yield mock_counts
+
+    @pytest.mark.asyncio
+    async def test_long_text_sampled_with_error_bar(self, sampled_mode):
+        """Long texts are scored from a bounded sample and report an error bar."""
+        metrics = await extractor.estimate_density_metrics(self.LONG_TEXT)
+
+        assert metrics["cpidr"] == pytest.approx(0.5, abs=0.02)
+        assert metrics["depid"] == pytest.approx(0.25, abs=0.02)
+        assert metrics["cpidr_error"] >= 0.0
+        sampled_words = sum(len(call.args[1].split()) for call in sampled_mode.call_args_list)
+        assert sampled_words < len(self.LONG_TEXT.split())
+
+        # calculate_density reuses the stored estimate
+        calls = sampled_mode.call_count
+        assert await extractor.calculate_density(self.LONG_TEXT) == metrics["cpidr"]
+        assert sampled_mode.call_count == calls
+
+    @pytest.mark.asyncio
+    async def test_sampler_version_change_resamples(self, sampled_mode, monkeypatch):
+        """Estimates made by another sampler version are not reused."""
+        assert "sampler-" in extractor.SCORER_VERSIONS["density-sample"]
+        await extractor.estimate_density_metrics(self.LONG_TEXT)
+        calls = sampled_mode.call_count
+
+        monkeypatch.setattr(extractor, "SAMPLER_VERSION", "test")
+        await extractor.estimate_density_metrics(self.LONG_TEXT)
+
+        assert sampled_mode.call_count > calls
+
+    @pytest.mark.asyncio
+    async def test_exact_mode_scores_full_text(self, sampled_mode, monkeypatch):
+        """DENSITY_MODE=exact keeps scoring every word."""
+        monkeypatch.setattr(extractor.config, "DENSITY_MODE", "exact")
+        with patch('extractor.IDEADENSITY_AVAILABLE', True), \
+             patch('extractor._cpidr_density', return_value=0.6) as mock_exact:
+            assert await extractor.calculate_density(self.LONG_TEXT) == 0.6
+
+        mock_exact.assert_called_once_with(self.LONG_TEXT)
+        sampled_mode.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_short_text_scored_exactly(self, sampled_mode):
+        """Texts below DENSITY_SAMPLE_MIN_WORDS are not sampled."""
+        text = "Short texts are cheap enough to score in full every time. " * 5
+        with patch('extractor.IDEADENSITY_AVAILABLE', True), \
+             patch('extractor._cpidr_density', return_value=0.6):
+            assert await extractor.calculate_density(text) == 0.6
+
+        sampled_mode.assert_not_called()
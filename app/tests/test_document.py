@@ -0,0 +1,116 @@
+"""Tests for the shared single-parse document."""
+
+import lxml.html
+import trafilatura
+
+from app.services.document import ParsedDocument, sniff_encoding
+
+
+ARTICLE_HTML = """
+<html>
+<head><title>Understanding Parsers</title></head>
+<body>
+    <nav>Home | About</nav>
+    <article>
+        <h1>How <em>parsers</em> work</h1>
+        <p>A parser turns a stream of tokens into a tree that later stages can walk.</p>
+        <p>Sharing one tree between stages avoids repeating the expensive step.</p>
+        <pre><code>tree = parse(html)</code></pre>
+        <table><tr><td>Stage</td><td>Cost</td></tr></table>
+        <a href="https://amzn.to/abc">Buy</a> <a>No href</a>
+    </article>
+    <script>var tracking = "not text";</script>
+    <style>p { color: red; }</style>
+</body>
+</html>
+"""
+
+
+class TestParsedDocument:
+    """Test structure statistics and extraction from one parse."""
+
+    def test_structure_counts(self):
+        """Counts come from a single walk of the tree."""
+        doc = ParsedDocument(ARTICLE_HTML)
+
+        assert doc.code_blocks == 2
+        assert doc.tables == 1
+        assert doc.links == ["https://amzn.to/abc"]
+        assert doc.title == "Understanding Parsers"
+        assert doc.h1 == "How parsers work"
+
+    def test_text_length_excludes_scripts_and_styles(self):
+        """Visible text length matches whitespace-joined stripped strings."""
+        html = "<html><body><p> Hello </p><script>x = 1</script><p>world</p></body></html>"
+        doc = ParsedDocument(html)
+
+        assert doc.text_length == len("Hello world")
+
+    def test_extraction_matches_trafilatura_and_keeps_tree(self):
+        """Extracting from the shared tree gives the same text and leaves the tree intact."""
+        doc = ParsedDocument(ARTICLE_HTML)
+        before = lxml.html.tostring(doc.tree)
+
+        text = doc.extract_text(include_comments=False, include_tables=True)
+        title = doc.metadata_title()
+
+        assert text == trafilatura.extract(ARTICLE_HTML, include_comments=False, include_tables=True)
+        assert title == trafilatura.extract_metadata(ARTICLE_HTML).title
+        assert lxml.html.tostring(doc.tree) == before
+
+    def test_fragment_counted_but_not_extracted(self):
+        """Inputs Trafilatura rejects are still analyzed structurally."""
+        doc = ParsedDocument("<div><code>a</code></div>")
+
+        assert doc.parsed
+        assert doc.code_blocks == 1
+        assert doc.extract_text() is None
+
+    def test_empty_html(self):
+        """Empty input produces no tree and zero counts."""
+        doc = ParsedDocument("")
+
+        assert not doc.parsed
+        assert doc.text_length == 0
+        assert doc.links == []
+
+
+class TestBytesInput:
+    """Test parsing fetched bytes without decoding the page to str."""
+
+    def test_bytes_match_str_pipeline(self):
+        """Bytes input gives the same text and counts as the str path."""
+        from_str = ParsedDocument(ARTICLE_HTML)
+        from_bytes = ParsedDocument(ARTICLE_HTML.encode("utf-8"), "utf-8")
+
+        kwargs = {"include_comments": False, "include_tables": True}
+        assert from_bytes.extract_text(**kwargs) == from_str.extract_text(**kwargs)
+        assert from_bytes.text_length == from_str.text_length
+        assert from_bytes.links == from_str.links
+
+    def test_header_charset_used(self):
+        """The Content-Type charset decodes a page without a meta tag."""
+        html = "<html><head><title>Café crème</title></head><body><p>x</p></body></html>"
+        doc = ParsedDocument(html.encode("latin-1"), "iso-8859-1")
+
+        assert doc.title == "Café crème"
+
+    def test_meta_charset_used(self):
+        """A <meta> charset is honoured when the header has none."""
+        html = '<html><head><meta charset="windows-1252"><title>“Quoted”</title></head><body></body></html>'
+        doc = ParsedDocument(html.encode("cp1252"))
+
+        assert doc.encoding == "windows-1252"
+        assert doc.title == "“Quoted”"
+
+    def test_defaults_to_utf8(self):
+        """Undeclared pages are read as UTF-8, like httpx does."""
+        doc = ParsedDocument("<html><head><title>naïve</title></head></html>".encode("utf-8"))
+
+        assert doc.encoding == "utf-8"
+        assert doc.title == "naïve"
+
+    def test_sniff_ignores_unknown_charset(self):
+        """An unknown header charset falls through to the meta tag."""
+        data = b'<meta charset="utf-8">'
+        assert sniff_encoding(data, "x-not-a-charset") == "utf-8"
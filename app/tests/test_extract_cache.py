@@ -0,0 +1,151 @@
+"""Tests for /extract result caching and in-flight coalescing."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import app.main as main_module
+from app.cache import HybridCache
+from app.cache.single_flight import SingleFlight
+from app.main import ExtractionRequest
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent identical calls."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_run(self):
+        """N concurrent calls with the same key run the function once."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flight.get_stats() == {"in_flight": 0, "started": 1, "coalesced": 4}
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Calls with different keys are not coalesced."""
+        flight = SingleFlight()
+
+        async def work(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(flight.do("a", lambda: work(1)), flight.do("b", lambda: work(2)))
+        assert results == [1, 2]
+        assert flight.started == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_raised_to_all_callers(self):
+        """A failure is shared, and the key is released for a retry."""
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.in_flight() == 0
+
+        async def succeed():
+            return "ok"
+
+        assert await flight.do("k", succeed) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_work(self):
+        """Other callers still get the result when one caller is cancelled."""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flight.do("k", work))
+        second = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+
+@pytest.fixture
+def extract_env(monkeypatch):
+    """Patch the extractor and result cache used by /extract."""
+    cache = HybridCache(max_size=100)
+    cache._redis_cache = None
+    calls = []
+
+    async def fake_extract(url, force_depth=False):
+        calls.append(url)
+        await asyncio.sleep(0.05)
+        if "broken" in url:
+            return {"url": url, "error": "No content extracted", "length": 0}
+        return {
+            "url": url,
+            "title": "Title",
+            "content": "some extracted words",
+            "signal_score": 0.8,
+            "density_score": 0.5,
+            "depid_density": 0.4,
+            "readability_score": {"flesch_reading_ease": 60.0},
+        }
+
+    monkeypatch.setattr(main_module, "get_cache", lambda: cache)
+    monkeypatch.setattr(main_module.extractor, "extract_from_url", fake_extract)
+    monkeypatch.setattr(main_module, "_extract_flight", SingleFlight())
+    return calls
+
+
+class TestExtractEndpointCache:
+    """Test /extract caching and coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_extraction(self, extract_env):
+        """Concurrent identical requests trigger one extraction."""
+        req = ExtractionRequest(url="https://example.com/Article")
+        responses = await asyncio.gather(*(main_module.extract_content(req) for _ in range(4)))
+
+        assert len(extract_env) == 1
+        assert all(r.word_count == 3 for r in responses)
+
+    @pytest.mark.asyncio
+    async def test_repeat_request_served_from_cache(self, extract_env):
+        """A repeat request for an equivalent URL does not re-extract."""
+        first = await main_module.extract_content(ExtractionRequest(url="https://Example.com/Article#top"))
+        second = await main_module.extract_content(ExtractionRequest(url="https://example.com/Article"))
+
+        assert len(extract_env) == 1
+        assert second == first
+
+    @pytest.mark.asyncio
+    async def test_url_path_case_is_significant(self, extract_env):
+        """URLs that differ only in path case are cached separately."""
+        await main_module.extract_content(ExtractionRequest(url="https://example.com/Article"))
+        await main_module.extract_content(ExtractionRequest(url="https://example.com/article"))
+
+        assert len(extract_env) == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_not_cached(self, extract_env):
+        """Failed extractions are retried on the next request."""
+        req = ExtractionRequest(url="https://broken.example.com/")
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                await main_module.extract_content(req)
+            assert exc_info.value.status_code == 422
+
+        assert len(extract_env) == 2
@@ -3,7 +3,7 @@ import os
 from unittest.mock import patch, MagicMock, AsyncMock
 import sys
 sys.path.insert(0, '/root/sgnl-backend/app')
-from extractor import calculate_density, calculate_depid_density, calculate_readability_scores, calculate_combined_density, ContentExtractor
+from extractor import calculate_density, calculate_depid_density, calculate_readability_scores, calculate_combined_density, ContentExtractor, FetchedPage
 
 
 def _mock_cache():
@@ -11,6 +11,8 @@ def _mock_cache():
     mock = MagicMock()
     mock.get.return_value = None
     mock.set = MagicMock()
+    mock.aget = AsyncMock(return_value=None)
+    mock.aset = AsyncMock()
     return mock
 
 
@@ -74,7 +76,8 @@ class TestCalculateDensity:
         """Test that density is normalized to 0.0-1.0 range."""
         with patch('extractor.IDEADENSITY_AVAILABLE', True), \
              patch('extractor.cpidr') as mock_cpidr, \
-             patch('extractor.get_cache', return_value=_mock_cache()):
+             patch('extractor.get_cache', return_value=_mock_cache()), \
+             patch('extractor.get_score_store', return_value=None):
             long_text = "test content that is long enough to pass the threshold check for density calculation"
             # Test value > 1.0 gets clamped
             mock_cpidr.return_value = 1.5
@@ -165,8 +168,7 @@ class TestContentExtractor:
 
         with patch('extractor.trafilatura.extract') as mock_extract, \
              patch('extractor.trafilatura.extract_metadata') as mock_metadata, \
-             patch('extractor.calculate_density', new_callable=AsyncMock) as mock_density, \
-             patch('extractor.calculate_depid_density', new_callable=AsyncMock) as mock_depid, \
+             patch('extractor.estimate_density_metrics', new_callable=AsyncMock) as mock_metrics, \
              patch('extractor.calculate_readability_scores') as mock_readability, \
              patch('extractor.calculate_combined_density') as mock_combined, \
              patch.object(extractor, '_fetch_page', return_value="<html><body>Test content</body></html>"):
@@ -174,8 +176,7 @@ class TestContentExtractor:
             mock_extract.return_value = "Extracted clean text content"
             mock_metadata.return_value = MagicMock()
             mock_metadata.return_value.title = "Test Title"
-            mock_density.return_value = 0.7
-            mock_depid.return_value = 0.6
+            mock_metrics.return_value = {"cpidr": 0.7, "cpidr_error": 0.0, "depid": 0.6, "depid_error": 0.0}
             mock_readability.return_value = {"flesch_reading_ease": 60.0}
             mock_combined.return_value = 0.65
 
@@ -185,6 +186,7 @@ class TestContentExtractor:
             assert result["title"] == "Test Title"
             assert result["density_score"] == 0.7
             assert result["depid_density"] == 0.6
+            assert result["density_error"] == 0.0
             assert result["readability_score"] == {"flesch_reading_ease": 60.0}
 
     def test_calculate_signal_score_high_quality_content(self):
@@ -271,8 +273,7 @@ class TestContentExtractor:
 
         with patch('extractor.trafilatura.extract') as mock_extract, \
              patch('extractor.trafilatura.extract_metadata') as mock_metadata, \
-             patch('extractor.calculate_density', new_callable=AsyncMock) as mock_density, \
-             patch('extractor.calculate_depid_density', new_callable=AsyncMock) as mock_depid, \
+             patch('extractor.estimate_density_metrics', new_callable=AsyncMock) as mock_metrics, \
              patch('extractor.calculate_readability_scores') as mock_readability, \
              patch('extractor.calculate_combined_density') as mock_combined, \
              patch.object(extractor, '_fetch_page', return_value="<html><body>Test content</body></html>"):
@@ -281,8 +282,7 @@ class TestContentExtractor:
             mock_extract.return_value = "Extracted clean text content"
             mock_metadata.return_value = MagicMock()
             mock_metadata.return_value.title = "Test Title"
-            mock_density.return_value = 0.7
-            mock_depid.return_value = 0.6
+            mock_metrics.return_value = {"cpidr": 0.7, "cpidr_error": 0.0, "depid": 0.6, "depid_error": 0.0}
             mock_readability.return_value = {}
             mock_combined.return_value = 0.7
 
@@ -295,6 +295,27 @@ class TestContentExtractor:
             assert result["length"] == len("Extracted clean text content")
             assert result["density_score"] == 0.7
 
+    @pytest.mark.asyncio
+    async def test_extract_from_url_cascade_skips_density(self, mock_httpx_client, monkeypatch):
+        """A decisive signal score skips CPIDR/DEPID and reports the skipped stages."""
+        import extractor as extractor_module
+
+        extractor = ContentExtractor()
+        monkeypatch.setattr(extractor_module.config, "SCORING_CASCADE_ENABLED", True)
+
+        with patch('extractor.trafilatura.extract', return_value="Extracted clean text content"), \
+             patch('extractor.trafilatura.extract_metadata', return_value=None), \
+             patch('extractor.estimate_density_metrics', new_callable=AsyncMock) as mock_metrics, \
+             patch('extractor.calculate_readability_scores', return_value={}), \
+             patch.object(extractor, '_calculate_signal_score', return_value=0.1), \
+             patch.object(extractor, '_fetch_page', return_value="<html><body>Test content</body></html>"):
+            result = await extractor.extract_from_url("https://example.com")
+
+        mock_metrics.assert_not_awaited()
+        assert result["density_score"] is None
+        assert result["depid_density"] is None
+        assert result["skipped_stages"] == ["cpidr", "depid"]
+
     @pytest.mark.asyncio
     async def test_extract_from_url_fetch_failure(self):
         """Test URL extraction when fetch fails."""
@@ -338,6 +359,30 @@ class TestContentExtractor:
             assert "error" in result
             assert result["error"] == "Network error"
 
+    @pytest.mark.asyncio
+    async def test_extract_from_url_reuses_scores_for_unchanged_page(self, isolated_page_cache):
+        """Test an unchanged (304) page reuses the stored result without re-extracting."""
+        extractor = ContentExtractor()
+        url = "https://example.com/article"
+        body = b"<html><body><p>Cached article</p></body></html>"
+        isolated_page_cache.put(url, body, "utf-8", '"v1"', None, True)
+
+        with patch('extractor.trafilatura.extract', return_value="Extracted clean text content") as mock_extract, \
+             patch('extractor.trafilatura.extract_metadata', return_value=None), \
+             patch('extractor.estimate_density_metrics', new_callable=AsyncMock,
+                   return_value={"cpidr": 0.7, "cpidr_error": 0.0, "depid": None, "depid_error": None}), \
+             patch('extractor.calculate_readability_scores', return_value={}):
+
+            with patch.object(extractor, '_fetch_page', return_value=FetchedPage(url, body)):
+                first = await extractor.extract_from_url(url)
+            with patch.object(extractor, '_fetch_page', return_value=FetchedPage(url, body, not_modified=True)):
+                second = await extractor.extract_from_url(url)
+
+        assert mock_extract.call_count == 1
+        assert second["content"] == first["content"]
+        assert second["density_score"] == 0.7
+        assert second["raw_html"] == body
+
 
 class TestCalculateDepidDensity:
     """Test calculate_depid_density function."""
@@ -379,31 +424,133 @@ class TestCalculateDepidDensity:
             assert density is None
 
 
+class _FakePipeline:
+    """A tiny spaCy-like pipeline with fixed tags and dependencies."""
+
+    TAGS = {"The": "DT", "quick": "JJ", "brown": "JJ", "fox": "NN", "jumps": "VBZ", "over": "IN",
+            "the": "DT", "lazy": "JJ", "dog": "NN", "It": "PRP", "is": "VBZ", "very": "RB",
+            "happy": "JJ", "today": "NN", ".": "."}
+    DEPS = {"The": "det", "quick": "amod", "brown": "amod", "fox": "nsubj", "over": "prep",
+            "the": "det", "lazy": "amod", "It": "nsubj", "very": "advmod", "today": "npadvmod",
+            ".": "punct"}
+
+    def __init__(self):
+        import spacy
+        self._blank = spacy.blank("en")
+        self.parses = 0
+
+    def make_doc(self, text):
+        return self._blank.make_doc(text)
+
+    def _tag(self, doc):
+        for token in doc:
+            token.tag_ = self.TAGS.get(token.text, "NN")
+        return doc
+
+    def _parse(self, doc):
+        self.parses += 1
+        for token in doc:
+            token.dep_ = self.DEPS.get(token.text, "ROOT")
+            # The parser overwrites some tags; CPIDR must not see these
+            if token.tag_ == "JJ":
+                token.tag_ = "NN"
+        return doc
+
+    @property
+    def pipeline(self):
+        return [("tok2vec", lambda doc: doc), ("tagger", self._tag), ("parser", self._parse)]
+
+    def __call__(self, text):
+        doc = self.make_doc(text)
+        for _, component in self.pipeline:
+            doc = component(doc)
+        return doc
+
+
+class TestCalculateDensityMetrics:
+    """Test CPIDR and DEPID computed from one shared parse."""
+
+    TEXT = "The quick brown fox jumps over the lazy dog . It is very happy today ."
+
+    def test_shared_parse_matches_separate_scorers(self):
+        """The shared path gives the same densities as the separate scorers."""
+        import extractor
+        from ideadensity import cpidr, depid
+
+        tag_only = _FakePipeline()
+
+        def tagger_only(text):
+            # CPIDR's model has the parser disabled
+            doc = tag_only.make_doc(text)
+            return tag_only._tag(doc)
+
+        full = _FakePipeline()
+        with patch('ideadensity.tagger.get_nlp', return_value=tagger_only), \
+             patch('ideadensity.depid.get_nlp', return_value=full), \
+             patch('extractor.get_depid_nlp', return_value=full):
+            expected = (cpidr(self.TEXT)[2], depid(self.TEXT, is_depid_r=True)[0])
+            full.parses = 0
+            assert extractor._density_metrics(self.TEXT) == pytest.approx(expected)
+            assert full.parses == 1
+
+    @pytest.mark.asyncio
+    async def test_one_parse_for_both_metrics(self):
+        """Both scores come from one CPU task and are cached."""
+        import extractor
+
+        cache = _mock_cache()
+        text = self.TEXT * 2
+        with patch('extractor.SHARED_PARSE_AVAILABLE', True), \
+             patch('extractor._density_metrics', return_value=(0.55, 1.4)) as mock_shared, \
+             patch('extractor.get_cache', return_value=cache):
+            assert await extractor.calculate_density_metrics(text) == (0.55, 1.0)
+            mock_shared.assert_called_once_with(text)
+
+            # Served from the score store afterwards
+            assert await extractor.calculate_density_metrics(text) == (0.55, 1.0)
+            mock_shared.assert_called_once()
+
+        assert {call.args[0] for call in cache.aset.await_args_list} == {"cpidr", "depid"}
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_separate_scorers(self):
+        """A failing shared parse still yields both scores."""
+        import extractor
+
+        with patch('extractor.SHARED_PARSE_AVAILABLE', True), \
+             patch('extractor._density_metrics', side_effect=OSError("model missing")), \
+             patch('extractor.calculate_density', new_callable=AsyncMock, return_value=0.6), \
+             patch('extractor.calculate_depid_density', new_callable=AsyncMock, return_value=0.4), \
+             patch('extractor.get_cache', return_value=_mock_cache()):
+            assert await extractor.calculate_density_metrics(self.TEXT * 2) == (0.6, 0.4)
+
+    @pytest.mark.asyncio
+    async def test_short_text(self):
+        """Short text gets the same defaults as the separate scorers."""
+        import extractor
+
+        assert await extractor.calculate_density_metrics("Short") == (0.0, None)
+
+
 class TestCalculateReadabilityScores:
     """Test calculate_readability_scores function."""
 
     def test_calculate_readability_scores_success(self, sample_text_high_density):
         """Test readability scores calculation with valid text."""
-        with patch('extractor.TEXTSTAT_AVAILABLE', True), \
-             patch('extractor.textstat') as mock_textstat:
-            mock_textstat.flesch_reading_ease.return_value = 75.0
-            mock_textstat.flesch_kincaid_grade.return_value = 10.0
-            mock_textstat.gunning_fog.return_value = 12.0
-            mock_textstat.automated_readability_index.return_value = 6.0
-            mock_textstat.coleman_liau_index.return_value = 9.0
-
-            scores = calculate_readability_scores(sample_text_high_density)
-
-            assert "flesch_reading_ease" in scores
-            assert "flesch_kincaid_grade" in scores
-            assert "gunning_fog" in scores
-            assert "automated_readability_index" in scores
-            assert "coleman_liau_index" in scores
-            assert scores["flesch_reading_ease"] == 75.0
-
-    def test_calculate_readability_scores_unavailable(self, sample_text_high_density):
-        """Test readability scores when textstat is unavailable."""
-        with patch('extractor.TEXTSTAT_AVAILABLE', False):
+        scores = calculate_readability_scores(sample_text_high_density)
+
+        assert set(scores) == {
+            "flesch_reading_ease",
+            "flesch_kincaid_grade",
+            "gunning_fog",
+            "automated_readability_index",
+            "coleman_liau_index",
+        }
+        assert all(isinstance(value, float) for value in scores.values())
+
+    def test_calculate_readability_scores_failure(self, sample_text_high_density):
+        """Test readability scores when scoring raises."""
+        with patch('extractor.readability_scores', side_effect=RuntimeError("boom")):
             scores = calculate_readability_scores(sample_text_high_density)
             assert scores == {}
 
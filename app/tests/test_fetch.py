@@ -0,0 +1,186 @@
+"""Tests for the streaming, size-capped page fetch."""
+
+import httpx
+import pytest
+
+import extractor
+from extractor import FetchError, fetch_html
+
+
+PAGE = b"<html><head><title>T</title></head><body><p>Hello</p></body></html>"
+
+
+class ChunkStream(httpx.AsyncByteStream):
+    """Response body that yields fixed chunks and records how many were read."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Serve a canned response through the shared client."""
+    def install(headers=None, content=None, stream=None, status_code=200):
+        def handler(request):
+            return httpx.Response(status_code, headers=headers or {}, content=content, stream=stream)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(extractor, "get_http_client", lambda: client)
+
+    return install
+
+
+class TestFetchHtml:
+    """Test content-type gating, size limits and early stopping."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_html(self, serve):
+        """An HTML page is returned as raw bytes with its declared charset."""
+        body = "<html>café</html>".encode("latin-1")
+        serve(headers={"content-type": "text/html; charset=iso-8859-1"}, content=body)
+        page = await fetch_html("https://example.com/")
+        assert (page.body, page.encoding) == (body, "iso-8859-1")
+        assert not page.not_modified
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_html_content_type(self, serve):
+        """PDFs and other non-HTML types are rejected from the headers."""
+        stream = ChunkStream([b"%PDF-1.7"] * 10)
+        serve(headers={"content-type": "application/pdf"}, stream=stream)
+
+        with pytest.raises(FetchError, match="content type"):
+            await fetch_html("https://example.com/file.pdf")
+        assert stream.read == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_declared_oversize(self, serve, monkeypatch):
+        """A Content-Length above FETCH_MAX_BYTES is rejected before downloading."""
+        monkeypatch.setattr(extractor.config, "FETCH_MAX_BYTES", 1024)
+        stream = ChunkStream([b"x" * 1000] * 5)
+        serve(headers={"content-type": "text/html", "content-length": "5000"}, stream=stream)
+
+        with pytest.raises(FetchError, match="exceeds"):
+            await fetch_html("https://example.com/")
+        assert stream.read == 0
+
+    @pytest.mark.asyncio
+    async def test_aborts_streamed_oversize(self, serve, monkeypatch):
+        """A body without Content-Length is aborted once it passes the limit."""
+        monkeypatch.setattr(extractor.config, "FETCH_MAX_BYTES", 2048)
+        stream = ChunkStream([b"<p>" + b"x" * 1000] * 100)
+        serve(headers={"content-type": "text/html"}, stream=stream)
+
+        with pytest.raises(FetchError, match="exceeds"):
+            await fetch_html("https://example.com/")
+        assert stream.read == 3
+
+    @pytest.mark.asyncio
+    async def test_stops_after_scoring_budget(self, serve):
+        """Reading stops once stop_after_bytes have arrived."""
+        stream = ChunkStream([b"<html><body>"] + [b"<p>text</p>" * 10] * 100)
+        serve(headers={"content-type": "text/html"}, stream=stream)
+
+        page = await fetch_html("https://example.com/", stop_after_bytes=300)
+        assert page.body.startswith(b"<html><body>")
+        assert not page.complete
+        assert stream.read < 10
+
+    @pytest.mark.asyncio
+    async def test_stops_at_closing_html_tag(self, serve):
+        """Trailing data after </html> (split across chunks) is not read."""
+        stream = ChunkStream([PAGE[:-4], PAGE[-4:], b"<script>junk</script>" * 100])
+        serve(headers={"content-type": "text/html"}, stream=stream)
+
+        page = await fetch_html("https://example.com/")
+        assert page.body == PAGE
+        assert page.complete
+        assert stream.read == 2
+
+    @pytest.mark.asyncio
+    async def test_http_error_status_raises(self, serve):
+        """Non-2xx responses raise instead of returning an error page."""
+        serve(headers={"content-type": "text/html"}, content=b"<html>Not found</html>", status_code=404)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await fetch_html("https://example.com/missing")
+
+
+class TestPageCacheRevalidation:
+    """Test conditional GETs through the on-disk page cache."""
+
+    @pytest.fixture
+    def origin(self, monkeypatch):
+        """Origin server that honours If-None-Match and records request headers."""
+        seen = []
+
+        def install(etag='"v1"', body=PAGE):
+            def handler(request):
+                seen.append(dict(request.headers))
+                if request.headers.get("if-none-match") == etag:
+                    return httpx.Response(304, headers={"etag": etag})
+                return httpx.Response(200, headers={"content-type": "text/html", "etag": etag}, content=body)
+
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            monkeypatch.setattr(extractor, "get_http_client", lambda: client)
+            return seen
+
+        monkeypatch.setattr(extractor.config, "PAGE_CACHE_FRESH_SECONDS", 0)
+        return install
+
+    @pytest.mark.asyncio
+    async def test_revalidates_with_etag(self, origin):
+        """A repeat fetch sends If-None-Match and reuses the body on 304."""
+        seen = origin()
+
+        first = await fetch_html("https://example.com/doc")
+        second = await fetch_html("https://EXAMPLE.com/doc#section")
+
+        assert not first.not_modified
+        assert second.not_modified
+        assert second.body == PAGE
+        assert seen[1]["if-none-match"] == '"v1"'
+
+    @pytest.mark.asyncio
+    async def test_changed_page_is_refetched(self, origin):
+        """A new ETag means a full download and no reuse."""
+        origin(etag='"v1"')
+        await fetch_html("https://example.com/doc")
+
+        changed = PAGE.replace(b"Hello", b"Changed")
+        origin(etag='"v2"', body=changed)
+        page = await fetch_html("https://example.com/doc")
+
+        assert page.body == changed
+        assert not page.not_modified
+
+    @pytest.mark.asyncio
+    async def test_fresh_copy_served_without_request(self, origin, monkeypatch):
+        """Within PAGE_CACHE_FRESH_SECONDS no request is made."""
+        monkeypatch.setattr(extractor.config, "PAGE_CACHE_FRESH_SECONDS", 300)
+        seen = origin()
+
+        await fetch_html("https://example.com/doc")
+        page = await fetch_html("https://example.com/doc")
+
+        assert page.not_modified
+        assert len(seen) == 1
+
+    @pytest.mark.asyncio
+    async def test_truncated_copy_not_used_for_full_fetch(self, serve, monkeypatch):
+        """A body cut short for scoring is not served to a full fetch."""
+        monkeypatch.setattr(extractor.config, "PAGE_CACHE_FRESH_SECONDS", 300)
+        serve(headers={"content-type": "text/html"}, stream=ChunkStream([b"<p>" + b"x" * 500] * 4))
+        partial = await fetch_html("https://example.com/long", stop_after_bytes=100)
+
+        serve(headers={"content-type": "text/html"}, stream=ChunkStream([b"<p>" + b"x" * 500] * 4))
+        full = await fetch_html("https://example.com/long")
+
+        assert not partial.complete
+        assert full.complete
+        assert len(full.body) > len(partial.body)
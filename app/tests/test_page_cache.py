@@ -0,0 +1,75 @@
+"""Tests for the on-disk page cache."""
+
+from app.cache.page_cache import PageCache
+
+
+class TestPageCache:
+    """Test storage, score reuse and size-bounded eviction."""
+
+    def test_put_and_get(self, tmp_path):
+        """Bodies and validators round-trip."""
+        cache = PageCache(str(tmp_path / "pages.db"), max_bytes=1000)
+        cache.put("https://example.com/", b"<html>a</html>", "utf-8", '"e1"', "Mon, 01 Jan 2024 00:00:00 GMT", True)
+
+        entry = cache.get("https://example.com/")
+        assert entry["body"] == b"<html>a</html>"
+        assert entry["etag"] == '"e1"'
+        assert entry["complete"] is True
+        assert cache.get("https://example.com/other") is None
+
+    def test_scores_kept_only_for_identical_body(self, tmp_path):
+        """Scores survive a byte-identical download and are dropped on change."""
+        cache = PageCache(str(tmp_path / "pages.db"), max_bytes=1000)
+        url = "https://example.com/"
+        cache.put(url, b"<html>a</html>", None, None, None, True)
+        cache.set_scores(url, "extract", {"density_score": 0.7})
+
+        assert cache.put(url, b"<html>a</html>", None, None, None, True) is True
+        assert cache.get_scores(url, "extract") == {"density_score": 0.7}
+
+        assert cache.put(url, b"<html>b</html>", None, None, None, True) is False
+        assert cache.get_scores(url, "extract") is None
+
+    def test_truncated_fetch_keeps_complete_body(self, tmp_path):
+        """A capped refetch of an unchanged page keeps the complete copy and its scores."""
+        cache = PageCache(str(tmp_path / "pages.db"), max_bytes=1000)
+        url = "https://example.com/"
+        full = b"<html>" + b"x" * 200 + b"</html>"
+        cache.put(url, full, None, '"e1"', None, True)
+        cache.set_scores(url, "extract", {"density_score": 0.7})
+
+        assert cache.put(url, full[:100], None, '"e2"', None, False) is True
+
+        entry = cache.get(url)
+        assert entry["body"] == full
+        assert entry["complete"] is True
+        assert entry["etag"] == '"e2"'
+        assert cache.get_scores(url, "extract") == {"density_score": 0.7}
+        assert cache.get_stats()["total_bytes"] == len(full)
+
+        # A truncated body that differs means the page changed
+        assert cache.put(url, b"<html>changed", None, None, None, False) is False
+        assert cache.get(url)["complete"] is False
+        assert cache.get_stats()["total_bytes"] == len(b"<html>changed")
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Total body size stays under max_bytes, dropping the LRU page."""
+        cache = PageCache(str(tmp_path / "pages.db"), max_bytes=250)
+        cache.put("https://a.example.com/", b"a" * 100, None, None, None, True)
+        cache.put("https://b.example.com/", b"b" * 100, None, None, None, True)
+        cache.get("https://a.example.com/")  # a is now more recent than b
+        cache.put("https://c.example.com/", b"c" * 100, None, None, None, True)
+
+        assert cache.get("https://b.example.com/") is None
+        assert cache.get("https://a.example.com/") is not None
+        assert cache.get_stats()["total_bytes"] == 200
+        assert cache.evictions == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        """A new process sees pages stored by a previous one."""
+        path = str(tmp_path / "pages.db")
+        PageCache(path, max_bytes=1000).put("https://example.com/", b"<html/>", None, '"e"', None, True)
+
+        reopened = PageCache(path, max_bytes=1000)
+        assert reopened.get("https://example.com/")["etag"] == '"e"'
+        assert reopened.get_stats()["total_bytes"] == len(b"<html/>")
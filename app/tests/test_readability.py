@@ -0,0 +1,112 @@
+"""Tests for the one-pass readability engine."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import patch
+
+from services.readability import TextCounts, count_syllables, count_text, readability_scores, scores_from_counts
+
+TEXT = "The cat sat on the mat. Readability formulas don't share counts! Fig. 3."
+
+
+@pytest.fixture(autouse=True)
+def fresh_syllable_cache():
+    count_syllables.cache_clear()
+    yield
+    count_syllables.cache_clear()
+
+
+@pytest.fixture
+def heuristic_syllables():
+    """Count syllables with the vowel-group heuristic only."""
+    with patch('services.readability._hyphenator', return_value=None):
+        yield
+
+
+class TestCountText:
+    """Test the shared counts."""
+
+    def test_counts(self, heuristic_syllables):
+        """One pass yields every count the formulas need."""
+        counts = count_text(TEXT)
+
+        # "Fig." and "3." are too short to be sentences
+        assert counts.sentences == 2
+        assert counts.words == 13
+        assert counts.letters == 55
+        assert counts.characters == 60
+        assert counts.tokens == 13
+        # readability (5), formulas (3)
+        assert counts.complex_words == 2
+        assert counts.syllables == 19
+
+    def test_empty_text(self):
+        """Text without fragments has no sentences."""
+        counts = count_text("")
+
+        assert counts.sentences == 0
+        assert counts.words == 0
+
+    def test_one_short_fragment_is_a_sentence(self):
+        """Any text has at least one sentence."""
+        assert count_text("Hello there").sentences == 1
+
+
+class TestCountSyllables:
+    """Test syllable sources."""
+
+    def test_hyphenation(self):
+        """Syllables are counted from pyphen hyphenation points."""
+        pytest.importorskip("pyphen")
+        assert count_syllables("computer") == 3
+
+    def test_heuristic_fallback(self, heuristic_syllables):
+        """Without either source, vowel groups are counted."""
+        assert count_syllables("table") == 2
+        assert count_syllables("share") == 1
+        assert count_syllables("rhythm") == 1
+
+    def test_cached(self):
+        """Repeated words are looked up once."""
+        with patch('services.readability._hyphenator', return_value=None) as mock_source:
+            count_syllables("cached")
+            count_syllables("cached")
+
+        assert mock_source.call_count == 1
+
+
+class TestScores:
+    """Test the formulas."""
+
+    def test_formulas(self):
+        """Scores follow the published formulas."""
+        counts = TextCounts()
+        counts.sentences = 2
+        counts.words = 20
+        counts.syllables = 30
+        counts.complex_words = 4
+        counts.letters = 90
+        counts.characters = 100
+        counts.tokens = 20
+
+        scores = scores_from_counts(counts)
+
+        assert scores["flesch_reading_ease"] == pytest.approx(206.835 - 1.015 * 10 - 84.6 * 1.5)
+        assert scores["flesch_kincaid_grade"] == pytest.approx(0.39 * 10 + 11.8 * 1.5 - 15.59)
+        assert scores["gunning_fog"] == pytest.approx(0.4 * (10 + 20))
+        assert scores["automated_readability_index"] == pytest.approx(4.71 * 5 + 0.5 * 10 - 21.43)
+        assert scores["coleman_liau_index"] == pytest.approx(0.058 * 450 - 0.296 * 10 - 15.8)
+
+    def test_no_words(self):
+        """Text without words scores 0.0 instead of dividing by zero."""
+        assert set(readability_scores("... !!!").values()) == {0.0}
+
+    def test_thread_safe(self):
+        """Concurrent scoring matches sequential scoring."""
+        texts = [f"{TEXT} Sentence number {i} adds some varied vocabulary here." * (i % 5 + 1) for i in range(50)]
+        expected = [readability_scores(text) for text in texts]
+
+        count_syllables.cache_clear()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert list(pool.map(readability_scores, texts)) == expected
@@ -0,0 +1,184 @@
+"""Tests for the persistent density score store."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import extractor
+from extractor import calculate_density, calculate_depid_density, get_readability_scores
+from app.cache.score_store import ScoreStore
+
+TEXT = "Persistent score stores avoid re-running expensive parsers on text that was already scored."
+
+
+def _missing_cache():
+    """A hybrid cache that always misses, as after a restart or expiry."""
+    cache = MagicMock()
+    cache.aget = AsyncMock(return_value=None)
+    cache.aset = AsyncMock()
+    return cache
+
+
+class TestScoreStore:
+    """Test ScoreStore storage, versioning and eviction."""
+
+    def test_put_and_get(self, tmp_path):
+        """Stored values are returned for the same metric, version and hash."""
+        store = ScoreStore(str(tmp_path / "scores.db"), max_bytes=10_000)
+        store.put("cpidr", "v1", "abc", 0.61)
+        store.put("readability", "v1", "abc", {"flesch_reading_ease": 55.0})
+
+        assert store.get("cpidr", "v1", "abc") == 0.61
+        assert store.get("readability", "v1", "abc") == {"flesch_reading_ease": 55.0}
+        assert store.get("depid", "v1", "abc") is None
+        store.close()
+
+    def test_new_scorer_version_misses(self, tmp_path):
+        """Scores from another scorer version are not reused."""
+        store = ScoreStore(str(tmp_path / "scores.db"), max_bytes=10_000)
+        store.put("cpidr", "ideadensity-0.1/1", "abc", 0.61)
+
+        assert store.get("cpidr", "ideadensity-0.2/1", "abc") is None
+        store.close()
+
+    def test_survives_reopen(self, tmp_path):
+        """Scores persist across process restarts."""
+        path = str(tmp_path / "scores.db")
+        store = ScoreStore(path, max_bytes=10_000)
+        store.put("cpidr", "v1", "abc", 0.61)
+        store.close()
+
+        reopened = ScoreStore(path, max_bytes=10_000)
+        assert reopened.get("cpidr", "v1", "abc") == 0.61
+        assert reopened.get_stats()["total_bytes"] > 0
+        reopened.close()
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """The store stays within max_bytes, dropping the oldest scores."""
+        store = ScoreStore(str(tmp_path / "scores.db"), max_bytes=2_000)
+        for i in range(100):
+            store.put("cpidr", "v1", f"{i:064d}", 0.5)
+
+        stats = store.get_stats()
+        assert stats["total_bytes"] <= 2_000
+        assert stats["evictions"] > 0
+        assert store.get("cpidr", "v1", f"{0:064d}") is None
+        assert store.get("cpidr", "v1", f"{99:064d}") == 0.5
+        store.close()
+
+    def test_bulk_get_and_put(self, tmp_path):
+        """Bulk calls store and return several scores at once."""
+        store = ScoreStore(str(tmp_path / "scores.db"), max_bytes=10_000)
+        store.put_many("cpidr", "v1", {"abc": 0.61, "def": 0.42})
+        store.put_many("cpidr", "v1", {"abc": 0.62})
+
+        assert store.get_many("cpidr", "v1", ["abc", "def", "ghi"]) == {"abc": 0.62, "def": 0.42}
+        assert store.get_many("cpidr", "v2", ["abc"]) == {}
+        stats = store.get_stats()
+        assert stats["entries"] == 2
+        assert (stats["hits"], stats["misses"]) == (2, 2)
+        store.close()
+
+
+class TestScoreStoreIntegration:
+    """Test density functions reuse stored scores."""
+
+    @pytest.mark.asyncio
+    async def test_cpidr_not_recomputed_after_cache_miss(self):
+        """A text scored before is served from the store when the cache misses."""
+        cache = _missing_cache()
+        with patch('extractor.IDEADENSITY_AVAILABLE', True), \
+             patch('extractor.cpidr', return_value=0.6) as mock_cpidr, \
+             patch('extractor.get_cache', return_value=cache):
+            assert await calculate_density(TEXT) == 0.6
+            assert await calculate_density(TEXT) == 0.6
+
+        mock_cpidr.assert_called_once()
+        # The stored score warms the hybrid cache again
+        assert cache.aset.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_depid_not_recomputed_after_cache_miss(self):
+        """DEPID scores are stored separately from CPIDR."""
+        with patch('extractor.IDEADENSITY_AVAILABLE', True), \
+             patch('extractor.depid', return_value=(0.4, 10, [])) as mock_depid, \
+             patch('extractor.get_cache', return_value=_missing_cache()):
+            assert await calculate_depid_density(TEXT) == 0.4
+            assert await calculate_depid_density(TEXT) == 0.4
+
+        mock_depid.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_readability_scores_stored(self):
+        """Readability scores are computed once per text."""
+        with patch('extractor.calculate_readability_scores', return_value={"flesch_reading_ease": 60.0}) as mock_scores:
+            assert await get_readability_scores(TEXT) == {"flesch_reading_ease": 60.0}
+            assert await get_readability_scores(TEXT) == {"flesch_reading_ease": 60.0}
+
+        mock_scores.assert_called_once()
+
+    def test_scorer_versions_tag_keys(self):
+        """Every stored metric has a scorer version tag."""
+        assert set(extractor.SCORER_VERSIONS) == {"cpidr", "depid", "readability", "density-sample"}
+        assert extractor.SCORER_VERSIONS["cpidr"].startswith("ideadensity-")
+
+
+class TestCalculateDensityBatch:
+    """Test batch CPIDR scoring used by /check-density."""
+
+    TEXTS = [
+        TEXT,
+        "Batched tagging streams many documents through one spaCy pipeline call.",
+        TEXT,
+        "too short",
+    ]
+
+    @staticmethod
+    def _memory_cache():
+        from app.cache import HybridCache
+        cache = HybridCache(max_size=100)
+        cache._redis_cache = None
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_duplicates_scored_once_and_stored(self):
+        """Each distinct text is tagged once; later batches reuse stored scores."""
+        def fake_batch(texts):
+            return [0.6 if text == TEXT else 1.7 for text in texts]
+
+        with patch('extractor.IDEADENSITY_AVAILABLE', True), \
+             patch('extractor.SHARED_PARSE_AVAILABLE', True), \
+             patch('extractor._cpidr_density_batch', side_effect=fake_batch) as mock_batch, \
+             patch('extractor.get_cache', return_value=self._memory_cache()):
+            assert await extractor.calculate_density_batch(self.TEXTS) == [0.6, 1.0, 0.6, 0.0]
+            scored = sorted(text for call in mock_batch.call_args_list for text in call.args[0])
+            assert scored == sorted(self.TEXTS[:2])
+
+        with patch('extractor.IDEADENSITY_AVAILABLE', True), \
+             patch('extractor.SHARED_PARSE_AVAILABLE', True), \
+             patch('extractor._cpidr_density_batch', side_effect=fake_batch) as mock_batch, \
+             patch('extractor.get_cache', return_value=self._memory_cache()):
+            assert await extractor.calculate_density_batch(self.TEXTS) == [0.6, 1.0, 0.6, 0.0]
+            mock_batch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_per_item_scoring(self):
+        """A failing batch still scores every item."""
+        with patch('extractor.IDEADENSITY_AVAILABLE', True), \
+             patch('extractor.SHARED_PARSE_AVAILABLE', True), \
+             patch('extractor._cpidr_density_batch', side_effect=OSError("model missing")), \
+             patch('extractor.calculate_density', new_callable=AsyncMock, return_value=0.4), \
+             patch('extractor.get_cache', return_value=self._memory_cache()):
+            assert await extractor.calculate_density_batch(self.TEXTS) == [0.4, 0.4, 0.4, 0.0]
+
+    @pytest.mark.asyncio
+    async def test_check_density_scores_in_one_batch(self):
+        """/check-density makes one batch call and keeps the response format."""
+        import main as main_module
+
+        req = main_module.CheckDensityRequest(results=[{"url": "a", "content": TEXT}, {"url": "b"}], threshold=0.5)
+        with patch('extractor.calculate_density_batch', new_callable=AsyncMock, return_value=[0.6, 0.0]) as mock_batch:
+            response = await main_module.check_density(req)
+
+        mock_batch.assert_awaited_once_with([TEXT, ""])
+        assert [item["density_score"] for item in response["results"]] == [0.6, 0.0]
+        assert [item["skipped_llm"] for item in response["results"]] == [False, True]
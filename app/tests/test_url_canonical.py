@@ -0,0 +1,170 @@
+"""Tests for URL canonicalization and its use in caches and batches."""
+
+import asyncio
+
+import pytest
+
+import extractor
+import app.main as main_module
+from app.main import AnalyzeResultsRequest
+from app.cache.page_cache import PageCache
+from services import url_canonical
+from services.url_canonical import canonicalize_url
+
+
+class TestCanonicalizeUrl:
+    """Test canonical forms of URL variants."""
+
+    def test_normalizes_host_port_and_fragment(self):
+        """Scheme/host case, default ports and fragments do not change the key."""
+        assert canonicalize_url("HTTPS://Example.COM:443/a?b=1#top") == "https://example.com/a?b=1"
+        assert canonicalize_url("http://example.com") == "http://example.com/"
+
+    def test_keeps_non_default_port(self):
+        """A non-default port is part of the key."""
+        assert canonicalize_url("http://example.com:8080/x") == "http://example.com:8080/x"
+
+    def test_search_result_variants_collapse(self):
+        """Tracking params, www. and trailing slashes share a key."""
+        base = canonicalize_url("https://example.com/blog/post")
+        variants = [
+            "https://www.example.com/blog/post/",
+            "https://example.com/blog/post?utm_source=tavily&utm_medium=search",
+            "https://example.com/blog/post?fbclid=abc#comments",
+            "https://example.com/blog/post?outputType=amp",
+        ]
+        for variant in variants:
+            assert canonicalize_url(variant) == base, variant
+
+    def test_amp_kept_by_default(self):
+        """"amp" in a host or path is content unless a rule says otherwise."""
+        assert canonicalize_url("https://amp.dev/documentation/") == "https://amp.dev/documentation"
+        assert canonicalize_url("https://example.com/guides/amp") == "https://example.com/guides/amp"
+        assert canonicalize_url("https://amp.example.com/post") == "https://amp.example.com/post"
+
+    def test_amp_variants_collapse_with_rule(self, monkeypatch):
+        """strip_amp maps a site's AMP copies to the article."""
+        monkeypatch.setattr(url_canonical.config, "URL_CANONICAL_RULES", '{"example.com": {"strip_amp": true}}')
+
+        base = canonicalize_url("https://example.com/blog/post")
+        for variant in ("https://amp.example.com/blog/post", "https://example.com/blog/post/amp/"):
+            assert canonicalize_url(variant) == base, variant
+
+    def test_prefix_never_leaves_single_label_host(self, monkeypatch):
+        """www. and amp. are only prefixes when a domain remains after them."""
+        monkeypatch.setattr(url_canonical.config, "URL_CANONICAL_RULES", '{"amp.dev": {"strip_amp": true}}')
+
+        assert canonicalize_url("https://amp.dev/documentation") == "https://amp.dev/documentation"
+        assert canonicalize_url("https://www.com/x") == "https://www.com/x"
+
+    def test_content_params_kept_and_sorted(self):
+        """Parameters that select content are kept, in a stable order."""
+        assert canonicalize_url("https://example.com/s?q=rust&page=2&utm_campaign=x") == \
+            canonicalize_url("https://example.com/s?page=2&q=rust")
+        assert canonicalize_url("https://example.com/s?page=2") != canonicalize_url("https://example.com/s?page=3")
+        assert canonicalize_url("https://example.com/s?outputType=json") == "https://example.com/s?outputType=json"
+
+    def test_ref_selects_content_by_default(self):
+        """?ref= picks a GitHub branch, so it is not stripped without a rule."""
+        url = "https://github.com/a/b/blob/main/x.py?ref=dev"
+
+        assert canonicalize_url(url) == url
+        assert canonicalize_url(url) != canonicalize_url("https://github.com/a/b/blob/main/x.py")
+
+    def test_path_case_preserved(self):
+        """Paths are case-sensitive on most servers."""
+        assert canonicalize_url("https://example.com/Article") != canonicalize_url("https://example.com/article")
+
+    def test_per_domain_rules(self, monkeypatch):
+        """Configured rules keep or drop parameters and prefixes per domain."""
+        rules = (
+            '{"news.ycombinator.com": {"keep_params": ["ID"]},'
+            ' "example.org": {"drop_params": ["session"], "keep_www": true, "keep_trailing_slash": true},'
+            ' "medium.com": {"drop_params": ["ref", "amp"]}}'
+        )
+        monkeypatch.setattr(url_canonical.config, "URL_CANONICAL_RULES", rules)
+
+        assert canonicalize_url("https://news.ycombinator.com/item?id=1&p=2") == \
+            "https://news.ycombinator.com/item?id=1"
+        assert canonicalize_url("https://news.ycombinator.com/item?Id=1") == \
+            "https://news.ycombinator.com/item?Id=1"
+        assert canonicalize_url("https://www.example.org/docs/?session=abc&v=1") == \
+            "https://www.example.org/docs/?v=1"
+        assert canonicalize_url("https://sub.example.org/x?session=1") == "https://sub.example.org/x"
+        assert canonicalize_url("https://medium.com/p/post?ref=feed&amp=1") == "https://medium.com/p/post"
+
+    def test_page_cache_shares_entry_across_variants(self, tmp_path):
+        """The page cache stores one copy for all variants of a URL."""
+        cache = PageCache(str(tmp_path / "pages.db"), max_bytes=10_000)
+        cache.put("https://www.example.com/post/?utm_source=x", b"<html></html>", "utf-8", None, None, True)
+
+        assert cache.get("https://example.com/post")["body"] == b"<html></html>"
+        cache.close()
+
+
+class TestBatchDeduplication:
+    """Test /analyze-results drops duplicate pages within a batch."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_results_scored_once(self, monkeypatch):
+        """Variants of one URL are analyzed once, keeping the best-scored item."""
+        analyzed_urls = []
+
+        async def fake_analyze(item, query, threshold, timeout):
+            analyzed_urls.append(item["url"])
+            return {**item, "final_score": item["score"], "skipped_llm": False}
+
+        monkeypatch.setattr(main_module, "_analyze_result_item", fake_analyze)
+
+        results = [
+            {"url": "https://example.com/a?utm_source=x", "content": "s", "score": 0.4},
+            {"url": "https://www.example.com/a/", "content": "s", "score": 0.9},
+            {"url": "https://example.com/b", "content": "s", "score": 0.5},
+        ]
+        response = await main_module.analyze_results(AnalyzeResultsRequest(results=results, query="q"))
+
+        assert analyzed_urls == ["https://www.example.com/a/", "https://example.com/b"]
+        assert response["count"] == 2
+        assert response["duplicates_removed"] == 1
+
+
+class TestFetchCoalescing:
+    """Test concurrent fetches of one page share a download."""
+
+    @pytest.mark.asyncio
+    async def test_variants_share_one_download(self, monkeypatch, isolated_page_cache):
+        """Concurrent fetches of URL variants trigger one network request."""
+        downloads = []
+
+        async def fake_fetch(url, stop_after_bytes):
+            downloads.append(url)
+            await asyncio.sleep(0.05)
+            return extractor.FetchedPage(url, b"<html></html>", "utf-8")
+
+        monkeypatch.setattr(extractor, "_fetch_html", fake_fetch)
+
+        pages = await asyncio.gather(
+            extractor.fetch_html("https://example.com/a?utm_source=x"),
+            extractor.fetch_html("https://www.example.com/a"),
+        )
+
+        assert len(downloads) == 1
+        assert pages[0].body == pages[1].body
+
+    @pytest.mark.asyncio
+    async def test_abandoned_fetch_is_cancelled(self, monkeypatch):
+        """A fetch nobody waits for any more is stopped."""
+        cancelled = asyncio.Event()
+
+        async def slow_fetch(url, stop_after_bytes):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        monkeypatch.setattr(extractor, "_fetch_html", slow_fetch)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(extractor.fetch_html("https://example.com/slow"), 0.05)
+        await asyncio.wait_for(cancelled.wait(), 1)